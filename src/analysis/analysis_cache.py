@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import numpy as np
+from typing import Optional
+
+from src.analysis.solvers.checkpoint import json_default, results_to_arrays, results_from_arrays
+from src.analysis.project_file import (BINARY_EXTENSION, TRANSIENT_RESULT_KEYS, pack_header, unpack_header, read_npz,
+                                       gravity_to_arrays, gravity_from_arrays)
+
+CACHE_FORMAT_NAME = "opensees-gui-analysis-cache"
+CACHE_FORMAT_VERSION = 1
+
+
+class AnalysisCache:
+    """
+    Caché en disco de resultados de análisis, indexada por (huella del modelo, tipo de análisis, parámetros).
+    Cada entrada es un .npz comprimido; la fecha de modificación marca el último uso y, al superar
+    'max_bytes', se eliminan primero las entradas usadas hace más tiempo (LRU).
+    """
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, directory: str = None, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory or os.path.join("pushover_data", "cache")
+        self.max_bytes = max_bytes
+        self.enabled = True
+
+    @staticmethod
+    def key(fingerprint: str, kind: str, params: dict) -> str:
+        text = json.dumps({"fingerprint": fingerprint, "kind": kind, "params": params},
+                          sort_keys=True, default=json_default)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + BINARY_EXTENSION)
+
+    def get(self, fingerprint: str, kind: str, params: dict) -> Optional[dict]:
+        """
+        Devuelve {"results", "pushover_loads"} si hay una entrada para la clave, o None.
+        Una entrada ilegible se elimina y cuenta como fallo.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(self.key(fingerprint, kind, params))
+        if not os.path.exists(path):
+            return None
+        try:
+            arrays = read_npz(path)
+            header = unpack_header(arrays.pop("header"))
+            if header.get("format") != CACHE_FORMAT_NAME or header.get("version") != CACHE_FORMAT_VERSION:
+                raise ValueError("formato de caché no reconocido")
+            if kind == "gravity":
+                results = gravity_from_arrays(header["meta"], "g_", arrays)
+            else:
+                results = results_from_arrays(header["meta"], "p_", arrays)
+        except Exception as e:
+            print(f"[Caché] Entrada descartada ({e})")
+            self._remove(path)
+            return None
+
+        os.utime(path)     # Último uso
+        return {"results": results, "pushover_loads": header.get("pushover_loads", [])}
+
+    def put(self, fingerprint: str, kind: str, params: dict, results: dict, pushover_loads=()):
+        """Guarda los resultados de un análisis y aplica el límite de tamaño."""
+        if not self.enabled or not results:
+            return
+        arrays = {}
+        if kind == "gravity":
+            meta = gravity_to_arrays(results, "g_", arrays)
+        else:
+            pushover = {k: v for k, v in results.items() if k not in TRANSIENT_RESULT_KEYS}
+            meta = results_to_arrays(pushover, "p_", arrays)
+        header = {"format": CACHE_FORMAT_NAME, "version": CACHE_FORMAT_VERSION, "kind": kind, "params": params,
+                  "meta": meta, "pushover_loads": [l.to_dict() for l in pushover_loads]}
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(self.key(fingerprint, kind, params))
+        tmp_path = path + ".tmp"
+        try:
+            # Escritura atómica: una entrada a medias nunca queda con el nombre definitivo
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, header=pack_header(header), **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Caché] No se pudo guardar la entrada ({e})")
+            self._remove(tmp_path)
+            return
+        self._evict(keep=path)
+
+    def _entries(self) -> list:
+        """(último uso, tamaño, ruta) de cada entrada, de la más antigua a la más reciente."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            if not name.endswith(BINARY_EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def _evict(self, keep: str = None):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep and size <= self.max_bytes:
+                continue
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
@@ -0,0 +1,118 @@
+import time
+from collections import deque
+
+SCRIPT_HEADER = "# Auto-generated debug script from AP-GUI\nfrom openseespy.opensees import *\n"
+
+
+def format_command(command, args) -> str:
+    """Línea de script Python equivalente a un comando de OpenSees."""
+    return f"{command}({', '.join(repr(arg) for arg in args)})"
+
+
+class CommandLog:
+    """
+    Destino de los comandos que ejecuta ModelBuilder.log_command.
+    Esta clase base no registra nada (registro desactivado); las subclases guardan
+    los comandos en memoria o en un script. begin_script() marca el inicio de un modelo nuevo.
+    """
+    enabled = False
+
+    def begin_script(self):
+        pass
+
+    def command(self, command, args):
+        pass
+
+    def comment(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryCommandLog(CommandLog):
+    """
+    Búfer circular con los últimos 'capacity' comandos. Guarda las tuplas sin formatear
+    (el repr de los argumentos solo se calcula al pedir las líneas o volcarlas a disco).
+    """
+    enabled = True
+
+    def __init__(self, capacity: int = 100000):
+        self.entries = deque(maxlen=capacity)
+
+    def begin_script(self):
+        self.entries.clear()
+
+    def command(self, command, args):
+        self.entries.append((command, args))
+
+    def comment(self, text):
+        self.entries.append((None, text))
+
+    def lines(self) -> list:
+        return [f"\n# {args}" if command is None else format_command(command, args)
+                for command, args in self.entries]
+
+    def dump(self, filename: str):
+        """Escribe el contenido del búfer como script ejecutable."""
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(SCRIPT_HEADER)
+            if len(self.entries) == self.entries.maxlen:
+                f.write("# (Solo los últimos comandos: el búfer estaba lleno)\n")
+            f.write("\n".join(self.lines()) + "\n")
+
+
+class FileCommandLog(CommandLog):
+    """
+    Script de depuración en disco (model_debug.py) con escritura por bloques:
+    las líneas se acumulan y se vuelcan cada 'flush_every' comandos o cada 'flush_interval' segundos,
+    en lugar de escribir y vaciar el fichero en cada comando.
+    """
+    enabled = True
+
+    def __init__(self, filename: str = "model_debug.py", flush_every: int = 5000, flush_interval: float = 2.0):
+        self.filename = filename
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self._file = None
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def begin_script(self):
+        # Cada modelo nuevo sobrescribe el script anterior
+        self.close()
+        self._file = open(self.filename, "w", encoding="utf-8")
+        self._file.write(SCRIPT_HEADER)
+        self._last_flush = time.monotonic()
+
+    def _append(self, line):
+        if self._file is None:
+            return
+        self._pending.append(line)
+        if len(self._pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def command(self, command, args):
+        self._append(format_command(command, args))
+
+    def comment(self, text):
+        self._append(f"\n# {text}")
+
+    def flush(self):
+        if self._file is None:
+            return
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
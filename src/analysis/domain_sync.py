@@ -0,0 +1,99 @@
+import json
+import numpy as np
+
+from src.analysis.element import ForceBeamColumn
+
+# Comandos que solo configuran o ejecutan análisis: no cambian lo que el dominio contiene del modelo
+ANALYSIS_COMMANDS = frozenset({
+    'system', 'numberer', 'constraints', 'integrator', 'algorithm', 'analysis', 'analyze', 'test',
+    'wipeAnalysis', 'loadConst', 'setTime', 'reset', 'eigen', 'reactions', 'printModel'
+})
+
+
+class DomainSnapshot:
+    """
+    Lo que el modelo envía al dominio, en forma comparable:
+    - nodes: tag -> (x, y, fijación ux, uy, rz)
+    - elements: tag -> (nodo i, nodo j, sección, puntos de integración, densidad de masa)
+    - loads: diccionarios de las cargas del patrón de gravedad, en orden
+    - definitions: materiales y secciones serializados (un cambio aquí exige reconstruir)
+    """
+    __slots__ = ['nodes', 'elements', 'loads', 'definitions']
+
+    def __init__(self, nodes, elements, loads, definitions):
+        self.nodes = nodes
+        self.elements = elements
+        self.loads = loads
+        self.definitions = definitions
+
+    def __eq__(self, other):
+        return (isinstance(other, DomainSnapshot) and self.nodes == other.nodes and self.elements == other.elements
+                and self.loads == other.loads and self.definitions == other.definitions)
+
+    @classmethod
+    def of(cls, manager) -> "DomainSnapshot":
+        node_store, element_store = manager.node_store, manager.element_store
+        nodes = dict(zip(node_store.active("tag").tolist(),
+                         map(tuple, np.hstack([node_store.active("xy"), node_store.active("fixity")]).tolist())))
+
+        # Solo los ForceBeamColumn llegan al dominio (ver ModelBuilder._build_elements)
+        built = np.fromiter((isinstance(v, ForceBeamColumn) for v in element_store.views), dtype=bool,
+                            count=len(element_store))
+        columns = [element_store.active("nodes")[built, 0], element_store.active("nodes")[built, 1],
+                   element_store.active("section_tag")[built], element_store.active("integration_points")[built],
+                   element_store.active("mass_density")[built]]
+        elements = dict(zip(element_store.active("tag")[built].tolist(), zip(*(c.tolist() for c in columns))))
+
+        definitions = json.dumps([[m.to_dict() for m in manager.get_all_materials()],
+                                  [s.to_dict() for s in manager.get_all_sections()]], sort_keys=True)
+        return cls(nodes, elements, [l.to_dict() for l in manager.get_all_loads()], definitions)
+
+
+class DomainState:
+    """
+    Estado del dominio local de OpenSees (global en openseespy, de ahí el singleton):
+    qué versión del modelo contiene y qué se ha hecho con ella desde entonces.
+    - INVALID: desconocido o modificado fuera del modelo (congelamientos, patrones del Pushover...)
+    - BUILT: modelo recién enviado, sin analizar
+    - GRAVITY: gravedad aplicada y convergida (punto de partida del Pushover)
+    - ANALYZED: otro análisis cambió el estado (hay que volver al inicio antes de reutilizarlo)
+    """
+    INVALID, BUILT, GRAVITY, ANALYZED = "invalid", "built", "gravity", "analyzed"
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.invalidate()
+
+    def invalidate(self):
+        self.status = DomainState.INVALID
+        self.snapshot = None
+        self.integrations = {}      # (sección, puntos) -> tag de beamIntegration
+        self.next_integration_tag = 1
+
+    @property
+    def is_valid(self):
+        return self.status != DomainState.INVALID
+
+    def mark_built(self, snapshot, integrations, next_integration_tag):
+        self.status = DomainState.BUILT
+        self.snapshot = snapshot
+        self.integrations = integrations
+        self.next_integration_tag = next_integration_tag
+
+    def mark_gravity(self):
+        if self.is_valid:
+            self.status = DomainState.GRAVITY
+
+    def on_command(self, command):
+        """Clasifica un comando enviado fuera de la sincronización."""
+        if command in ANALYSIS_COMMANDS:
+            if self.status in (DomainState.BUILT, DomainState.GRAVITY):
+                self.status = DomainState.ANALYZED
+        elif self.is_valid:
+            self.invalidate()
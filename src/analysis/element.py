@@ -1,9 +1,34 @@
+from src.analysis.model_store import column_field, decode_int, decode_optional_tag, encode_optional_tag
+
+
 class Element:
-    __slots__ = ['tag', 'node_i', 'node_j']
+    """
+    Elemento del modelo. Una vez añadido al ProjectManager es una vista de su fila en el
+    almacén de arrays (ElementTable); fuera de él guarda sus valores en campos propios.
+    """
+    __slots__ = ['tag', '_table', '_row', '_node_i', '_node_j']
     def __init__(self, tag, node_i, node_j):
         self.tag = tag
-        self.node_i = node_i # ID del nodo inicial
-        self.node_j = node_j # ID del nodo final
+        self._table = None
+        self._row = -1
+        self._node_i = node_i # ID del nodo inicial
+        self._node_j = node_j # ID del nodo final
+
+    node_i = column_field('_node_i', 'nodes', 0, decode=decode_int)
+    node_j = column_field('_node_j', 'nodes', 1, decode=decode_int)
+
+    def _write_row(self, table, row):
+        table.tag[row] = self.tag
+        table.nodes[row] = (self._node_i, self._node_j)
+        # Columnas propias de las subclases: valores neutros para un Element genérico
+        table.section_tag[row] = -1
+        table.transf_tag[row] = 0
+        table.integration_points[row] = 0
+        table.mass_density[row] = 0.0
+
+    def _read_row(self, table, row):
+        self._node_i = int(table.nodes[row, 0])
+        self._node_j = int(table.nodes[row, 1])
 
     def to_dict(self):
         return{
@@ -18,13 +43,32 @@ class Element:
         return cls(data["tag"], data["node_i"], data["node_j"])
 
 class ForceBeamColumn(Element):
-    __slots__ = ['integration_points', 'section_tag', 'transf_tag', 'mass_density']
+    __slots__ = ['_integration_points', '_section_tag', '_transf_tag', '_mass_density']
     def __init__(self, tag, node_i, node_j, section_tag, transf_tag, integration_points, mass_density= 0.0):
         super().__init__(tag, node_i, node_j)
-        self.integration_points = integration_points
-        self.section_tag = section_tag
-        self.transf_tag = transf_tag
-        self.mass_density = mass_density 
+        self._integration_points = integration_points
+        self._section_tag = section_tag
+        self._transf_tag = transf_tag
+        self._mass_density = mass_density 
+
+    integration_points = column_field('_integration_points', 'integration_points', decode=decode_int)
+    section_tag = column_field('_section_tag', 'section_tag', decode=decode_optional_tag, encode=encode_optional_tag)
+    transf_tag = column_field('_transf_tag', 'transf_tag', decode=decode_int)
+    mass_density = column_field('_mass_density', 'mass_density')
+
+    def _write_row(self, table, row):
+        super()._write_row(table, row)
+        table.section_tag[row] = encode_optional_tag(self._section_tag)
+        table.transf_tag[row] = self._transf_tag
+        table.integration_points[row] = self._integration_points
+        table.mass_density[row] = self._mass_density
+
+    def _read_row(self, table, row):
+        super()._read_row(table, row)
+        self._section_tag = decode_optional_tag(table.section_tag[row])
+        self._transf_tag = int(table.transf_tag[row])
+        self._integration_points = int(table.integration_points[row])
+        self._mass_density = float(table.mass_density[row])
         
     def get_opensees_command(self):
         f"element forceBeamColumn {self.tag} {self.node_i} {self.node_j} {self.transf_tag} \"Lobatto\" {self.section_tag} {self.integration_points} \"-mass\" {self.mass_density}"
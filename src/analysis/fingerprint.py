@@ -0,0 +1,76 @@
+import json
+import hashlib
+import numpy as np
+
+# Dígitos significativos con los que se comparan los reales: diferencias por debajo
+# (p. ej. 3.0 frente a 2.9999999999999996 tras una conversión de unidades) no cambian la huella
+SIGNIFICANT_DIGITS = 12
+
+# Tolerancia absoluta para el cero: el redondeo anterior es relativo y no iguala 0.0 con 1e-15
+# (ruido típico en coordenadas, fijaciones y componentes de carga que deberían ser nulas)
+ZERO_TOLERANCE = 1e-12
+
+
+def _format_floats(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Texto de cada real con 'digits' cifras significativas; los casi nulos se igualan a cero.
+
+    >>> _format_floats(np.array([0.0, 1e-15, -0.0]), 12).tolist()
+    ['0.00000000000e+00', '0.00000000000e+00', '0.00000000000e+00']
+    """
+    values = np.asarray(values, dtype=np.float64)
+    # Sumar 0.0 convierte -0.0 en 0.0 para que ambos den el mismo texto
+    values = np.where(np.abs(values) < ZERO_TOLERANCE, 0.0, values) + 0.0
+    return np.char.mod(f"%.{digits - 1}e", values)
+
+
+def _normalize(value, digits: int):
+    """Copia de un diccionario/lista con los reales redondeados a 'digits' cifras significativas."""
+    if isinstance(value, dict):
+        return {k: _normalize(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, digits) for v in value]
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return f"{(0.0 if abs(value) < ZERO_TOLERANCE else value) + 0.0:.{digits - 1}e}"
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _update_table(h, name: str, tags: np.ndarray, columns: list, digits: int):
+    """Añade una tabla al hash, con sus filas ordenadas por tag (el orden de alta no influye)."""
+    order = np.argsort(tags, kind="stable")
+    h.update(name.encode("utf-8"))
+    h.update(np.ascontiguousarray(tags[order], dtype=np.int64).tobytes())
+    for column in columns:
+        column = column[order]
+        if column.dtype.kind == "f":
+            h.update("|".join(_format_floats(column, digits).ravel().tolist()).encode("utf-8"))
+        else:
+            h.update(np.ascontiguousarray(column, dtype=np.int64).tobytes())
+
+
+def _update_records(h, name: str, records: list, digits: int):
+    records = sorted((_normalize(r, digits) for r in records), key=lambda r: (r.get("type", ""), r.get("tag", 0)))
+    h.update(name.encode("utf-8"))
+    h.update(json.dumps(records, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+
+def model_fingerprint(manager, digits: int = SIGNIFICANT_DIGITS) -> str:
+    """
+    Huella canónica del modelo (sha256): nodos, elementos, secciones, materiales y cargas,
+    ordenados por tag y con los reales normalizados a 'digits' cifras significativas.
+    Dos modelos con la misma huella producen el mismo análisis.
+    """
+    h = hashlib.sha256()
+    nodes, elements = manager.node_store, manager.element_store
+
+    _update_table(h, "nodes", nodes.active("tag"), [nodes.active("xy"), nodes.active("fixity")], digits)
+    _update_table(h, "elements", elements.active("tag"),
+                  [elements.active(name) for name in ("nodes", "section_tag", "transf_tag",
+                                                      "integration_points", "mass_density")], digits)
+    _update_records(h, "materials", [m.to_dict() for m in manager.get_all_materials()], digits)
+    _update_records(h, "sections", [s.to_dict() for s in manager.get_all_sections()], digits)
+    _update_records(h, "loads", [l.to_dict() for l in manager.get_all_loads()], digits)
+    return h.hexdigest()
@@ -0,0 +1,46 @@
+import bisect
+
+
+class FloorIndex:
+    """
+    Índice ordenado de cotas de planta con tolerancia.
+    Una cota nueva se une a la planta existente más cercana si está a menos de 'tolerance';
+    si no, abre una planta nueva. Las búsquedas son por bisección (O(log F)).
+    """
+
+    def __init__(self, tolerance=1e-3):
+        self.tolerance = tolerance
+        self.keys = []      # Cotas de planta, ordenadas
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, y):
+        """Cota de la planta que contiene 'y' (la más cercana dentro de la tolerancia) o None."""
+        keys = self.keys
+        pos = bisect.bisect_left(keys, y)
+        best = None
+        for k in (pos - 1, pos):
+            if 0 <= k < len(keys) and abs(keys[k] - y) < self.tolerance:
+                if best is None or abs(keys[k] - y) < abs(best - y):
+                    best = keys[k]
+        return best
+
+    def add(self, y):
+        """Devuelve la planta de 'y', creándola si no existe."""
+        key = self.find(y)
+        if key is None:
+            key = y
+            bisect.insort(self.keys, key)
+        return key
+
+    def remove(self, key):
+        """Elimina una planta (cota exacta devuelta por add/find)."""
+        pos = bisect.bisect_left(self.keys, key)
+        if pos < len(self.keys) and self.keys[pos] == key:
+            del self.keys[pos]
+
+    def rekey(self, key, new_key):
+        """Cambia la cota de una planta (p.ej. cuando sale el nodo que la definía)."""
+        self.remove(key)
+        bisect.insort(self.keys, new_key)
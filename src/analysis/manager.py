@@ -1,9 +1,17 @@
 from PyQt6.QtCore import QObject, pyqtSignal
+from contextlib import contextmanager
 import math
+import numpy as np
+from src.analysis.floor_index import FloorIndex
+from src.analysis.loads import NodalLoad
+from src.analysis.model_store import NodeTable, ElementTable
+from src.analysis.model_events import ModelChange
 
 class ProjectManager(QObject):
     _instance = None
     dataChanged = pyqtSignal()
+    # Aviso tipado (ModelChange) con los tags afectados; se emite justo antes de dataChanged
+    modelChanged = pyqtSignal(object)
 
     @classmethod
     def instance(cls):
@@ -24,6 +32,10 @@ class ProjectManager(QObject):
         self.node = {}
         self.element = {}
         self.load = {}
+
+        #Almacén columnar de nodos y elementos: los objetos de self.node/self.element son vistas de sus filas
+        self.node_store = NodeTable()
+        self.element_store = ElementTable()
         
         # Resultados de Análisis
         self.gravity_results = None
@@ -39,9 +51,19 @@ class ProjectManager(QObject):
         self.next_element_tag = 1
         self.next_load_tag = 1
 
-        #Caché de Topología (Pisos)
-        self._topology_dirty = True
-        self._floors_cache = {}        
+        #Índice de Topología (Pisos). Se mantiene incrementalmente en cada alta/baja/edición;
+        # _topology_dirty fuerza una reconstrucción completa en el siguiente get_floor_data()
+        self._reset_floor_index()
+
+        #Índices inversos (nodo -> elementos, nodo -> cargas, elemento -> cargas)
+        self._reset_reverse_indexes()
+
+        #Transacciones (batch): dentro de ellas los avisos y las invalidaciones se acumulan
+        self._batch_depth = 0
+        self._pending_changed = False
+        self._pending_invalidate = False
+        #Cambios acumulados desde el último aviso (se envían con modelChanged)
+        self._change = ModelChange()
 
 
  ## Materiales ##   
@@ -86,18 +108,63 @@ class ProjectManager(QObject):
 
 ## Nodos ## 
     def add_node(self, node):
+        if node.tag in self.node:
+            self._unindex_node(node.tag)
+            self.node_store.detach(node.tag)
         self.node[node.tag] = node
-        self.mark_topology_dirty()
+        self.node_store.attach(node)
+        self._index_node(node)
+        self._record_change(nodes=[node.tag])
+        self._invalidate_results()
         if node.tag >= self.next_node_tag:
             self.next_node_tag = node.tag + 1
 
     def get_node(self,tag):
         return self.node.get(tag)
 
-    def delete_node(self,tag):
-        self.mark_topology_dirty()
-        if tag in self.node:
-            del self.node[tag]
+    def update_node(self, tag, x=None, y=None, fixity=None):
+        """
+        Modifica coordenadas y/o restricciones de un nodo manteniendo el índice de pisos.
+        Devuelve True si algo cambió (solo entonces se invalidan los resultados).
+        """
+        node = self.node.get(tag)
+        if node is None:
+            return False
+
+        new_x = node.x if x is None else x
+        new_y = node.y if y is None else y
+        new_fixity = node.fixity if fixity is None else list(fixity)
+        moved = (new_x, new_y) != (node.x, node.y)
+        if not moved and new_fixity == node.fixity:
+            return False
+
+        if moved:
+            self._unindex_node(tag)
+            node.x, node.y = new_x, new_y
+            self._index_node(node)
+        node.fixity = new_fixity
+        self._record_change(nodes=[tag])
+        self._invalidate_results()
+        return True
+
+    def delete_node(self, tag, cascade=False):
+        """Elimina un nodo. Con 'cascade' elimina también sus cargas y los elementos conectados (con las suyas)."""
+        if tag not in self.node:
+            return
+        if cascade:
+            for ele in self.get_elements_of_node(tag):
+                self.delete_element(ele.tag, cascade=True)
+            for load in self.get_loads_of_node(tag):
+                self.delete_load(load.tag)
+        self._unindex_node(tag)
+        self.node_store.detach(tag)
+        del self.node[tag]
+        self._record_change(nodes=[tag])
+        self._invalidate_results()
+
+    def get_elements_of_node(self, tag):
+        """Elementos conectados a un nodo (en orden de tag)."""
+        return [self.element[t] for t in sorted(self._node_elements.get(tag, ()))]
     
     def get_next_node_tag(self):
         return self.next_node_tag
@@ -105,11 +172,48 @@ class ProjectManager(QObject):
     def get_all_nodes(self):
         return list(self.node.values())
 
+    def get_node_arrays(self):
+        """Tags (N), coordenadas (N×2) y restricciones (N×3) de todos los nodos, como vistas de solo lectura."""
+        store = self.node_store
+        return store.active("tag"), store.active("xy"), store.active("fixity")
+
+    def add_nodes_from_arrays(self, tags, xy, fixity):
+        """
+        Alta masiva de nodos desde arrays (N), (N×2), (N×3): se copian de una vez al almacén.
+        Si algún tag ya existe se recurre a add_node uno a uno (semántica de reemplazo).
+        """
+        from src.analysis.node import Node
+
+        tags = np.asarray(tags, dtype=np.int64)
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        fixity = np.asarray(fixity, dtype=np.int8).reshape(-1, 3)
+        tag_list = tags.tolist()
+        nodes = [Node(t, x, y, f) for t, (x, y), f in zip(tag_list, xy.tolist(), fixity.tolist())]
+        if any(t in self.node for t in tag_list) or len(set(tag_list)) != len(tag_list):
+            for node in nodes:
+                self.add_node(node)
+            return
+
+        self.node_store.attach_many(nodes, tag=tags, xy=xy, fixity=fixity)
+        self.node.update(zip(tag_list, nodes))
+        # El índice de pisos se reconstruye de una vez (vectorizado) en el siguiente get_floor_data()
+        self._topology_dirty = True
+        self._record_change(nodes=tag_list)
+        self._invalidate_results()
+        if tag_list:
+            self.next_node_tag = max(self.next_node_tag, max(tag_list) + 1)
+
 
 ## Elementos ## 
     def add_element(self, element):
+        if element.tag in self.element:
+            self.delete_element(element.tag)
         self.element[element.tag] = element
-        self.mark_topology_dirty()
+        self.element_store.attach(element)
+        self._connect_element(element)
+        self._index_element(element)
+        self._record_change(elements=[element.tag])
+        self._invalidate_results()
 
         if element.tag >= self.next_element_tag:
             self.next_element_tag = element.tag + 1
@@ -117,10 +221,45 @@ class ProjectManager(QObject):
     def get_element(self,tag):
         return self.element.get(tag)
 
-    def delete_element(self,tag):
-        self.mark_topology_dirty()
-        if tag in self.element:
-            del self.element[tag]
+    def update_element(self, tag, **changes):
+        """
+        Modifica atributos de un elemento (conectividad, sección, masa...) manteniendo el índice de pisos.
+        Devuelve True si algo cambió (solo entonces se invalidan los resultados).
+        """
+        ele = self.element.get(tag)
+        if ele is None:
+            return False
+        changes = {k: v for k, v in changes.items() if getattr(ele, k) != v}
+        if not changes:
+            return False
+
+        reconnect = "node_i" in changes or "node_j" in changes
+        if reconnect:
+            self._unindex_element(tag)
+            self._disconnect_element(ele)
+        for key, value in changes.items():
+            setattr(ele, key, value)
+        if reconnect:
+            self._connect_element(ele)
+            self._index_element(ele)
+        self._record_change(elements=[tag])
+        self._invalidate_results()
+        return True
+
+    def delete_element(self, tag, cascade=False):
+        """Elimina un elemento. Con 'cascade' elimina también sus cargas distribuidas."""
+        ele = self.element.get(tag)
+        if ele is None:
+            return
+        if cascade:
+            for load in self.get_loads_of_element(tag):
+                self.delete_load(load.tag)
+        self._unindex_element(tag)
+        self._disconnect_element(ele)
+        self.element_store.detach(tag)
+        del self.element[tag]
+        self._record_change(elements=[tag])
+        self._invalidate_results()
    
     def get_next_element_tag(self):
         return self.next_element_tag
@@ -128,165 +267,412 @@ class ProjectManager(QObject):
     def get_all_elements(self):
         return list(self.element.values())
 
-## Pisos ##
-    def get_floor_data(self):
-        if not self._topology_dirty:
-            return self._floors_cache
+    def get_element_arrays(self):
+        """
+        Tags (E) de los elementos y filas (E×2) de sus nodos i/j en get_node_arrays() (-1 si el nodo no existe).
+        Con ellas, xy[rows] da las coordenadas de los extremos de todos los elementos de una vez.
+        """
+        store = self.element_store
+        nodes = store.active("nodes")
+        return store.active("tag"), self.node_store.rows_of(nodes)
+
+    def add_elements_from_arrays(self, tags, nodes, section_tags, transf_tags, integration_points, mass_density):
+        """
+        Alta masiva de elementos ForceBeamColumn desde arrays (una fila por elemento; sección -1 = ninguna).
+        Si algún tag ya existe se recurre a add_element uno a uno (semántica de reemplazo).
+        """
+        from src.analysis.element import ForceBeamColumn
+        from src.analysis.model_store import decode_optional_tag
+
+        columns = {
+            "tag": np.asarray(tags, dtype=np.int64),
+            "nodes": np.asarray(nodes, dtype=np.int64).reshape(-1, 2),
+            "section_tag": np.asarray(section_tags, dtype=np.int64),
+            "transf_tag": np.asarray(transf_tags, dtype=np.int64),
+            "integration_points": np.asarray(integration_points, dtype=np.int64),
+            "mass_density": np.asarray(mass_density, dtype=np.float64),
+        }
+        tag_list = columns["tag"].tolist()
+        elements = [
+            ForceBeamColumn(t, ni, nj, decode_optional_tag(sec), transf, ip, rho)
+            for t, (ni, nj), sec, transf, ip, rho in zip(
+                tag_list, columns["nodes"].tolist(), columns["section_tag"].tolist(),
+                columns["transf_tag"].tolist(), columns["integration_points"].tolist(),
+                columns["mass_density"].tolist())
+        ]
+        if any(t in self.element for t in tag_list) or len(set(tag_list)) != len(tag_list):
+            for element in elements:
+                self.add_element(element)
+            return
 
-        floors = {}
-        tolerance = 1e-3   # 1 mm de tolerancia
-        
-        #Agrupar nodos
-        for node in self.get_all_nodes():
-            y = node.y
-
-            #buscar si el piso ya existe en nuestra tolerancia
-            floor_y = None
-            for key in floors.keys():
-                if abs(key - y) < tolerance:
-                    floor_y = key
-                    break
-            
-            #Si no existe lo inicializamos
-            if floor_y is None:
-                floor_y = y
-                floors[floor_y] = {"nodes": [], "columns": [], "beams": []}
-
-            floors[floor_y]["nodes"].append(node)
-
-        #Agrupar elementos
-
-        for ele in self.get_all_elements():
-            ni = self.get_node(ele.node_i)
-            nj = self.get_node(ele.node_j)
-
-            if not ni or not nj: continue
-
-            #Diferencia principal (Vertical u Horizontal)
-            dx = abs(nj.x - ni.x)
-            dy = abs(nj.y - ni.y)
-            
-            is_column = dy > tolerance and dx < tolerance
-            is_beam = dx > tolerance and dy < tolerance
-
-            if is_column:
-                #La columna pertence al piso de su nodo más alto.
-                y_ceil = max(ni.y, nj.y)
-
-                #Buscar el piso correspondiente
-                for key in floors.keys():
-                    if abs(key - y_ceil) < tolerance:
-                        floors[key]["columns"].append(ele)
-                        break
-
-                    elif is_beam:
-                        y_beam = ni.y
-
-                        for key in floors.keys():
-                            if abs(key-y_beam) < tolerance:
-                                floors[key]["beams"].append(ele)
-                                break
-
-            #Gurdamos en caché el diccionario ordenado
-            self._floors_cache = dict(sorted(floors.items()))
-            self._topology_dirty = False
+        self.element_store.attach_many(elements, **columns)
+        self.element.update(zip(tag_list, elements))
+        # Conectividad nodo -> elementos directamente desde la columna (sin pasar por las vistas)
+        node_elements = self._node_elements
+        for tag, (ni, nj) in zip(tag_list, columns["nodes"].tolist()):
+            node_elements.setdefault(ni, set()).add(tag)
+            node_elements.setdefault(nj, set()).add(tag)
+        self._topology_dirty = True
+        self._record_change(elements=tag_list)
+        self._invalidate_results()
+        if tag_list:
+            self.next_element_tag = max(self.next_element_tag, max(tag_list) + 1)
 
+## Pisos ##
+    def get_floor_data(self):
+        if self._topology_dirty:
+            self._rebuild_floor_index()
+        if self._floors_cache is None:
+            #Gurdamos en caché el diccionario ordenado (las listas son las del índice, no copias)
+            self._floors_cache = dict(sorted(self._floors.items()))
         return self._floors_cache
 
     def mark_topology_dirty(self):
-        """Avisa al manager que las coordenadas o elementos han cambiado"""
+        """Avisa al manager que las coordenadas o elementos han cambiado fuera de sus métodos (reconstrucción completa)"""
         self._topology_dirty = True
+        self._change.full = True
+        self._invalidate_results()
+
+    def _invalidate_results(self):
+        """Los resultados dejan de corresponder al modelo (solo ante cambios que afectan al análisis)."""
+        if self._batch_depth:
+            self._pending_invalidate = True
+            return
+        self._change.results = True
         self.gravity_results = None
         self.pushover_results = None
 
+    def _record_change(self, nodes=(), elements=(), loads=()):
+        """Anota los tags afectados para el próximo modelChanged."""
+        self._change.nodes.update(nodes)
+        self._change.elements.update(elements)
+        self._change.loads.update(loads)
+
+## Transacciones ##
+    @contextmanager
+    def batch(self, topology=False):
+        """
+        Agrupa muchas modificaciones en una sola transacción:
+            with manager.batch():
+                for ...: manager.add_load(...)
+        Dentro, las altas/bajas no emiten dataChanged ni invalidan resultados uno a uno;
+        al cerrar la transacción más externa se invalida una vez y se emite un único aviso
+        (modelChanged con todos los tags afectados, y dataChanged).
+        Con 'topology=True' (altas masivas de nodos/elementos) el índice de pisos no se mantiene
+        paso a paso: se reconstruye de una vez, vectorizado, en el siguiente get_floor_data().
+        """
+        if topology:
+            self._topology_dirty = True
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self._pending_invalidate:
+                    self._pending_invalidate = False
+                    self._invalidate_results()
+                if self._pending_changed:
+                    self._pending_changed = False
+                    self.notify_changed()
+
+    def notify_changed(self):
+        """
+        Emite modelChanged (con los cambios acumulados) y dataChanged, o lo aplaza al final
+        de la transacción en curso. Sin cambios anotados se avisa como cambio completo.
+        """
+        if self._batch_depth:
+            self._pending_changed = True
+            return
+        change, self._change = self._change, ModelChange()
+        if not change:
+            change.full = True
+        self.modelChanged.emit(change)
+        self.dataChanged.emit()
+
+    def _reset_floor_index(self):
+        self._floor_index = FloorIndex(tolerance=1e-3)   # 1 mm de tolerancia
+        self._floors = {}           # cota -> {"nodes", "columns", "beams"}
+        self._node_floor = {}       # tag de nodo -> cota de su piso
+        self._element_floor = {}    # tag de elemento -> (cota, grupo, elemento)
+        self._floors_cache = None
+        self._floor_masses_cache = None
+        self._topology_dirty = True
+
+    def _rebuild_floor_index(self):
+        """Reconstrucción completa: nodos por bisección y elementos en una pasada vectorizada."""
+        self._reset_floor_index()
+        # La conectividad pudo cambiar por fuera del manager: se recalcula con el índice
+        self._node_elements = {}
+        for ele in self.element.values():
+            self._connect_element(ele)
+
+        #Agrupar nodos (búsqueda por bisección en las cotas ya conocidas)
+        for node in self.node.values():
+            self._add_node_to_floor(node)
+
+        #Agrupar elementos (coordenadas de los extremos directamente desde los arrays del almacén)
+        _, node_rows = self.get_element_arrays()
+        _, xy, _ = self.get_node_arrays()
+        valid = np.flatnonzero((node_rows >= 0).all(axis=1))
+
+        if valid.size:
+            ends = xy[node_rows[valid]]             # (E, 2 extremos, 2 coordenadas)
+            xi, yi = ends[:, 0, 0], ends[:, 0, 1]
+            xj, yj = ends[:, 1, 0], ends[:, 1, 1]
+            groups = self._classify_elements(xi, yi, xj, yj)
+            j_on_top = yj >= yi
+            views = self.element_store.views
+            for k in np.flatnonzero(groups >= 0):
+                ele = views[valid[k]]
+                is_column = groups[k] == 0
+                # La columna pertenece al piso de su nodo más alto; la viga, al de su nodo i
+                anchor = ele.node_j if is_column and j_on_top[k] else ele.node_i
+                self._add_element_to_floor(ele, self._node_floor[anchor], "columns" if is_column else "beams")
+
+        self._topology_dirty = False
+
+    def _classify_elements(self, xi, yi, xj, yj):
+        """Clasificación vectorizada: 0 = columna, 1 = viga, -1 = ninguna (diagonal o degenerado)."""
+        tolerance = self._floor_index.tolerance
+
+        #Diferencia principal (Vertical u Horizontal)
+        dx = np.abs(np.asarray(xj) - np.asarray(xi))
+        dy = np.abs(np.asarray(yj) - np.asarray(yi))
+        is_column = (dy > tolerance) & (dx < tolerance)
+        is_beam = (dx > tolerance) & (dy < tolerance)
+        return np.where(is_column, 0, np.where(is_beam, 1, -1))
+
+    def _add_node_to_floor(self, node):
+        floor_y = self._floor_index.add(node.y)
+        if floor_y not in self._floors:
+            self._floors[floor_y] = {"nodes": [], "columns": [], "beams": []}
+            self._floors_cache = None
+        self._floors[floor_y]["nodes"].append(node)
+        self._node_floor[node.tag] = floor_y
+
+    def _add_element_to_floor(self, ele, floor_y, group):
+        self._floors[floor_y][group].append(ele)
+        self._element_floor[ele.tag] = (floor_y, group, ele)
+
+    def _connect_element(self, ele):
+        for tag in (ele.node_i, ele.node_j):
+            self._node_elements.setdefault(tag, set()).add(ele.tag)
+
+    def _disconnect_element(self, ele):
+        for tag in (ele.node_i, ele.node_j):
+            connected = self._node_elements.get(tag)
+            if connected is not None:
+                connected.discard(ele.tag)
+                if not connected:
+                    del self._node_elements[tag]
+
+    def _index_node(self, node):
+        """Alta incremental de un nodo y de los elementos que esperaban por él."""
+        if self._topology_dirty:
+            return
+        self._add_node_to_floor(node)
+        for ele_tag in self._node_elements.get(node.tag, ()):
+            self._index_element(self.element[ele_tag])
+
+    def _unindex_node(self, tag):
+        """Baja incremental de un nodo: sus elementos quedan sin piso hasta que vuelva a existir."""
+        if self._topology_dirty:
+            return
+        for ele_tag in self._node_elements.get(tag, ()):
+            self._unindex_element(ele_tag)
+
+        floor_y = self._node_floor.pop(tag, None)
+        if floor_y is None:
+            return
+        floor = self._floors[floor_y]
+        node = self.node[tag]
+        floor["nodes"].remove(node)
+        if not floor["nodes"]:
+            # Piso vacío: desaparece (sus columnas y vigas ya se retiraron con sus nodos)
+            del self._floors[floor_y]
+            self._floor_index.remove(floor_y)
+            self._floors_cache = None
+        elif node.y == floor_y and floor["nodes"][0].y != floor_y:
+            # Sale el nodo que dio la cota al piso: pasa a la del primero que queda, como al reconstruir
+            self._rekey_floor(floor_y, floor["nodes"][0].y)
+
+    def _rekey_floor(self, floor_y, new_y):
+        floor = self._floors.pop(floor_y)
+        self._floors[new_y] = floor
+        self._floor_index.rekey(floor_y, new_y)
+        for node in floor["nodes"]:
+            self._node_floor[node.tag] = new_y
+        for group in ("columns", "beams"):
+            for ele in floor[group]:
+                self._element_floor[ele.tag] = (new_y, group, ele)
+        self._floors_cache = None
+
+    def _index_element(self, ele):
+        if self._topology_dirty or ele.tag in self._element_floor:
+            return
+        ni = self.node.get(ele.node_i)
+        nj = self.node.get(ele.node_j)
+        if not ni or not nj:
+            return
+        # Misma regla que _classify_elements, en escalar (un solo elemento)
+        tolerance = self._floor_index.tolerance
+        dx = abs(nj.x - ni.x)
+        dy = abs(nj.y - ni.y)
+        if dy > tolerance and dx < tolerance:
+            anchor = nj if nj.y >= ni.y else ni
+            self._add_element_to_floor(ele, self._node_floor[anchor.tag], "columns")
+        elif dx > tolerance and dy < tolerance:
+            self._add_element_to_floor(ele, self._node_floor[ni.tag], "beams")
+
+    def _unindex_element(self, tag):
+        if self._topology_dirty:
+            return
+        entry = self._element_floor.pop(tag, None)
+        if entry is not None:
+            floor_y, group, ele = entry
+            self._floors[floor_y][group].remove(ele)
+
 ## Masas ##
     def get_floor_masses(self):
-        """Calcula las masas concentradas horizontal para cada planta"""
-        floor_masses = {}
+        """
+        Calcula las masas concentradas horizontal para cada planta.
+        Vectorizado sobre los arrays del almacén y memoizado: se recalcula solo si cambió el modelo
+        (contadores de versión de nodos/elementos) o el índice de pisos.
+        """
         floor_data = self.get_floor_data()
+        key = (self.node_store.version, self.element_store.version)
+        cache = self._floor_masses_cache
+        if cache is not None and cache[0] == key and cache[1] is floor_data:
+            return dict(cache[2])
+
+        floor_masses = self._compute_floor_masses(floor_data)
+        self._floor_masses_cache = (key, floor_data, floor_masses)
+        return dict(floor_masses)
 
+    def _compute_floor_masses(self, floor_data):
         #1. Obtener la lista ordenadas de alturas Y
         sorted_ys = list(floor_data.keys())
+        n_floors = len(sorted_ys)
+        if not n_floors:
+            return {}
 
-        #2. Iterrar por cada piso para rellenar las masas
+        #2. Una fila por contribución (vigas y columnas de cada piso, en el orden del índice)
+        beam_tags, beam_floor, col_tags, col_floor = [], [], [], []
         for i, y_floor in enumerate(sorted_ys):
-            total_mass_x = 0.0
-            elements_dict = floor_data[y_floor]
-
-            # Masa de las vigas
-            for beam in elements_dict.get("beams",[]):
-                ni = self.get_node(beam.node_i)
-                nj = self.get_node(beam.node_j)
-                if not ni or not nj: continue
-
-                L = ((nj.x - ni.x)**2 + (nj.y - ni.y)**2)**0.5
-                rho = getattr(beam, 'mass_density')
-                total_mass_x += (L * rho)
-
-            #Masa de las columnas
-            for col in elements_dict.get("columns", []):
-                ni = self.get_node(col.node_i)
-                nj = self.get_node(col.node_j)
-                if not ni or not nj: continue
-
-                l_col = abs(nj.y - ni.y)
-                rho_col = getattr(col, 'mass_density')
-                mass_col = l_col * rho_col
-
-                #mitad para el piso actual
-                total_mass_x += (mass_col/2.0)
-
-                if i > 0:
-                    y_prev = sorted_ys[i-1]
-
-                    is_base = False
-                    for node in floor_data[y_prev]["nodes"]:
-                        if node.fixity[0] == 1 or node.fixity[1] == 1:
-                            is_base = True
-                            break
-                    
-                    if not is_base:
-                        if y_prev not in floor_masses: 
-                            floor_masses[y_prev] = 0.0
-                        floor_masses[y_prev] += (mass_col/2.0)
-
-            #Guardamos la masa calcula hasta ahora para este y_floor
-            if y_floor not in floor_masses:
-                floor_masses[y_floor] = 0.0
-            floor_masses[y_floor] += total_mass_x
-            
-        return floor_masses
+            beams = floor_data[y_floor].get("beams", [])
+            columns = floor_data[y_floor].get("columns", [])
+            beam_tags.extend(e.tag for e in beams)
+            beam_floor.extend([i] * len(beams))
+            col_tags.extend(e.tag for e in columns)
+            col_floor.extend([i] * len(columns))
+
+        node_tags, xy, fixity = self.get_node_arrays()
+        nodes = self.element_store.active("nodes")
+
+        def element_geometry(tags):
+            # Coordenadas de los extremos (E×2×2) y densidad de masa de cada elemento
+            rows = self.element_store.rows_of(tags)
+            node_rows = self.node_store.rows_of(nodes[rows])
+            ok = (node_rows >= 0).all(axis=1)
+            ends = xy[node_rows[ok]]
+            return ends, self.element_store.mass_density[rows[ok]], ok
+
+        # Masa de las vigas: L * rho
+        ends, rho, ok = element_geometry(beam_tags)
+        dx = ends[:, 1, 0] - ends[:, 0, 0]
+        dy = ends[:, 1, 1] - ends[:, 0, 1]
+        beam_mass = np.power(dx**2 + dy**2, 0.5) * rho
+        beam_floor = np.asarray(beam_floor, dtype=np.int64)[ok]
+
+        # Masa de las columnas: mitad para su piso y mitad para el inferior (salvo que este sea la base)
+        ends, rho, ok = element_geometry(col_tags)
+        half_col = np.abs(ends[:, 1, 1] - ends[:, 0, 1]) * rho / 2.0
+        col_floor = np.asarray(col_floor, dtype=np.int64)[ok]
+
+        # Piso de base: alguno de sus nodos restringido en X o Y
+        is_base = np.zeros(n_floors, dtype=bool)
+        floor_pos = {y: i for i, y in enumerate(sorted_ys)}
+        node_floor = np.array([floor_pos[self._node_floor[tag]] for tag in node_tags.tolist()], dtype=np.int64)
+        is_base[node_floor[(fixity[:, 0] == 1) | (fixity[:, 1] == 1)]] = True
+
+        # np.add.at acumula sin búfer y en orden, así que cada piso suma lo mismo y en la misma
+        # secuencia que el recorrido piso a piso: sus vigas, sus columnas y después las mitades
+        # de las columnas del piso superior
+        below = col_floor - 1
+        to_below = (below >= 0) & ~is_base[np.maximum(below, 0)]
+        own_index = np.concatenate([beam_floor, col_floor])
+        own_order = np.argsort(own_index, kind="stable")
+        index = np.concatenate([own_index[own_order], below[to_below]])
+        values = np.concatenate([np.concatenate([beam_mass, half_col])[own_order], half_col[to_below]])
+
+        totals = np.zeros(n_floors)
+        np.add.at(totals, index, values)
+        return dict(zip(sorted_ys, totals.tolist()))
 
 ## Cargas (Loads) ##
     def add_load(self, load):
         if load.tag == 0:
             load.tag = self.next_load_tag
+        if load.tag in self.load:
+            self._unregister_load(self.load[load.tag])
         self.load[load.tag] = load
+        self._register_load(load)
         if load.tag >= self.next_load_tag:
             self.next_load_tag = load.tag + 1
-        self.gravity_results = None
-        self.pushover_results = None
-        self.dataChanged.emit()
+        self._record_change(loads=[load.tag])
+        self._invalidate_results()
+        self.notify_changed()
     def get_load(self, tag):
         return self.load.get(tag)
     def delete_load(self, tag):
         if tag in self.load:
-            del self.load[tag]
-            self.gravity_results = None
-            self.pushover_results = None
-            self.dataChanged.emit()
+            self._unregister_load(self.load.pop(tag))
+            self._record_change(loads=[tag])
+            self._invalidate_results()
+            self.notify_changed()
     def get_next_load_tag(self):
         return self.next_load_tag
     def get_all_loads(self):
         return list(self.load.values())
 
+    def get_loads_of_node(self, node_tag):
+        """Cargas nodales aplicadas a un nodo (en orden de tag)."""
+        return [self.load[t] for t in sorted(self._node_loads.get(node_tag, ()))]
 
+    def get_loads_of_element(self, element_tag):
+        """Cargas distribuidas aplicadas a un elemento (en orden de tag)."""
+        return [self.load[t] for t in sorted(self._element_loads.get(element_tag, ()))]
 
-## Guardar el projecto ##
-    def save_project(self, filename):
-        import json
+    def _reset_reverse_indexes(self):
+        self._node_elements = {}    # tag de nodo -> tags de los elementos conectados
+        self._node_loads = {}       # tag de nodo -> tags de sus cargas nodales
+        self._element_loads = {}    # tag de elemento -> tags de sus cargas distribuidas
+
+    def _load_owner(self, load):
+        """(índice, tag del dueño) de una carga según su tipo."""
+        if isinstance(load, NodalLoad):
+            return self._node_loads, load.node_tag
+        return self._element_loads, load.element_tag
+
+    def _register_load(self, load):
+        index, owner = self._load_owner(load)
+        index.setdefault(owner, set()).add(load.tag)
 
-        data ={
+    def _unregister_load(self, load):
+        index, owner = self._load_owner(load)
+        tags = index.get(owner)
+        if tags is not None:
+            tags.discard(load.tag)
+            if not tags:
+                del index[owner]
+
+
+
+## Guardar el projecto ##
+    def project_to_dict(self):
+        """Serializa el modelo completo (el mismo esquema que el fichero de proyecto)."""
+        return {
             "materials": [m.to_dict() for m in self.get_all_materials()],
             "sections": [s.to_dict() for s in self.get_all_sections()],
             "nodes": [n.to_dict() for n in self.get_all_nodes()],
@@ -294,46 +680,45 @@ class ProjectManager(QObject):
             "loads": [l.to_dict() for l in self.get_all_loads()]
         }
 
+    def save_project(self, filename, include_results=False):
+        """
+        Guarda el proyecto. Con 'include_results' se guardan también los resultados de gravedad
+        y Pushover (arrays comprimidos + huella del modelo): dentro del propio .npz, o en un
+        fichero compañero 'nombre.results.npz' si el proyecto es JSON.
+        """
+        import json
+        from src.analysis.project_file import is_binary_project, save_binary_project, save_results, results_path
+
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent = 4)
+            # .npz -> formato binario columnar; cualquier otra extensión -> JSON (intercambio)
+            if is_binary_project(filename):
+                save_binary_project(self, filename, include_results=include_results)
+            else:
+                data = self.project_to_dict()
+                with open(filename, 'w') as f:
+                    json.dump(data, f, indent = 4)
+                if include_results:
+                    save_results(self, results_path(filename))
             print(f"Proyecto guardado exitosamente en: {filename}")
             return True
         except Exception as e:
             print(f"Error guardando proyecto: {e}")
             return False
 
-    def load_project(self,filename):
-        import json
-        from src.analysis.materials import Concrete01, Steel01
-        from src.analysis.sections import FiberSection
+    def load_project_data(self, data):
+        """Reconstruye el modelo desde un diccionario con el esquema de project_to_dict()."""
         from src.analysis.node import Node
         from src.analysis.element import ForceBeamColumn
         from src.analysis.loads import NodalLoad, ElementLoad   
 
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-
+        # Una sola transacción: un único dataChanged al final y el índice de pisos
+        # se reconstruye de una vez en lugar de mantenerse alta a alta
+        with self.batch(topology=True):
             #Limpieza de datos antiguos
             self.new_project() 
-            #1. Cargar Materiales
-            for m_data in data.get("materials",[]):
-                tipo = m_data.get("type")
-                if tipo == "Concrete01":
-                    mat = Concrete01.from_dict(m_data)
-                elif tipo == "Steel01":
-                    mat = Steel01.from_dict(m_data)
-                else:
-                    continue
-                self.add_material(mat)
-
-            #2. Cargar secciones
-            for s_data in data.get("sections",[]):
-                if s_data.get("type") == "FiberSection":
-                    sec = FiberSection.from_dict(s_data)
-                    self.add_section(sec)
-            
+            #1-2. Cargar Materiales y secciones
+            self.load_definitions(data)
+        
             #3. Cargar Nodos
             for n_data in data.get("nodes",[]):
                 node = Node.from_dict(n_data)
@@ -344,7 +729,7 @@ class ProjectManager(QObject):
                 if e_data.get("type") == "ForceBeamColumn":
                     element = ForceBeamColumn.from_dict(e_data)
                     self.add_element(element)
-            
+        
             # 5. Cargar Cargas (Loads)
             for l_data in data.get("loads", []):
                 tipo = l_data.get("type")
@@ -355,15 +740,65 @@ class ProjectManager(QObject):
                 else:
                     continue
                 self.add_load(load)
-            self.mark_topology_dirty()
 
+    def load_definitions(self, data):
+        """Carga materiales y secciones desde sus diccionarios ('materials', 'sections')."""
+        from src.analysis.materials import Concrete01, Steel01
+        from src.analysis.sections import FiberSection
+
+        #1. Cargar Materiales
+        for m_data in data.get("materials",[]):
+            tipo = m_data.get("type")
+            if tipo == "Concrete01":
+                mat = Concrete01.from_dict(m_data)
+            elif tipo == "Steel01":
+                mat = Steel01.from_dict(m_data)
+            else:
+                continue
+            self.add_material(mat)
+
+        #2. Cargar secciones
+        for s_data in data.get("sections",[]):
+            if s_data.get("type") == "FiberSection":
+                sec = FiberSection.from_dict(s_data)
+                self.add_section(sec)
+
+    def load_project(self,filename):
+        """
+        Carga un proyecto (JSON o binario). Si el fichero trae resultados guardados y la huella
+        coincide con el modelo cargado, quedan de nuevo en gravity_results / pushover_results.
+        """
+        import os
+        import json
+        from src.analysis.project_file import (is_binary_project, load_binary_project, load_results,
+                                               restore_results, results_path)
+
+        try:
+            # Ambas rutas emiten dataChanged al cerrar su transacción
+            if is_binary_project(filename):
+                content = load_binary_project(self, filename)
+                restore = lambda: restore_results(self, content["header"].get("results"), content["arrays"])
+            else:
+                with open(filename, 'r') as f:
+                    data = json.load(f)
+                self.load_project_data(data)
+                sidecar = results_path(filename)
+                restore = lambda: os.path.exists(sidecar) and load_results(self, sidecar)
             print(f"Projecto cargado: {len(self.node)} nodos, {len(self.element)} elementos")
-            self.dataChanged.emit()
-            return True
 
         except Exception as e:
             print(f"Error cargando projecto {e}")
             return False
+
+        # Los resultados son opcionales: si no se pueden leer, el modelo queda cargado sin ellos
+        try:
+            if restore():
+                print("Resultados de análisis restaurados")
+        except Exception as e:
+            self.gravity_results = None
+            self.pushover_results = None
+            print(f"[Proyecto] No se pudieron leer los resultados guardados ({e}): se descartan")
+        return True
     
     def new_project(self):
         """Reinicia completamente el estado del proyecto."""
@@ -372,12 +807,15 @@ class ProjectManager(QObject):
         self.section.clear()
         self.node.clear()
         self.element.clear()
-        self.element.clear()
         self.load.clear()
+        self.node_store.clear()
+        self.element_store.clear()
+        self._reset_floor_index()
+        self._reset_reverse_indexes()
+        self._change.full = True
         
         # Limpiar resultados y temporales
-        self.gravity_results = None
-        self.pushover_results = None
+        self._invalidate_results()
         self.pushover_loads.clear()
         
         # Reiniciar contadores
@@ -388,4 +826,4 @@ class ProjectManager(QObject):
         self.next_load_tag = 1
         
         # Notificar a la UI que todo cambió (se borró)
-        self.dataChanged.emit()
\ No newline at end of file
+        self.notify_changed()
\ No newline at end of file
@@ -4,83 +4,231 @@ from src.analysis.materials import Concrete01, Steel01, Elastic
 from src.analysis.sections import FiberSection
 from src.analysis.element import ForceBeamColumn
 from src.analysis.loads import NodalLoad, ElementLoad
+from src.analysis.command_log import CommandLog
+from src.analysis.domain_sync import DomainSnapshot, DomainState
 
 class ModelBuilder:
+    # Command log shared by new builders (off by default; see use_command_log)
+    default_command_log = CommandLog()
+
+    @classmethod
+    def use_command_log(cls, command_log):
+        """
+        Selects where new builders log their commands: CommandLog() (off), MemoryCommandLog or FileCommandLog.
+        A newly enabled log invalidates the local domain, so the next build_model() is a full build that
+        starts the log with a complete, replayable script instead of an incremental diff.
+        """
+        if cls.default_command_log is command_log:
+            return
+        cls.default_command_log.close()
+        cls.default_command_log = command_log
+        if command_log.enabled:
+            DomainState.instance().invalidate()
+
     def __init__(self):
         self.manager = ProjectManager.instance()
-        self.debug_file = None
+        self.command_log = ModelBuilder.default_command_log
+        # Optional callable(command, *args) that replaces local execution
+        # (e.g. OpenSeesWorker.submit to replay the stream in another process)
+        self.executor = None
+        # Optional list that records every command as ("cmd", command, args) (pushover checkpoints)
+        self.journal = None
+        # What the local domain holds (shared by every builder: openseespy has a single domain)
+        self.domain = DomainState.instance()
+        self._syncing = False
+        self._integrations = {}
+        self._next_integration_tag = 1
 
     def log_command(self, command, *args):
         """
         Helper method to:
-        1. Write the command to model_debug.py (if open)
-        2. Execute the command via openseespy
+        1. Record the command in the command log (if enabled)
+        2. Execute the command via openseespy (or forward it to self.executor)
         """
-        # 1. Log to file
-        if self.debug_file:
-            str_args = []
-            for arg in args:
-                str_args.append(repr(arg))
-            
-            line = f"{command}({', '.join(str_args)})"
-            self.debug_file.write(line + "\n")
-            self.debug_file.flush()
+        # 1. Log (the sink formats and writes lazily/in blocks)
+        if self.command_log.enabled:
+            self.command_log.command(command, args)
+
+        if self.journal is not None:
+            self.journal.append(("cmd", command, args))
 
         # 2. Execute
+        if self.executor is not None:
+            return self.executor(command, *args)
+
+        # Commands sent outside build/sync change the domain behind the snapshot
+        if not self._syncing:
+            self.domain.on_command(command)
+
         func = getattr(ops, command)
         
         return func(*args)
 
-    def build_model(self):
-        """Construye el modelo completo en OpenSees."""
+    def log_comment(self, text):
+        """Adds a section comment to the command log (if enabled)."""
+        if self.command_log.enabled:
+            self.command_log.comment(text)
+
+    def mark_domain_modified(self):
+        """Commands executed directly on ops (e.g. journal replay): the domain no longer matches the snapshot."""
+        if self.executor is None:
+            self.domain.invalidate()
+
+    def mark_gravity_applied(self):
+        if self.executor is None:
+            self.domain.mark_gravity()
+
+    def domain_has_model(self):
+        """True if the local domain holds the current model (built or synced, whatever was run on it since)."""
+        if self.executor is not None or not self.domain.is_valid:
+            return False
+        return DomainSnapshot.of(self.manager) == self.domain.snapshot
+
+    def domain_has_gravity(self):
+        """True if the local domain holds the current model with gravity applied (a pushover can start)."""
+        return self.domain.status == DomainState.GRAVITY and self.domain_has_model()
+
+    def build_model(self, incremental=True):
+        """
+        Construye el modelo completo en OpenSees.
+        Si el dominio local ya contiene una versión anterior del modelo solo se envían las diferencias
+        (ver sync_model); 'incremental=False' fuerza la reconstrucción desde cero.
+        """
+        if incremental and self.executor is None and self.sync_model():
+            return
+
         print("[OpenSees] Iniciando construcción del modelo...")
+        if self.executor is None:
+            self.domain.invalidate()
         
-        # Create/Overwrite debug file
-        self.debug_file = open("model_debug.py", "w")
-        self.debug_file.write("# Auto-generated debug script from AP-GUI\n")
-        self.debug_file.write("from openseespy.opensees import *\n\n")
-
-        # 1 Inicialización
-        self.log_command('wipe')
-        self.log_command('model', 'basic', '-ndm', 2, '-ndf', 3)  # 2D, 3 DoF
-        
-        # 2. Definir Geometría (Nodos y Restricciones)
-        self._build_nodes()
-        
-        # 3. Definir Materiales
-        self._build_materials()
-        
-        # 4. Definir Secciones
-        self._build_sections()
-        
-        # 5. Definir Transformaciones Geométricas
-        if self.debug_file: self.debug_file.write("\n# --- Transformations ---\n")
-        self.log_command('geomTransf', 'PDelta', 1)
-        
-        # 6. Definir Elementos
-        self._build_elements()
-        
-        # 7. Definir Patrones de Carga
-        self._build_patterns()
-        
+        # Each model starts a new debug script (if the command log is enabled)
+        self.command_log.begin_script()
+
+        self._syncing = True
+        try:
+            # 1 Inicialización
+            self.log_command('wipe')
+            self.log_command('model', 'basic', '-ndm', 2, '-ndf', 3)  # 2D, 3 DoF
+            
+            # 2. Definir Geometría (Nodos y Restricciones)
+            self._build_nodes()
+            
+            # 3. Definir Materiales
+            self._build_materials()
+            
+            # 4. Definir Secciones
+            self._build_sections()
+            
+            # 5. Definir Transformaciones Geométricas
+            self.log_comment("--- Transformations ---")
+            self.log_command('geomTransf', 'PDelta', 1)
+            
+            # 6. Definir Elementos
+            self._build_elements()
+            
+            # 7. Definir Patrones de Carga
+            self._build_patterns()
+        finally:
+            self._syncing = False
+
+        if self.executor is None:
+            self.domain.mark_built(DomainSnapshot.of(self.manager), self._integrations, self._next_integration_tag)
+        self.command_log.flush()
         print("[OpenSees] Modelo construido exitosamente.")
 
+    def sync_model(self):
+        """
+        Lleva el dominio local al modelo actual enviando solo lo que cambió desde el último envío:
+        borra/crea nodos, elementos y restricciones con 'remove' y rehace el patrón de gravedad.
+        Devuelve False si no se puede (dominio desconocido, materiales o secciones cambiados, error
+        de OpenSees): en ese caso hay que reconstruir desde cero.
+        """
+        domain = self.domain
+        if not domain.is_valid:
+            return False
+        old, new = domain.snapshot, DomainSnapshot.of(self.manager)
+        if new.definitions != old.definitions:
+            return False
+
+        common = old.nodes.keys() & new.nodes.keys()
+        moved = {t for t in common if old.nodes[t][:2] != new.nodes[t][:2]}
+        refixed = {t for t in common if t not in moved and old.nodes[t][2:] != new.nodes[t][2:]}
+        replaced = (old.nodes.keys() - new.nodes.keys()) | moved
+        added_nodes = [t for t in new.nodes if t not in old.nodes or t in moved]
+        # Un elemento se rehace si cambia o si alguno de sus nodos se borra/mueve
+        removed_elements = [t for t, e in old.elements.items()
+                            if new.elements.get(t) != e or e[0] in replaced or e[1] in replaced]
+        removed_set = set(removed_elements)
+        added_elements = [t for t in new.elements if t not in old.elements or t in removed_set]
+
+        topology = bool(replaced or refixed or added_nodes or removed_elements or added_elements)
+        # Tras un análisis el patrón quedó constante (loadConst): siempre se rehace
+        rebuild_pattern = topology or new.loads != old.loads or domain.status != DomainState.BUILT
+        if not rebuild_pattern:
+            print("[OpenSees] El dominio ya contiene el modelo actual.")
+            return True
+
+        print(f"[OpenSees] Sincronización incremental: {len(added_nodes)} nodos y {len(added_elements)} elementos nuevos, "
+              f"{len(replaced)} nodos y {len(removed_elements)} elementos retirados")
+        self._integrations = dict(domain.integrations)
+        self._next_integration_tag = domain.next_integration_tag
+        self._syncing = True
+        try:
+            self.log_comment("--- Incremental sync ---")
+            self.log_command('wipeAnalysis')
+            if domain.status != DomainState.BUILT:
+                # Desplazamientos, fibras y tiempo vuelven al estado inicial
+                self.log_command('reset')
+            self.log_command('remove', 'loadPattern', 1)
+
+            for tag in removed_elements:
+                self.log_command('remove', 'ele', tag)
+            for tag in replaced | refixed:
+                for dof, fixed in enumerate(old.nodes[tag][2:], 1):
+                    if fixed:
+                        self.log_command('remove', 'sp', tag, dof)
+            for tag in replaced:
+                self.log_command('remove', 'node', tag)
+
+            for tag in added_nodes:
+                self._build_node(self.manager.get_node(tag))
+            for tag in refixed:
+                node = self.manager.get_node(tag)
+                if any(f != 0 for f in node.fixity):
+                    self.log_command('fix', node.tag, *node.fixity)
+            for tag in added_elements:
+                self._build_element(self.manager.get_element(tag))
+
+            self._build_load_pattern()
+        except Exception as e:
+            print(f"[OpenSees] Sincronización incremental fallida ({e}): se reconstruye el modelo")
+            return False
+        finally:
+            self._syncing = False
+
+        domain.mark_built(new, self._integrations, self._next_integration_tag)
+        self.command_log.flush()
+        return True
+
     def _build_nodes(self):
         print(f"[DEBUG] --- Construcción de Nodos ---")
-        if self.debug_file: self.debug_file.write("\n# --- Nodes ---\n")
+        self.log_comment("--- Nodes ---")
         
         for node in self.manager.get_all_nodes():
-            self.log_command('node', node.tag, node.x, node.y)
-            
-            # Aplicar restricciones (Fixity)
-            if any(f != 0 for f in node.fixity):
-                self.log_command('fix', node.tag, *node.fixity)
+            self._build_node(node)
+
+    def _build_node(self, node):
+        self.log_command('node', node.tag, node.x, node.y)
+        
+        # Aplicar restricciones (Fixity)
+        if any(f != 0 for f in node.fixity):
+            self.log_command('fix', node.tag, *node.fixity)
 
     def _build_materials(self):
-        if self.debug_file: self.debug_file.write("\n# --- Materials ---\n")
+        self.log_comment("--- Materials ---")
 
         # Material Rígido para futuras Congelaciones (Cruces de San Andrés)
-        if self.debug_file: self.debug_file.write("# Material Elastico Rígido para Congelaciones adaptativas\n")
+        self.log_comment("Material Elastico Rígido para Congelaciones adaptativas")
         self.log_command('uniaxialMaterial', 'Elastic', 99999, 1.0e12)
 
         for mat in self.manager.get_all_materials():
@@ -101,7 +249,7 @@ class ModelBuilder:
                 self.log_command('uniaxialMaterial', 'MinMax', mat.tag, base_tag, '-min', min_val, '-max', max_val)
 
     def _build_sections(self):
-        if self.debug_file: self.debug_file.write("\n# --- Sections ---\n")
+        self.log_comment("--- Sections ---")
         
         for sec in self.manager.get_all_sections():
             if isinstance(sec, FiberSection):
@@ -133,48 +281,56 @@ class ModelBuilder:
                 self.log_command('uniaxialMaterial', 'Elastic', shear_mat_tag, GA)
 
                 # Aggregator
-                if self.debug_file: self.debug_file.write(f"# Section Aggregator {sec.tag} wrapping {fiber_tag_internal}\n")
+                self.log_comment(f"Section Aggregator {sec.tag} wrapping {fiber_tag_internal}")
                 self.log_command('section', 'Aggregator', sec.tag, shear_mat_tag, 'Vy', '-section', fiber_tag_internal)
 
     def _build_elements(self):
-        if self.debug_file: self.debug_file.write("\n# --- Elements ---\n")
-        transf_tag = 1 # Usamos la transformación definida en build_model
-        
-        created_integrations = {}
-        next_integ_id = 1
+        self.log_comment("--- Elements ---")
+        self._integrations = {}
+        self._next_integration_tag = 1
         
         for ele in self.manager.get_all_elements():
             if isinstance(ele, ForceBeamColumn):
-                # Usamos TUPLA para diferenciar (Sección 1 con 5 ptos) vs (Sección 1 con 7 ptos)
-                integ_key = (ele.section_tag, ele.integration_points)
-                
-                if integ_key in created_integrations:
-                    integ_tag = created_integrations[integ_key]
-                else:
-                    integ_tag = next_integ_id
-                    next_integ_id += 1
-                    
-                    # Creamos la integración
-                    # beamIntegration 'Lobatto' tag sectionTag numIntPoints
-                    self.log_command('beamIntegration', 'Lobatto', integ_tag, ele.section_tag, ele.integration_points)
-                    created_integrations[integ_key] = integ_tag
-                
-                # CREAMOS EL ELEMENTO USANDO SOLO EL TAG DE INTEGRACIÓN
-                args = [ele.tag, ele.node_i, ele.node_j, transf_tag, integ_tag]
-                
-                if ele.mass_density > 0:
-                    args.append('-mass')
-                    args.append(ele.mass_density)
-                args.extend(['-iter', 10, 1e-12])
-                
-                self.log_command('element', 'forceBeamColumn', *args)
+                self._build_element(ele)
+
+    def _build_element(self, ele):
+        transf_tag = 1 # Usamos la transformación definida en build_model
+
+        # Usamos TUPLA para diferenciar (Sección 1 con 5 ptos) vs (Sección 1 con 7 ptos)
+        integ_key = (ele.section_tag, ele.integration_points)
+        
+        if integ_key in self._integrations:
+            integ_tag = self._integrations[integ_key]
+        else:
+            integ_tag = self._next_integration_tag
+            self._next_integration_tag += 1
+            
+            # Creamos la integración
+            # beamIntegration 'Lobatto' tag sectionTag numIntPoints
+            self.log_command('beamIntegration', 'Lobatto', integ_tag, ele.section_tag, ele.integration_points)
+            self._integrations[integ_key] = integ_tag
+        
+        # CREAMOS EL ELEMENTO USANDO SOLO EL TAG DE INTEGRACIÓN
+        args = [ele.tag, ele.node_i, ele.node_j, transf_tag, integ_tag]
+        
+        if ele.mass_density > 0:
+            args.append('-mass')
+            args.append(ele.mass_density)
+        args.extend(['-iter', 10, 1e-12])
+        
+        self.log_command('element', 'forceBeamColumn', *args)
 
     def _build_patterns(self):
-        if self.debug_file: self.debug_file.write("\n# --- Patterns ---\n")
+        self.log_comment("--- Patterns ---")
         
         ts_tag = 1
-        pattern_tag = 1
         self.log_command('timeSeries', 'Linear', ts_tag)
+        self._build_load_pattern()
+
+    def _build_load_pattern(self):
+        """Patrón de gravedad (tag 1, serie 1) con todas las cargas del modelo."""
+        ts_tag = 1
+        pattern_tag = 1
         self.log_command('pattern', 'Plain', pattern_tag, ts_tag)
         
         for load in self.manager.get_all_loads():
@@ -0,0 +1,25 @@
+class ModelChange:
+    """
+    Resumen tipado de lo que cambió en el modelo desde el último aviso (ProjectManager.modelChanged).
+    - nodes / elements / loads: tags dados de alta, modificados o eliminados
+    - results: los resultados de análisis dejaron de ser válidos
+    - full: cambio global o desconocido (proyecto nuevo/cargado): hay que redibujar todo
+    Los tags de entidades eliminadas se incluyen; quien lo recibe comprueba si aún existen.
+    """
+    __slots__ = ['nodes', 'elements', 'loads', 'results', 'full']
+
+    def __init__(self, nodes=(), elements=(), loads=(), results=False, full=False):
+        self.nodes = set(nodes)
+        self.elements = set(elements)
+        self.loads = set(loads)
+        self.results = results
+        self.full = full
+
+    def __bool__(self):
+        return bool(self.full or self.results or self.nodes or self.elements or self.loads)
+
+    def __repr__(self):
+        if self.full:
+            return "ModelChange(full=True)"
+        return (f"ModelChange(nodes={sorted(self.nodes)}, elements={sorted(self.elements)}, "
+                f"loads={sorted(self.loads)}, results={self.results})")
@@ -0,0 +1,179 @@
+import numpy as np
+
+
+class ColumnTable:
+    """
+    Almacén struct-of-arrays: una columna NumPy contigua por atributo y una fila por entidad.
+    Las entidades (Node, Element...) se "adjuntan" y pasan a ser vistas de su fila;
+    al retirarlas recuperan sus valores en campos propios, de modo que siguen siendo válidas.
+    Las bajas mueven la última fila al hueco: las filas activas son siempre [0, size).
+    """
+    COLUMNS = {}    # nombre -> (dtype, ancho o None para columnas 1-D)
+
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.rows = {}          # tag -> fila
+        self.views = []         # fila -> objeto vista
+        self.version = 0        # Aumenta con cada escritura (para memoizar cálculos derivados)
+        self._capacity = max(1, capacity)
+        for name, (dtype, width) in self.COLUMNS.items():
+            shape = (self._capacity,) if width is None else (self._capacity, width)
+            setattr(self, name, np.zeros(shape, dtype=dtype))
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, tag):
+        return tag in self.rows
+
+    def _reserve(self, extra=1):
+        needed = self.size + extra
+        if needed <= self._capacity:
+            return
+        while self._capacity < needed:
+            self._capacity *= 2
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((self._capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def attach(self, view):
+        """Añade la entidad al almacén y la convierte en vista de su fila."""
+        self._reserve()
+        row = self.size
+        view._write_row(self, row)
+        view._table, view._row = self, row
+        self.rows[view.tag] = row
+        self.views.append(view)
+        self.size += 1
+        self.version += 1
+        return row
+
+    def attach_many(self, views, **columns):
+        """
+        Alta masiva: las columnas llegan ya como arrays (una fila por vista, en el mismo orden)
+        y se copian de una vez. Las columnas no indicadas se toman de cada vista.
+        """
+        n = len(views)
+        if not n:
+            return
+        self._reserve(n)
+        start, stop = self.size, self.size + n
+        if columns.keys() != self.COLUMNS.keys():
+            for row, view in enumerate(views, start):
+                view._write_row(self, row)
+        for name, values in columns.items():
+            getattr(self, name)[start:stop] = values
+        for row, view in enumerate(views, start):
+            view._table, view._row = self, row
+            self.rows[view.tag] = row
+        self.views.extend(views)
+        self.size = stop
+        self.version += 1
+
+    def detach(self, tag):
+        """Retira una entidad: recupera sus valores y deja de ser una vista."""
+        row = self.rows.pop(tag)
+        view = self.views[row]
+        view._read_row(self, row)
+        view._table, view._row = None, -1
+
+        last = self.size - 1
+        if row != last:
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+            moved = self.views[last]
+            moved._row = row
+            self.views[row] = moved
+            self.rows[moved.tag] = row
+        self.views.pop()
+        self.size -= 1
+        self.version += 1
+        return view
+
+    def clear(self):
+        for tag in list(self.rows):
+            self.detach(tag)
+
+    def active(self, name):
+        """Vista de solo lectura de una columna (filas activas)."""
+        column = getattr(self, name)[:self.size]
+        column.flags.writeable = False
+        return column
+
+    def rows_of(self, tags):
+        """Filas de un array de tags (-1 para los que no están en el almacén), vectorizado."""
+        tags = np.asarray(tags, dtype=np.int64)
+        if self.size == 0:
+            return np.full(tags.shape, -1, dtype=np.int64)
+        own = self.tag[:self.size]
+        order = np.argsort(own, kind="stable")
+        sorted_tags = own[order]
+        pos = np.clip(np.searchsorted(sorted_tags, tags), 0, self.size - 1)
+        return np.where(sorted_tags[pos] == tags, order[pos], -1)
+
+
+class NodeTable(ColumnTable):
+    COLUMNS = {
+        "tag": (np.int64, None),
+        "xy": (np.float64, 2),
+        "fixity": (np.int8, 3),
+    }
+
+
+class ElementTable(ColumnTable):
+    COLUMNS = {
+        "tag": (np.int64, None),
+        "nodes": (np.int64, 2),             # [node_i, node_j]
+        "section_tag": (np.int64, None),    # -1 = sin sección
+        "transf_tag": (np.int64, None),
+        "integration_points": (np.int64, None),
+        "mass_density": (np.float64, None),
+    }
+
+
+def decode_int(value):
+    return int(value)
+
+
+def decode_float(value):
+    return float(value)
+
+
+def decode_optional_tag(value):
+    return None if value < 0 else int(value)
+
+
+def encode_optional_tag(value):
+    return -1 if value is None else value
+
+
+def column_field(private, column, index=None, decode=decode_float, encode=None):
+    """
+    Propiedad de una vista: lee/escribe la fila del almacén si está adjunta,
+    o el campo propio 'private' si no lo está.
+    """
+    def fget(self):
+        table = self._table
+        if table is None:
+            return getattr(self, private)
+        array = getattr(table, column)
+        value = array[self._row] if index is None else array[self._row, index]
+        return decode(value)
+
+    def fset(self, value):
+        table = self._table
+        if table is None:
+            setattr(self, private, value)
+            return
+        if encode is not None:
+            value = encode(value)
+        if index is None:
+            getattr(table, column)[self._row] = value
+        else:
+            getattr(table, column)[self._row, index] = value
+        table.version += 1
+
+    return property(fget, fset)
@@ -1,10 +1,47 @@
+from src.analysis.model_store import column_field
+
+
 class Node:
-    __slots__ = ['tag', 'x', 'y', 'fixity']
+    """
+    Nodo del modelo. Una vez añadido al ProjectManager es una vista de su fila en el
+    almacén de arrays (NodeTable); fuera de él guarda sus valores en campos propios.
+    """
+    __slots__ = ['tag', '_table', '_row', '_x', '_y', '_fixity']
     def __init__(self, tag, x, y, fixity=None):
         self.tag = tag
-        self.x = x
-        self.y = y
-        self.fixity = fixity if fixity is not None else [0,0,0]
+        self._table = None
+        self._row = -1
+        self._x = x
+        self._y = y
+        self._fixity = fixity if fixity is not None else [0,0,0]
+
+    x = column_field('_x', 'xy', 0)
+    y = column_field('_y', 'xy', 1)
+
+    @property
+    def fixity(self):
+        # Siempre una lista nueva: las comparaciones tipo fix == [1,1,1] siguen funcionando
+        if self._table is None:
+            return self._fixity
+        return self._table.fixity[self._row].tolist()
+
+    @fixity.setter
+    def fixity(self, value):
+        if self._table is None:
+            self._fixity = value
+        else:
+            self._table.fixity[self._row] = value
+            self._table.version += 1
+
+    def _write_row(self, table, row):
+        table.tag[row] = self.tag
+        table.xy[row] = (self._x, self._y)
+        table.fixity[row] = self._fixity
+
+    def _read_row(self, table, row):
+        self._x = float(table.xy[row, 0])
+        self._y = float(table.xy[row, 1])
+        self._fixity = table.fixity[row].tolist()
     
     def get_opensees_command(self):
         # Sintaxis OpenSees: node $tag $x $y
@@ -2,42 +2,235 @@ from src.analysis.model_builder import ModelBuilder
 from src.analysis.solvers.gravity_solver import GravitySolver
 from src.analysis.solvers.pushover_solver import PushoverSolver
 import openseespy.opensees as ops
+import os
 
 class OpenSeesTranslator:
     """
     Facade class that orchestrates the Model Building and Analysis execution.
     Delegates complex logic to specialized solvers.
     Keeps the same public API as before to avoid breaking UI.
+
+    When a worker (OpenSeesWorker) is given, the model command stream is replayed
+    in that process and every analysis runs there instead of the GUI process.
     """
-    def __init__(self):
+    # Worker used by translators created without an explicit one (None = local domain)
+    default_worker = None
+    # Seconds a remote request may go without any reply or progress message before the worker
+    # process is considered hung and terminated (None = wait forever)
+    default_request_timeout = None
+
+    @classmethod
+    def use_remote_worker(cls, enabled):
+        """Enables/disables the shared out-of-process OpenSees worker for new translators."""
+        from src.analysis.opensees_worker import OpenSeesWorker
+        cls.default_worker = OpenSeesWorker.shared() if enabled else None
+
+    @classmethod
+    def use_command_log(cls, mode, **options):
+        """
+        Selects the OpenSees command log for new translators:
+        "off", "memory" (ring buffer of the last commands) or "file" (buffered model_debug.py).
+        """
+        from src.analysis.command_log import CommandLog, MemoryCommandLog, FileCommandLog
+        logs = {"off": CommandLog, "memory": MemoryCommandLog, "file": FileCommandLog}
+        if mode not in logs:
+            raise ValueError(f"Registro de comandos no soportado: {mode}")
+        ModelBuilder.use_command_log(logs[mode](**options))
+
+    def __init__(self, worker=None):
         self.builder = ModelBuilder()
         self.gravity_solver = GravitySolver(self.builder)
         self.pushover_solver = PushoverSolver(self.builder)
+        self.worker = worker if worker is not None else OpenSeesTranslator.default_worker
+        self.request_timeout = OpenSeesTranslator.default_request_timeout
+        self._remote_gravity_results = None
+
+    @property
+    def is_remote(self):
+        return self.worker is not None
+
+    def set_request_timeout(self, seconds):
+        """Timeout for remote gravity/modal/pushover requests (None disables it). No effect on the local domain."""
+        self.request_timeout = seconds if seconds is None else float(seconds)
+
+    def terminate_worker(self):
+        """Kills the remote OpenSees process (e.g. hung inside analyze); the running request fails in its thread."""
+        if self.is_remote:
+            self.worker.terminate()
 
     def build_model(self):
         """Delegates model construction to ModelBuilder."""
-        return self.builder.build_model()
-        
+        if not self.is_remote:
+            return self.builder.build_model()
+
+        # Remote: the worker receives the model data and replays the command stream in one batch
+        self.worker.sync_project(self.builder.manager.project_to_dict())
+        self.builder.executor = self.worker.submit
+        try:
+            return self.builder.build_model()
+        finally:
+            self.builder.executor = None
+            self.worker.flush()
+
+    def prepare_domain(self):
+        """
+        Makes sure the domain holds the current model with gravity applied (the starting point of a pushover).
+        Reuses the live local domain when it is already there; otherwise syncs/builds and runs gravity.
+        """
+        if not self.is_remote and self.builder.domain_has_gravity():
+            return True
+        self.build_model()
+        return self.run_gravity_analysis()
+
     def run_gravity_analysis(self):
         """Delegates gravity analysis to GravitySolver."""
-        return self.gravity_solver.run()
-        
+        if not self.is_remote:
+            return self.gravity_solver.run()
+
+        reply = self.worker.run_gravity(timeout=self.request_timeout)
+        self._remote_gravity_results = reply["results"]
+        return reply["ok"]
+
     def get_analysis_results(self):
         """Delegates result extraction to GravitySolver."""
+        if self.is_remote:
+            return self._remote_gravity_results
         return self.gravity_solver.get_results()
-        
+
+    def set_capture_mode(self, mode):
+        """Selects how pushover state is captured: "direct" (per-step queries) or "recorder" (binary recorders)."""
+        if mode not in ("direct", "recorder"):
+            raise ValueError(f"Modo de captura no soportado: {mode}")
+        self.pushover_solver.capture_mode = mode
+
+    def set_adaptive_stepping(self, incr_min=None, incr_max=None, **options):
+        """Enables adaptive displacement increments within [incr_min, incr_max]; no bounds disables it."""
+        if incr_min is None or incr_max is None:
+            self.pushover_solver.configurator.disable_adaptive_stepping()
+        else:
+            self.pushover_solver.configurator.enable_adaptive_stepping(incr_min, incr_max, **options)
+
+    def set_algorithm_memory(self, window):
+        """Number of steps a rescuing fallback algorithm stays first in the chain (0 = always restart)."""
+        self.pushover_solver.configurator.memory_window = max(0, int(window))
+
+    def pushover_settings(self):
+        """Solver settings that change pushover results (part of the analysis cache key)."""
+        configurator = self.pushover_solver.configurator
+        return {"step_control": configurator.step_control, "memory_window": configurator.memory_window,
+                "base_tol": configurator.base_tol, "base_iter": configurator.base_iter}
+
+    def enable_checkpoints(self, directory=None, every_n_steps=None):
+        """Saves pushover checkpoints at failed-round boundaries and, optionally, every N steps."""
+        return self.pushover_solver.enable_checkpoints(directory, every_n_steps)
+
+    def disable_checkpoints(self):
+        self.pushover_solver.disable_checkpoints()
+
+    def set_results_streaming(self, enabled, directory=None, chunk_size=2000, tail_steps=2000):
+        """Streams pushover histories to chunked files on disk, keeping only the last tail_steps in memory."""
+        if enabled:
+            return self.pushover_solver.enable_results_streaming(directory, chunk_size, tail_steps)
+        self.pushover_solver.disable_results_streaming()
+
+    def resume_pushover(self, checkpoint_path, **overrides):
+        """
+        Continues a pushover from a saved checkpoint. The domain is rebuilt and every journaled step is
+        solved again, so resuming costs as much compute as the original run up to the checkpoint.
+        Overrides such as freeze_method branch the remaining analysis.
+        """
+        if not self.is_remote:
+            return self.pushover_solver.resume_from_checkpoint(checkpoint_path, **overrides)
+
+        # The checkpoint model must already be the open project (the GUI loads it on its own thread);
+        # the worker receives that project and checks it again before replaying the journal
+        from src.analysis.solvers.checkpoint import PushoverCheckpoint
+        manager = self.builder.manager
+        if not PushoverCheckpoint.load(checkpoint_path).matches_project(manager):
+            raise RuntimeError("El modelo abierto no coincide con el del checkpoint: cárguelo antes de reanudar.")
+        self.worker.sync_project(manager.project_to_dict())
+        results, loads = self.worker.resume_pushover(checkpoint_path, overrides=overrides, **self._remote_settings())
+        self._store_pushover_loads(loads)
+        return results
+
+    def request_cancel(self):
+        """Asks the running pushover (local or remote) to stop between steps."""
+        self.pushover_solver.request_cancel()
+        if self.is_remote:
+            self.worker.cancel()
+
     def run_pushover_analysis(self, control_node_tag, max_disp, n_steps, load_pattern_type):
         """Delegates pushover analysis to PushoverSolver."""
+        if self.is_remote:
+            return self._run_remote_pushover(False, control_node_tag=control_node_tag, max_disp=max_disp,
+                                             n_steps=n_steps, load_pattern_type=load_pattern_type)
         return self.pushover_solver.run_pushover(control_node_tag, max_disp, n_steps, load_pattern_type)
-        
+
     def run_modal_analysis(self, n_modes):
-        """Delegates modal analysis to PushoverSolver (where it was moved)."""
+        """
+        Delegates modal analysis to PushoverSolver (where it was moved).
+        The domain is prepared first: results may come from the analysis cache without ever building it.
+        """
+        if not self.prepare_domain():
+            return None
+        if self.is_remote:
+            return self.worker.run_modal(n_modes, timeout=self.request_timeout)
         return self.pushover_solver.run_modal_analysis(n_modes)
-        
+
+    def enable_reaction_log(self, path=None):
+        """Activa el CSV de diagnóstico de reacciones del Pushover (desactivado por defecto)."""
+        return self.pushover_solver.enable_reaction_log(path)
+
+    def disable_reaction_log(self):
+        self.pushover_solver.disable_reaction_log()
+
     def dump_model_to_file(self, filename="model_dump.out"):
-        """Direct OpenSees dump."""
-        ops.printModel('-file', filename)
+        """Direct OpenSees dump (the model is synced first if the domain does not hold it)."""
+        if self.is_remote or not self.builder.domain_has_model():
+            self.build_model()
+        if self.is_remote:
+            self.worker.call('printModel', '-file', filename)
+        else:
+            ops.printModel('-file', filename)
         print(f"[OpenSees] Modelo volcado en: {filename}")
 
     def run_adaptive_pushover(self, control_node_tag, max_disp, steps, load_pattern_type, sensitivity=None, max_drift=None,  freeze_method="spring"):
+        if self.is_remote:
+            return self._run_remote_pushover(True, control_node_tag=control_node_tag, max_disp=max_disp, steps=steps,
+                                             load_pattern_type=load_pattern_type, sensitivity=sensitivity,
+                                             freeze_method=freeze_method, max_drift=max_drift)
         return self.pushover_solver.run_adaptative_pushover(control_node_tag, max_disp, steps, load_pattern_type, sensitivity, freeze_method, max_drift=max_drift)
+
+    def _remote_settings(self):
+        """Local solver settings mirrored in the worker (capture mode, stepping, progress, checkpoints) and the request timeout."""
+        solver = self.pushover_solver
+        settings = dict(
+            progress_callback=solver.progress_callback,
+            capture_mode=solver.capture_mode,
+            step_control=solver.configurator.step_control,
+            memory_window=solver.configurator.memory_window,
+            progress_every=solver.progress_every,
+            timeout=self.request_timeout,
+        )
+        if solver.checkpoints is not None:
+            settings["checkpoints"] = {"directory": os.path.abspath(solver.checkpoints.directory),
+                                       "every_n_steps": solver.checkpoints.every_n_steps}
+        stream = solver.results_stream
+        if stream is not None:
+            settings["results_stream"] = {"directory": os.path.abspath(stream.directory),
+                                          "chunk_size": stream.chunk_size, "tail_steps": stream.tail_size}
+        return settings
+
+    def _store_pushover_loads(self, loads):
+        # The pushover load distribution is drawn by the GUI from the manager
+        from src.analysis.loads import NodalLoad
+
+        manager = self.builder.manager
+        manager.pushover_loads.clear()
+        manager.pushover_loads.extend(NodalLoad.from_dict(d) for d in loads)
+
+    def _run_remote_pushover(self, adaptive, **params):
+        """Runs the pushover in the worker, mirroring the local solver settings."""
+        results, loads = self.worker.run_pushover(adaptive=adaptive, **self._remote_settings(), **params)
+        self._store_pushover_loads(loads)
+        return results
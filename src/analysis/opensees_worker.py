@@ -0,0 +1,357 @@
+import threading
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# =====================================================================
+# Transporte de arrays por memoria compartida
+# =====================================================================
+
+def export_array(arr, pending: list):
+    """Copia un array a un bloque de memoria compartida y devuelve su descriptor (nombre, forma, dtype)."""
+    arr = np.ascontiguousarray(arr)
+    if arr.nbytes == 0:
+        return (None, arr.shape, arr.dtype.str)
+
+    shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    pending.append(shm)
+    return (shm.name, arr.shape, arr.dtype.str)
+
+
+def import_array(descriptor) -> np.ndarray:
+    """Lee (copiando una sola vez) un array publicado con export_array."""
+    name, shape, dtype = descriptor
+    if name is None:
+        return np.empty(shape, dtype=dtype)
+
+    # El bloque lo libera siempre el proceso que lo creó (al recibir "release")
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return np.array(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    finally:
+        shm.close()
+
+
+def release_arrays(pending: list):
+    for shm in pending:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+    pending.clear()
+
+
+def pack_pushover_results(results: dict, pending: list) -> dict:
+    """Convierte un diccionario de resultados del Pushover en descriptores de memoria compartida."""
+    payload = {"arrays": {}, "floors": {}, "extra": {}}
+
+    for key in ("roof_disp", "base_shear"):
+        payload["arrays"][key] = export_array(np.asarray(results.get(key, []), dtype=np.float64), pending)
+    for key in ("steps", "cycle_id"):
+        if key in results:
+            payload["arrays"][key] = export_array(np.asarray(results[key], dtype=np.int64), pending)
+
+    store = results.get("node_displacements")
+    if store is not None:
+        payload["node_tags"] = list(store.tags)
+        payload["arrays"]["node_displacements"] = export_array(store.array, pending)
+
+    for y, data in results.get("floors", {}).items():
+        payload["floors"][y] = {
+            "disp": export_array(np.asarray(data["disp"], dtype=np.float64), pending),
+            "shear": export_array(np.asarray(data["shear"], dtype=np.float64), pending),
+            "H": data.get("H", 0.0)
+        }
+
+    # El resto son datos pequeños (listas de pisos fallados, banderas...) y viajan por la tubería
+    handled = {"roof_disp", "base_shear", "steps", "cycle_id", "node_displacements", "floors"}
+    payload["extra"] = {k: v for k, v in results.items() if k not in handled}
+    return payload
+
+
+def unpack_pushover_results(payload: dict) -> dict:
+    """Reconstruye el diccionario de resultados (listas + NodeHistoryStore) en el proceso de la UI."""
+    from src.analysis.solvers.results_store import NodeHistoryStore
+
+    results = dict(payload["extra"])
+    for key, descriptor in payload["arrays"].items():
+        if key == "node_displacements":
+            continue
+        results[key] = import_array(descriptor).tolist()
+
+    if "node_tags" in payload:
+        history = import_array(payload["arrays"]["node_displacements"])
+        store = NodeHistoryStore(payload["node_tags"], capacity=max(len(history), 1))
+        store.extend_array(history)
+        results["node_displacements"] = store
+
+    results["floors"] = {
+        y: {"disp": import_array(d["disp"]).tolist(), "shear": import_array(d["shear"]).tolist(), "H": d["H"]}
+        for y, d in payload["floors"].items()
+    }
+    return results
+
+
+# =====================================================================
+# Proceso de trabajo (lado OpenSees)
+# =====================================================================
+
+def _worker_main(conn):
+    """Bucle del proceso hijo: mantiene su propio dominio OpenSees y atiende peticiones en orden."""
+    import openseespy.opensees as ops
+    from src.analysis.manager import ProjectManager
+    from src.analysis.model_builder import ModelBuilder
+    from src.analysis.solvers.gravity_solver import GravitySolver
+    from src.analysis.solvers.pushover_solver import PushoverSolver
+
+    manager = ProjectManager.instance()
+    builder = ModelBuilder()
+    pending = []
+
+    def run_pushover_job(kind, params):
+        # Un solver nuevo por trabajo, igual que la UI crea un traductor por análisis
+        solver = PushoverSolver(builder)
+        solver.capture_mode = params.pop("capture_mode", "direct")
+        solver.progress_every = params.pop("progress_every", solver.progress_every)
+        send_progress = params.pop("send_progress", False)
+        solver.configurator.memory_window = params.pop("memory_window", solver.configurator.memory_window)
+        step_control = params.pop("step_control", None)
+        if step_control:
+            solver.configurator.enable_adaptive_stepping(**step_control)
+        checkpoints = params.pop("checkpoints", None)
+        if checkpoints:
+            solver.enable_checkpoints(**checkpoints)
+        results_stream = params.pop("results_stream", None)
+        if results_stream:
+            solver.enable_results_streaming(**results_stream)
+
+        def on_progress(partial, info):
+            if send_progress:
+                conn.send(("progress", partial, info))
+            # Cancelación cooperativa: se revisa la tubería solo en los puntos de progreso
+            while conn.poll():
+                if conn.recv()[0] == "cancel":
+                    solver.request_cancel()
+
+        solver.progress_callback = on_progress
+        manager.pushover_loads.clear()
+
+        if kind == "adaptive":
+            results = solver.run_adaptative_pushover(**params)
+        elif kind == "resume":
+            results = solver.resume_from_checkpoint(params["checkpoint_path"], **params["overrides"])
+        else:
+            results = solver.run_pushover(**params)
+
+        release_arrays(pending)
+        loads = [load.to_dict() for load in manager.pushover_loads]
+        if results and "stream_dir" in results:
+            # Resultados por bloques: ya están en disco, solo viaja la carpeta
+            return {"results": None, "stream_dir": results["stream_dir"], "pushover_loads": loads}
+        payload = pack_pushover_results(results, pending) if results else None
+        return {"results": payload, "pushover_loads": loads}
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+
+        kind = message[0]
+        if kind == "shutdown":
+            break
+        if kind == "release":
+            release_arrays(pending)
+            continue
+        if kind == "cancel":
+            # Llegó tarde (el trabajo ya terminó): no hay nada que cancelar
+            continue
+
+        try:
+            if kind == "project":
+                manager.load_project_data(message[1])
+                reply = None
+            elif kind == "replay":
+                # Comandos directos: el dominio de este proceso deja de corresponder a lo que sabe el builder
+                builder.mark_domain_modified()
+                reply = None
+                for command, args in message[1]:
+                    reply = getattr(ops, command)(*args)
+            elif kind == "gravity":
+                gravity = GravitySolver(builder)
+                ok = gravity.run()
+                reply = {"ok": ok, "results": gravity.get_results() if ok else None}
+            elif kind in ("pushover", "adaptive", "resume"):
+                reply = run_pushover_job(kind, dict(message[1]))
+            elif kind == "modal":
+                reply = PushoverSolver(builder).run_modal_analysis(*message[1])
+            else:
+                raise ValueError(f"Petición desconocida: {kind}")
+            conn.send(("ok", reply))
+        except Exception:
+            conn.send(("error", traceback.format_exc()))
+
+    release_arrays(pending)
+    conn.close()
+
+
+# =====================================================================
+# Cliente (lado UI)
+# =====================================================================
+
+class OpenSeesWorker:
+    """
+    Proceso OpenSees persistente fuera del proceso de la interfaz.
+    Los comandos de ModelBuilder.log_command se acumulan y se reproducen en bloque en el hijo;
+    los resultados masivos vuelven por memoria compartida en lugar de diccionarios serializados.
+    Cada instancia es un dominio independiente, de modo que varias pueden analizar escenarios a la vez.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """Proceso común de la aplicación (se arranca bajo demanda)."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self._ctx = mp.get_context("spawn")   # Nunca fork: el proceso padre tiene Qt cargado
+        self._process = None
+        self._conn = None
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    # --- Ciclo de vida ---
+    def start(self):
+        if self.is_alive():
+            return
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        self._process = self._ctx.Process(target=_worker_main, args=(child_conn,), name="OpenSeesWorker", daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._buffer = []
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def shutdown(self, timeout=5.0):
+        if self._process is None:
+            return
+        try:
+            self._conn.send(("shutdown",))
+        except (OSError, BrokenPipeError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+        self._conn = None
+
+    def terminate(self):
+        """
+        Mata el proceso hijo sin esperar (OpenSees colgado dentro de un paso).
+        La petición en curso termina con error en su hilo; el dominio remoto se pierde y el proceso
+        se vuelve a arrancar con la siguiente petición.
+        """
+        process, self._process = self._process, None
+        if process is not None and process.is_alive():
+            process.terminate()
+
+    # --- Flujo de comandos ---
+    def submit(self, command, *args):
+        """Ejecutor para ModelBuilder: acumula el comando para reproducirlo en bloque con flush()."""
+        self._buffer.append((command, args))
+
+    def flush(self):
+        """Envía los comandos acumulados al dominio remoto; devuelve el resultado del último."""
+        commands, self._buffer = self._buffer, []
+        if not commands:
+            return None
+        return self._request("replay", commands)
+
+    def replay(self, commands):
+        """Reproduce un flujo de comandos ya grabado [(comando, args), ...] en el dominio remoto."""
+        self._buffer.extend(commands)
+        return self.flush()
+
+    def call(self, command, *args):
+        """Ejecuta un comando suelto en el dominio remoto (respetando el orden del flujo)."""
+        self.submit(command, *args)
+        return self.flush()
+
+    def sync_project(self, project_data: dict):
+        """Envía el modelo (esquema de ProjectManager.project_to_dict) al proceso hijo."""
+        self._request("project", project_data)
+
+    # --- Trabajos ---
+    def run_gravity(self, timeout=None):
+        return self._request("gravity", None, timeout=timeout)
+
+    def run_modal(self, n_modes, timeout=None):
+        return self._request("modal", (n_modes,), timeout=timeout)
+
+    def run_pushover(self, adaptive=False, progress_callback=None, timeout=None, **params):
+        """
+        Ejecuta un Pushover remoto y reconstruye los resultados desde memoria compartida.
+        Devuelve (results, pushover_loads_dicts).
+        """
+        return self._run_pushover_job("adaptive" if adaptive else "pushover", params, progress_callback, timeout)
+
+    def resume_pushover(self, checkpoint_path, overrides=None, progress_callback=None, timeout=None, **params):
+        """Continúa en el proceso hijo un Pushover guardado en un checkpoint. Devuelve (results, pushover_loads_dicts)."""
+        params.update(checkpoint_path=checkpoint_path, overrides=overrides or {})
+        return self._run_pushover_job("resume", params, progress_callback, timeout)
+
+    def _run_pushover_job(self, kind, params, progress_callback, timeout):
+        params["send_progress"] = progress_callback is not None
+        reply = self._request(kind, params, progress_callback=progress_callback, timeout=timeout)
+        if reply.get("stream_dir"):
+            from src.analysis.solvers.results_stream import open_streamed_results
+            return open_streamed_results(reply["stream_dir"]), reply["pushover_loads"]
+        try:
+            results = unpack_pushover_results(reply["results"]) if reply["results"] else None
+        finally:
+            self._send(("release",))
+        return results, reply["pushover_loads"]
+
+    def cancel(self):
+        """Pide al proceso hijo que detenga el Pushover en el siguiente punto de progreso."""
+        if self.is_alive():
+            self._send(("cancel",))
+
+    # --- Transporte ---
+    def _send(self, message):
+        with self._lock:
+            self._conn.send(message)
+
+    def _request(self, kind, payload, progress_callback=None, timeout=None):
+        self.start()
+        if kind != "replay" and self._buffer:
+            self.flush()
+
+        self._send((kind, payload))
+        while True:
+            if timeout is not None and not self._conn.poll(timeout):
+                # Proceso colgado: se sacrifica el dominio remoto para no bloquear la aplicación
+                self.terminate()
+                raise TimeoutError(f"OpenSees no respondió en {timeout} s ('{kind}'). Proceso reiniciado.")
+            try:
+                reply = self._conn.recv()
+            except (EOFError, OSError):
+                self._process = None
+                raise RuntimeError("El proceso de OpenSees terminó inesperadamente. El dominio remoto se ha perdido.")
+
+            status = reply[0]
+            if status == "progress":
+                if progress_callback is not None:
+                    progress_callback(reply[1], reply[2])
+                continue
+            if status == "error":
+                raise RuntimeError(f"Error en el proceso de OpenSees:\n{reply[1]}")
+            return reply[1]
@@ -0,0 +1,216 @@
+import os
+import json
+import numpy as np
+
+from src.analysis.loads import NodalLoad, ElementLoad
+from src.analysis.element import ForceBeamColumn
+from src.analysis.fingerprint import model_fingerprint
+from src.analysis.solvers.checkpoint import json_default, results_to_arrays, results_from_arrays
+
+# Proyecto binario: un .npz con una tabla por tipo de entidad (columnas NumPy) y una cabecera JSON
+# pequeña para lo que no es tabular (materiales y secciones con sus fibras).
+# El JSON sigue siendo el formato de intercambio; este es el de trabajo para modelos grandes.
+BINARY_EXTENSION = ".npz"
+FORMAT_NAME = "opensees-gui-project"
+FORMAT_VERSION = 1
+RESULTS_FORMAT_NAME = "opensees-gui-results"
+
+# Claves de los resultados del Pushover que solo tienen sentido en la sesión que los generó
+TRANSIENT_RESULT_KEYS = ("stream_dir", "branch_checkpoint")
+
+
+def is_binary_project(filename: str) -> bool:
+    return filename.lower().endswith(BINARY_EXTENSION)
+
+
+def pack_header(header: dict) -> np.ndarray:
+    return np.frombuffer(json.dumps(header, default=json_default).encode("utf-8"), dtype=np.uint8)
+
+
+def unpack_header(array: np.ndarray) -> dict:
+    return json.loads(array.tobytes().decode("utf-8"))
+
+
+def results_path(filename: str) -> str:
+    """Fichero de resultados que acompaña a un proyecto JSON ('modelo.json' -> 'modelo.results.npz')."""
+    return os.path.splitext(filename)[0] + ".results" + BINARY_EXTENSION
+
+
+def gravity_to_arrays(results: dict, prefix: str, arrays: dict) -> dict:
+    """Resultados de gravedad -> arrays: desplazamientos/reacciones por nodo y fuerzas por punto de integración."""
+    meta = {"keys": []}
+    for key in ("displacements", "reactions"):
+        values = results.get(key)
+        if values is None:
+            continue
+        arrays[f"{prefix}{key}_tag"] = np.array(list(values), dtype=np.int64)
+        arrays[f"{prefix}{key}"] = np.array(list(values.values()), dtype=np.float64).reshape(len(values), -1)
+        meta["keys"].append(key)
+
+    # Fuerzas: tabla plana (una fila por punto de integración) + nº de puntos de cada elemento
+    forces = results.get("element_forces", {})
+    arrays[f"{prefix}force_tag"] = np.array(list(forces), dtype=np.int64)
+    arrays[f"{prefix}force_count"] = np.array([len(points) for points in forces.values()], dtype=np.int64)
+    arrays[f"{prefix}force"] = np.array(
+        [(p["i"], p["P"], p["M"], p["V"], p["loc"]) for points in forces.values() for p in points],
+        dtype=np.float64).reshape(-1, 5)
+    return meta
+
+
+def gravity_from_arrays(meta: dict, prefix: str, arrays) -> dict:
+    results = {}
+    for key in meta["keys"]:
+        results[key] = dict(zip(arrays[f"{prefix}{key}_tag"].tolist(), arrays[f"{prefix}{key}"].tolist()))
+
+    results["element_forces"] = {}
+    rows = iter(arrays[f"{prefix}force"].tolist())
+    for tag, count in zip(arrays[f"{prefix}force_tag"].tolist(), arrays[f"{prefix}force_count"].tolist()):
+        results["element_forces"][tag] = [
+            {"i": int(i), "P": P, "M": M, "V": V, "loc": loc}
+            for i, P, M, V, loc in (next(rows) for _ in range(count))
+        ]
+    return results
+
+
+def results_to_project_arrays(manager, arrays: dict) -> dict:
+    """
+    Vuelca los resultados del manager (gravedad y Pushover) en 'arrays' y devuelve sus metadatos,
+    con la huella del modelo al que corresponden.
+    """
+    meta = {"fingerprint": model_fingerprint(manager), "gravity": None, "pushover": None}
+    if manager.gravity_results:
+        meta["gravity"] = gravity_to_arrays(manager.gravity_results, "res_g_", arrays)
+    if manager.pushover_results:
+        pushover = {k: v for k, v in manager.pushover_results.items() if k not in TRANSIENT_RESULT_KEYS}
+        meta["pushover"] = results_to_arrays(pushover, "res_p_", arrays)
+    return meta
+
+
+def restore_results(manager, meta, arrays) -> bool:
+    """
+    Restaura en el manager los resultados guardados si la huella coincide con el modelo cargado.
+    Devuelve True si se restauraron.
+    """
+    if not meta or (meta.get("gravity") is None and meta.get("pushover") is None):
+        return False
+    if meta.get("fingerprint") != model_fingerprint(manager):
+        print("[Proyecto] Los resultados guardados no corresponden al modelo actual: se descartan")
+        return False
+    if meta.get("gravity") is not None:
+        manager.gravity_results = gravity_from_arrays(meta["gravity"], "res_g_", arrays)
+    if meta.get("pushover") is not None:
+        manager.pushover_results = results_from_arrays(meta["pushover"], "res_p_", arrays)
+    return True
+
+
+def read_npz(filename: str) -> dict:
+    with np.load(filename, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def save_results(manager, filename: str):
+    """Guarda solo los resultados (fichero compañero de un proyecto JSON)."""
+    arrays = {}
+    header = {"format": RESULTS_FORMAT_NAME, "version": FORMAT_VERSION,
+              "results": results_to_project_arrays(manager, arrays)}
+    with open(filename, "wb") as f:
+        np.savez_compressed(f, header=pack_header(header), **arrays)
+
+
+def load_results(manager, filename: str) -> bool:
+    """Lee un fichero de resultados y los restaura si corresponden al modelo cargado."""
+    arrays = read_npz(filename)
+    header = unpack_header(arrays.pop("header"))
+    if header.get("format") != RESULTS_FORMAT_NAME:
+        raise ValueError(f"'{filename}' no es un fichero de resultados válido")
+    return restore_results(manager, header.get("results"), arrays)
+
+
+def project_to_arrays(manager) -> dict:
+    """Tablas del modelo, en el mismo orden que project_to_dict() (orden de alta)."""
+    node_store, element_store = manager.node_store, manager.element_store
+
+    node_rows = node_store.rows_of(list(manager.node))
+    elements = [e for e in manager.get_all_elements() if isinstance(e, ForceBeamColumn)]
+    element_rows = element_store.rows_of([e.tag for e in elements])
+
+    # Las dos tablas de cargas guardan su posición en el orden global para restaurarlo al cargar
+    loads = manager.get_all_loads()
+    nodal = [(k, l) for k, l in enumerate(loads) if isinstance(l, NodalLoad)]
+    distributed = [(k, l) for k, l in enumerate(loads) if isinstance(l, ElementLoad)]
+
+    return {
+        "node_tag": node_store.tag[node_rows],
+        "node_xy": node_store.xy[node_rows],
+        "node_fixity": node_store.fixity[node_rows],
+        "element_tag": element_store.tag[element_rows],
+        "element_nodes": element_store.nodes[element_rows],
+        "element_section": element_store.section_tag[element_rows],
+        "element_transf": element_store.transf_tag[element_rows],
+        "element_integration_points": element_store.integration_points[element_rows],
+        "element_mass_density": element_store.mass_density[element_rows],
+        "nodal_load_order": np.array([k for k, _ in nodal], dtype=np.int64),
+        "nodal_load_tag": np.array([l.tag for _, l in nodal], dtype=np.int64),
+        "nodal_load_node": np.array([l.node_tag for _, l in nodal], dtype=np.int64),
+        "nodal_load_values": np.array([(l.fx, l.fy, l.mz) for _, l in nodal], dtype=np.float64).reshape(-1, 3),
+        "element_load_order": np.array([k for k, _ in distributed], dtype=np.int64),
+        "element_load_tag": np.array([l.tag for _, l in distributed], dtype=np.int64),
+        "element_load_element": np.array([l.element_tag for _, l in distributed], dtype=np.int64),
+        "element_load_values": np.array([(l.wx, l.wy) for _, l in distributed], dtype=np.float64).reshape(-1, 2),
+    }
+
+
+def save_binary_project(manager, filename: str, include_results: bool = False,
+                        extra_arrays: dict = None, extra_header: dict = None):
+    """
+    Guarda el proyecto en formato binario (npz comprimido + cabecera JSON).
+    Con 'include_results' se incrustan también los resultados de análisis (ver restore_results).
+    """
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "materials": [m.to_dict() for m in manager.get_all_materials()],
+        "sections": [s.to_dict() for s in manager.get_all_sections()],
+    }
+    arrays = project_to_arrays(manager)
+    if include_results:
+        header["results"] = results_to_project_arrays(manager, arrays)
+    header.update(extra_header or {})
+    arrays.update(extra_arrays or {})
+    # np.savez añade '.npz' si falta: se abre el fichero explícitamente para respetar el nombre
+    with open(filename, "wb") as f:
+        np.savez_compressed(f, header=pack_header(header), **arrays)
+
+
+def load_binary_project(manager, filename: str) -> dict:
+    """
+    Carga un proyecto binario en el manager con altas masivas (sin pasar por from_dict por objeto).
+    Devuelve la cabecera y los arrays leídos, por si el llamador necesita secciones adicionales.
+    """
+    arrays = read_npz(filename)
+    header = unpack_header(arrays.pop("header"))
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"'{filename}' no es un proyecto binario válido")
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Versión de proyecto binario no soportada: {header.get('version')}")
+
+    with manager.batch(topology=True):
+        manager.new_project()
+        manager.load_definitions(header)
+
+        manager.add_nodes_from_arrays(arrays["node_tag"], arrays["node_xy"], arrays["node_fixity"])
+        manager.add_elements_from_arrays(
+            arrays["element_tag"], arrays["element_nodes"], arrays["element_section"],
+            arrays["element_transf"], arrays["element_integration_points"], arrays["element_mass_density"])
+
+        loads = {}
+        for k, tag, node_tag, (fx, fy, mz) in zip(arrays["nodal_load_order"].tolist(), arrays["nodal_load_tag"].tolist(),
+                                                  arrays["nodal_load_node"].tolist(), arrays["nodal_load_values"].tolist()):
+            loads[k] = NodalLoad(tag, node_tag, fx, fy, mz)
+        for k, tag, element_tag, (wx, wy) in zip(arrays["element_load_order"].tolist(), arrays["element_load_tag"].tolist(),
+                                                 arrays["element_load_element"].tolist(), arrays["element_load_values"].tolist()):
+            loads[k] = ElementLoad(tag, element_tag, wx, wy)
+        for k in sorted(loads):
+            manager.add_load(loads[k])
+
+    return {"header": header, "arrays": arrays}
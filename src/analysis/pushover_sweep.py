@@ -0,0 +1,210 @@
+import os
+import time
+import queue
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+
+from src.analysis.manager import ProjectManager
+from src.analysis.model_builder import ModelBuilder
+from src.analysis.opensees_worker import OpenSeesWorker
+
+# Métodos de ModelBuilder.freeze_floor
+FREEZE_METHODS = ("spring", "fix", "load")
+
+
+@dataclass
+class SweepCase:
+    """Una combinación de parámetros del barrido (equivale a una ejecución del PushoverDialog)."""
+    load_pattern_type: str
+    max_disp: float
+    steps: int
+    adaptive: bool = False
+    sensitivity: Optional[float] = None
+    max_drift: Optional[float] = None
+    freeze_method: str = "spring"
+
+    @property
+    def label(self) -> str:
+        text = f"{self.load_pattern_type} | D={self.max_disp:g}"
+        if self.adaptive:
+            if self.sensitivity is not None: text += f" | S={self.sensitivity:g}%"
+            if self.max_drift is not None: text += f" | Drift={self.max_drift:g}%"
+            text += f" | Freeze={self.freeze_method}"
+        return text
+
+    def to_params(self, control_node_tag) -> dict:
+        if self.adaptive:
+            return dict(control_node_tag=control_node_tag, max_disp=self.max_disp, steps=self.steps,
+                        load_pattern_type=self.load_pattern_type, sensitivity=self.sensitivity,
+                        max_drift=self.max_drift, freeze_method=self.freeze_method)
+        return dict(control_node_tag=control_node_tag, max_disp=self.max_disp, n_steps=self.steps,
+                    load_pattern_type=self.load_pattern_type)
+
+
+@dataclass
+class SweepResult:
+    case: SweepCase
+    results: Optional[dict] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.results is not None and self.error is None
+
+    @property
+    def curve(self):
+        """Curva de capacidad global (roof_disp, base_shear)."""
+        if not self.ok:
+            return [], []
+        return self.results["roof_disp"], self.results["base_shear"]
+
+    def summary(self) -> dict:
+        disp, shear = self.curve
+        row = {"label": self.case.label, "steps": len(disp), "v_max": None, "disp_at_v_max": None,
+               "disp_final": None, "failed_floors": [], "elapsed": self.elapsed, "error": self.error}
+        if disp:
+            i_max = max(range(len(shear)), key=lambda i: shear[i])
+            row.update(v_max=shear[i_max], disp_at_v_max=disp[i_max], disp_final=disp[-1],
+                       failed_floors=list(self.results.get("failed_floors", [])))
+        return row
+
+
+def expand_grid(load_patterns, max_disps, steps, adaptive=False, sensitivities=(None,), max_drifts=(None,),
+                freeze_method="spring") -> List[SweepCase]:
+    """Producto cartesiano de los valores de cada parámetro."""
+    if not adaptive:
+        sensitivities, max_drifts = (None,), (None,)
+    return [SweepCase(pattern, disp, steps, adaptive, sens, drift, freeze_method)
+            for pattern, disp, sens, drift in itertools.product(load_patterns, max_disps, sensitivities, max_drifts)]
+
+
+def expand_freeze_branches(cases: List[SweepCase], methods=FREEZE_METHODS) -> List[SweepCase]:
+    """
+    Un caso adaptativo por (caso, método de congelamiento), para comparar métodos en un mismo barrido.
+    Cada rama es un caso independiente: repite el tramo común hasta el primer fallo.
+    """
+    return [replace(case, adaptive=True, freeze_method=method) for case in cases for method in methods]
+
+
+def capacity_curves_table(sweep_results: List[SweepResult]):
+    """
+    Tabla consolidada en formato largo: una fila por (caso, paso).
+    Columnas: case, label, step, roof_disp, base_shear.
+    """
+    rows = []
+    for idx, res in enumerate(sweep_results):
+        disp, shear = res.curve
+        for step, (d, v) in enumerate(zip(disp, shear), start=1):
+            rows.append((idx, res.case.label, step, d, v))
+    return rows
+
+
+def export_capacity_curves_csv(sweep_results: List[SweepResult], filename: str):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("Case,Label,Step,RoofDisp,BaseShear\n")
+        for case_idx, label, step, d, v in capacity_curves_table(sweep_results):
+            f.write(f"{case_idx},\"{label}\",{step},{d},{v}\n")
+
+
+class PushoverSweep:
+    """
+    Barrido de parámetros del Pushover repartido entre N procesos OpenSees independientes.
+    El modelo se serializa una vez (datos del proyecto + flujo de comandos de ModelBuilder)
+    y cada proceso lo reconstruye en su propio dominio antes de cada caso.
+    """
+
+    def __init__(self, control_node_tag: int, n_workers: Optional[int] = None, capture_mode: str = "direct"):
+        self.manager = ProjectManager.instance()
+        self.control_node_tag = control_node_tag
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self.capture_mode = capture_mode
+
+        self._workers: List[OpenSeesWorker] = []
+        self._cancelled = threading.Event()
+
+    def _snapshot_model(self):
+        """Serializa el proyecto y graba (sin ejecutar) el flujo de comandos del modelo."""
+        commands = []
+        builder = ModelBuilder()
+        builder.executor = lambda command, *args: commands.append((command, args))
+        builder.build_model()
+        return self.manager.project_to_dict(), commands
+
+    def _ensure_workers(self, n):
+        while len(self._workers) < n:
+            self._workers.append(OpenSeesWorker())
+
+    def _idle_workers(self, n):
+        self._ensure_workers(n)
+        idle = queue.Queue()
+        for worker in self._workers[:n]:
+            idle.put(worker)
+        return idle
+
+    @staticmethod
+    def _prepare_domain(worker, project_data, commands):
+        # Cada caso parte de un dominio limpio: datos del proyecto + comandos + gravedad
+        worker.sync_project(project_data)
+        worker.replay(commands)
+        gravity = worker.run_gravity()
+        if not gravity["ok"]:
+            raise RuntimeError("El análisis de gravedad falló en OpenSees.")
+
+    def run(self, cases: List[SweepCase], on_case_done: Optional[Callable[[int, SweepResult], None]] = None) -> List[SweepResult]:
+        """
+        Ejecuta todos los casos y devuelve los resultados en el mismo orden.
+        on_case_done(índice, resultado) se llama desde los hilos de despacho al terminar cada caso.
+        """
+        self._cancelled.clear()
+        project_data, commands = self._snapshot_model()
+
+        n = min(self.n_workers, len(cases)) or 1
+        idle = self._idle_workers(n)
+
+        sweep_results: List[SweepResult] = [SweepResult(case) for case in cases]
+
+        def notify(idx):
+            if on_case_done is not None:
+                on_case_done(idx, sweep_results[idx])
+
+        def run_case(idx):
+            result = sweep_results[idx]
+            if self._cancelled.is_set():
+                result.error = "Cancelado"
+                notify(idx)
+                return
+            worker = idle.get()
+            t0 = time.perf_counter()
+            try:
+                self._prepare_domain(worker, project_data, commands)
+                result.results, _ = worker.run_pushover(
+                    adaptive=result.case.adaptive,
+                    capture_mode=self.capture_mode,
+                    **result.case.to_params(self.control_node_tag)
+                )
+            except Exception as e:
+                result.error = str(e)
+            finally:
+                result.elapsed = time.perf_counter() - t0
+                idle.put(worker)
+            notify(idx)
+
+        with ThreadPoolExecutor(max_workers=n, thread_name_prefix="PushoverSweep") as pool:
+            list(pool.map(run_case, range(len(cases))))
+
+        return sweep_results
+
+    def cancel(self):
+        """Descarta los casos pendientes y pide a los procesos en curso que se detengan."""
+        self._cancelled.set()
+        for worker in self._workers:
+            worker.cancel()
+
+    def shutdown(self):
+        for worker in self._workers:
+            worker.shutdown()
+        self._workers = []
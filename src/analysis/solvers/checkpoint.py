@@ -0,0 +1,325 @@
+import io
+import os
+import json
+import time
+import struct
+import numpy as np
+from typing import Dict, List, Optional
+
+from src.analysis.solvers.results_store import NodeHistoryStore
+from src.analysis.solvers.results_stream import ChunkedNodeHistory
+
+CHECKPOINT_VERSION = 2
+SERIES_KEYS = ("roof_disp", "base_shear", "steps", "cycle_id")
+
+# Ficheros de solo-añadir de cada ejecución (compartidos por todos sus checkpoints)
+PROJECT_FILE = "project.json"
+JOURNAL_FILE = "journal.jsonl"
+RESULTS_FILE = "results.bin"
+
+
+def json_default(value):
+    # Los argumentos del diario pueden traer escalares de numpy (cargas calculadas, desplazamientos)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"No serializable: {type(value).__name__}")
+
+
+def _results_meta(results: dict) -> dict:
+    """Lo que no es serie temporal: cotas de planta, claves presentes y extras (JSON)."""
+    meta = {"floors": [[y, data.get("H", 0.0)] for y, data in results.get("floors", {}).items()], "extra": {}}
+    keys = [key for key in SERIES_KEYS if key in results]
+    if keys:
+        meta["keys"] = keys
+    if results.get("telemetry") is not None:
+        meta["telemetry"] = list(results["telemetry"].keys())
+
+    handled = {"roof_disp", "base_shear", "steps", "cycle_id", "node_displacements", "floors", "telemetry"}
+    meta["extra"] = {k: v for k, v in results.items() if k not in handled}
+    return meta
+
+
+def _results_series(results: dict, prefix: str) -> list:
+    """(nombre, serie, dtype) de cada serie que crece paso a paso, con el nombre de su array en el npz."""
+    series = [(f"{prefix}{key}", results[key], None) for key in SERIES_KEYS if key in results]
+    if results.get("node_displacements") is not None:
+        series.append((f"{prefix}node_displacements", results["node_displacements"], None))
+    for k, data in enumerate(results.get("floors", {}).values()):
+        series.append((f"{prefix}floor{k}_disp", data["disp"], np.float64))
+        series.append((f"{prefix}floor{k}_shear", data["shear"], np.float64))
+    for key, values in (results.get("telemetry") or {}).items():
+        series.append((f"{prefix}tel_{key}", values, str if key == "algorithm" else np.float64))
+    return series
+
+
+def _rows_from(series, start: int, dtype=None) -> np.ndarray:
+    """Filas de una serie desde 'start' sin materializar las anteriores (listas, almacenes o series por bloques)."""
+    if isinstance(series, NodeHistoryStore):
+        return series.array[start:]
+    if isinstance(series, ChunkedNodeHistory):
+        parts, pos = [], 0
+        for block in series.iter_blocks():
+            if pos + len(block) > start:
+                parts.append(np.asarray(block[max(start - pos, 0):]))
+            pos += len(block)
+        return np.concatenate(parts) if parts else np.zeros((0, len(series.tags), 3))
+    return np.asarray(series[start:], dtype=dtype)
+
+
+def results_to_arrays(results: dict, prefix: str, arrays: Dict[str, np.ndarray]) -> dict:
+    """Vuelca un diccionario de resultados del Pushover en arrays (npz) + metadatos JSON."""
+    for name, series, dtype in _results_series(results, prefix):
+        arrays[name] = _rows_from(series, 0, dtype)
+    store = results.get("node_displacements")
+    if store is not None:
+        arrays[f"{prefix}node_tags"] = np.asarray(store.tags, dtype=np.int64)
+    return _results_meta(results)
+
+
+def results_from_arrays(meta: dict, prefix: str, arrays) -> dict:
+    results = dict(meta["extra"])
+    for key in meta.get("keys", []):
+        results[key] = arrays[f"{prefix}{key}"].tolist()
+
+    if f"{prefix}node_tags" in arrays:
+        history = arrays[f"{prefix}node_displacements"]
+        store = NodeHistoryStore(arrays[f"{prefix}node_tags"].tolist(), capacity=max(len(history), 256))
+        store.extend_array(history)
+        results["node_displacements"] = store
+
+    results["floors"] = {}
+    for k, (y, H) in enumerate(meta["floors"]):
+        results["floors"][y] = {
+            "disp": arrays[f"{prefix}floor{k}_disp"].tolist(),
+            "shear": arrays[f"{prefix}floor{k}_shear"].tolist(),
+            "H": H
+        }
+
+    if "telemetry" in meta:
+        results["telemetry"] = {}
+        for key in meta["telemetry"]:
+            values = arrays[f"{prefix}tel_{key}"].tolist()
+            if key in ("iterations", "fallbacks"):
+                values = [int(v) for v in values]
+            results["telemetry"][key] = values
+    return results
+
+
+class PushoverCheckpoint:
+    """
+    Punto de control de un Pushover: lo necesario para reconstruir el dominio y seguir.
+    - project: modelo al inicio del análisis (esquema de ProjectManager.project_to_dict)
+    - journal: comandos y pasos convergidos desde la gravedad (se reproducen en un dominio nuevo)
+    - state: posición (ronda, paso, fase), parámetros y estado Python del solver
+    - consolidated / round_results: historia de resultados hasta este punto
+    """
+
+    def __init__(self, project: dict, journal: list, state: dict,
+                 consolidated: Optional[dict] = None, round_results: Optional[dict] = None):
+        self.project = project
+        self.journal = journal
+        self.state = state
+        self.consolidated = consolidated
+        self.round_results = round_results
+
+    @property
+    def label(self) -> str:
+        s = self.state
+        if s["phase"] == "round_end":
+            return f"Ronda {s['round'] + 1} (fallo en Y={', '.join(f'{y:.2f}' for y in s['pending_failures'])})"
+        return f"Ronda {s['round'] + 1} · paso {s['step']}"
+
+    def matches_project(self, manager) -> bool:
+        """True si el modelo abierto en el manager es el mismo con el que se grabó el checkpoint."""
+        return json.loads(json.dumps(manager.project_to_dict(), default=json_default)) == self.project
+
+    @classmethod
+    def load(cls, path: str) -> "PushoverCheckpoint":
+        with open(os.path.join(path, "state.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version", 1) < CHECKPOINT_VERSION:
+            raise ValueError("Checkpoint de una versión anterior (no reanudable): vuelva a ejecutar el análisis.")
+
+        # Los datos viven en los ficheros de la ejecución; el checkpoint solo dice hasta dónde leerlos
+        run_dir = os.path.dirname(os.path.abspath(path))
+        with open(os.path.join(run_dir, PROJECT_FILE), "r", encoding="utf-8") as f:
+            project = json.load(f)
+        with open(os.path.join(run_dir, JOURNAL_FILE), "rb") as f:
+            lines = f.read(meta["journal_end"]).decode("utf-8").splitlines()
+        journal = [("cmd", e[1], tuple(e[2])) if e[0] == "cmd" else tuple(e) for e in map(json.loads, lines)]
+        arrays = _read_results(os.path.join(run_dir, RESULTS_FILE), meta["results_end"])
+
+        streams = {}
+        for key, stream in meta["streams"].items():
+            if stream["node_tags"] is not None:
+                arrays[f"{stream['prefix']}node_tags"] = np.asarray(stream["node_tags"], dtype=np.int64)
+            streams[key] = results_from_arrays(stream["meta"], stream["prefix"], arrays)
+
+        state = meta["state"]
+        state["frozen_floors"] = set(state.get("frozen_floors", []))
+        state["pending_failures"] = state.get("pending_failures") or []
+        state["base_force_vector"] = {int(k): v for k, v in (state.get("base_force_vector") or {}).items()}
+        return cls(project, journal, state, streams.get("consolidated"), streams.get("round_results"))
+
+
+def _append(path: str, offset: int, data: bytes) -> int:
+    """Escribe 'data' en 'offset' y recorta lo que hubiera detrás (restos de una escritura interrumpida)."""
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        return f.tell()
+
+
+def _read_results(path: str, end: int) -> Dict[str, np.ndarray]:
+    """Concatena las filas de cada serie en los registros de results.bin hasta el byte 'end'."""
+    parts: Dict[str, list] = {}
+    if end:
+        with open(path, "rb") as f:
+            while f.tell() < end:
+                (size,) = struct.unpack("<Q", f.read(8))
+                with np.load(io.BytesIO(f.read(size)), allow_pickle=False) as record:
+                    header = json.loads(record["header"].tobytes().decode("utf-8"))
+                    for prefix in header["reset"]:
+                        parts = {name: p for name, p in parts.items() if not name.startswith(prefix)}
+                    for name in record.files:
+                        if name != "header":
+                            parts.setdefault(name, []).append(record[name])
+
+    arrays = {}
+    for name, blocks in parts.items():
+        # Un bloque vacío puede traer otro dtype (p.ej. float en una serie de enteros): no debe imponerlo
+        filled = [b for b in blocks if len(b)] or blocks[:1]
+        arrays[name] = np.concatenate(filled) if len(filled) > 1 else filled[0]
+    return arrays
+
+
+class CheckpointManager:
+    """
+    Decide cuándo guardar y dónde: cada ejecución tiene su carpeta dentro de 'directory'
+    y cada checkpoint es un subdirectorio de ella con solo su state.json.
+    El modelo, el diario y la historia de resultados se guardan una vez por ejecución en ficheros
+    de solo-añadir (project.json, journal.jsonl, results.bin): cada checkpoint añade lo nuevo desde
+    el anterior y anota hasta qué byte de cada fichero llega, de modo que guardar cada N pasos
+    cuesta lo mismo al principio que al final de un análisis largo.
+    """
+
+    def __init__(self, directory: str, every_n_steps: Optional[int] = None, at_round_end: bool = True,
+                 stop_at_round_end: bool = False):
+        self.directory = directory
+        self.every_n_steps = every_n_steps
+        self.at_round_end = at_round_end
+        # Detener el análisis en el primer checkpoint de fin de ronda (punto de ramificación)
+        self.stop_at_round_end = stop_at_round_end
+        self.run_dir = None
+        self._seq = 0
+        self._reset_files()
+
+    def _reset_files(self):
+        self._project_saved = False
+        self._journal_len = 0       # Entradas del diario ya escritas
+        self._journal_end = 0       # Y su final en bytes
+        self._results_end = 0
+        self._written = {}          # Nombre de serie -> filas ya escritas en results.bin
+
+    def begin_run(self) -> str:
+        # El pid separa ejecuciones simultáneas de varios procesos (barridos, ramas)
+        base = os.path.join(self.directory, time.strftime("run_%Y%m%d_%H%M%S") + f"_{os.getpid()}")
+        run_dir, suffix = base, 1
+        while os.path.exists(run_dir):
+            suffix += 1
+            run_dir = f"{base}_{suffix}"
+        self.run_dir = run_dir
+        self._seq = 0
+        self._reset_files()
+        return run_dir
+
+    def step_due(self, step_idx: int) -> bool:
+        return bool(self.every_n_steps) and step_idx % self.every_n_steps == 0
+
+    def write(self, checkpoint: PushoverCheckpoint) -> str:
+        self._seq += 1
+        s = checkpoint.state
+        name = f"ckpt_{self._seq:04d}_r{s['round'] + 1}_s{s['step']}"
+        if s["phase"] == "round_end":
+            name += "_fallo"
+        if self.run_dir is None:
+            self.begin_run()
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        if not self._project_saved:
+            with open(os.path.join(self.run_dir, PROJECT_FILE), "w", encoding="utf-8") as f:
+                json.dump(checkpoint.project, f, default=json_default)
+            self._project_saved = True
+        self._append_journal(checkpoint.journal)
+        streams = self._append_results(checkpoint)
+
+        path = os.path.join(self.run_dir, name)
+        os.makedirs(path, exist_ok=True)
+        meta = {
+            "version": CHECKPOINT_VERSION,
+            "created": time.time(),
+            "state": s,
+            "journal_end": self._journal_end,
+            "results_end": self._results_end,
+            "streams": streams,
+        }
+        # El JSON se escribe al final: un checkpoint sin state.json se considera incompleto
+        tmp = os.path.join(path, "state.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, default=json_default)
+        os.replace(tmp, os.path.join(path, "state.json"))
+        print(f"[Checkpoint] Guardado: {path}")
+        return path
+
+    def _append_journal(self, journal: list):
+        new = journal[self._journal_len:]
+        if not new:
+            return
+        text = "".join(json.dumps(list(entry[:2]) + [list(entry[2])] if entry[0] == "cmd" else list(entry),
+                                  default=json_default) + "\n" for entry in new)
+        self._journal_end = _append(os.path.join(self.run_dir, JOURNAL_FILE), self._journal_end, text.encode("utf-8"))
+        self._journal_len = len(journal)
+
+    def _append_results(self, checkpoint: PushoverCheckpoint) -> dict:
+        """Añade a results.bin las filas nuevas de cada serie; devuelve los metadatos de cada historia."""
+        streams, arrays, reset = {}, {}, []
+        prefixes = (("consolidated", "c_"), ("round_results", f"r{checkpoint.state['round']}_"))
+        for key, prefix in prefixes:
+            results = getattr(checkpoint, key)
+            if results is None:
+                continue
+            store = results.get("node_displacements")
+            streams[key] = {"prefix": prefix, "meta": _results_meta(results),
+                            "node_tags": list(store.tags) if store is not None else None}
+
+            series = _results_series(results, prefix)
+            if any(len(values) < self._written.get(name, 0) for name, values, _ in series):
+                # La historia no ha crecido por el final: se vuelve a escribir entera
+                reset.append(prefix)
+                self._written = {n: k for n, k in self._written.items() if not n.startswith(prefix)}
+            for name, values, dtype in series:
+                start = self._written.get(name)
+                if start is not None and len(values) == start:
+                    continue
+                arrays[name] = _rows_from(values, start or 0, dtype)
+                self._written[name] = len(values)
+
+        if arrays or reset:
+            header = np.frombuffer(json.dumps({"reset": reset}).encode("utf-8"), dtype=np.uint8)
+            buffer = io.BytesIO()
+            np.savez(buffer, header=header, **arrays)
+            record = buffer.getvalue()
+            self._results_end = _append(os.path.join(self.run_dir, RESULTS_FILE), self._results_end,
+                                        struct.pack("<Q", len(record)) + record)
+        return streams
+
+
+def list_checkpoints(directory: str) -> List[str]:
+    """Checkpoints completos (con state.json) bajo 'directory' (una ejecución o todas), en orden de creación."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        if "state.json" in files:
+            found.append(root)
+    return found
@@ -0,0 +1,87 @@
+import queue
+import threading
+
+
+class ReactionLogSink:
+    """
+    Canal de diagnóstico opcional para las reacciones de apoyo del Pushover.
+    Acumula filas en memoria y las vuelca a CSV por bloques desde un hilo escritor,
+    de modo que el bucle de análisis nunca abre ni escribe ficheros.
+    """
+
+    HEADER = "Cycle,Step,NodeTag,IsGhost,ReacX,ReacY,ReacZ\n"
+
+    def __init__(self, path: str, chunk_size: int = 4096):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._rows = []
+        self._queue = queue.Queue()
+        self._closed = False
+        self._error = None      # Primera excepción del hilo escritor (se relanza en flush/close)
+
+        # El fichero se abre aquí para que un error (carpeta inexistente, permisos) llegue al llamador;
+        # a partir de ahora solo lo toca el hilo escritor
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(self.HEADER)
+        self._thread = threading.Thread(target=self._writer_loop, name="ReactionLogWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, cycle_idx: int, step_idx: int, node_tag: int, reacs):
+        """Registra una fila. Solo guarda la tupla: el formateo se hace en el hilo escritor."""
+        self._rows.append((cycle_idx, step_idx, node_tag, reacs))
+        if len(self._rows) >= self.chunk_size:
+            self._submit()
+
+    def flush(self):
+        """Envía las filas pendientes y espera a que el hilo escritor las haya volcado."""
+        if self._closed:
+            return
+        self._submit()
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Vacía el buffer, detiene el hilo escritor y cierra el fichero."""
+        if self._closed:
+            return
+        self._submit()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._closed = True
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Error escribiendo el registro de reacciones '{self.path}': {error}") from error
+
+    def _submit(self):
+        if self._rows:
+            self._queue.put(self._rows)
+            self._rows = []
+
+    def _writer_loop(self):
+        # Cada bloque se confirma (task_done) aunque falle: flush() nunca queda esperando a un hilo muerto
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    break
+                if self._error is None:
+                    self._file.write("".join(self._format_row(row) for row in chunk))
+                    self._file.flush()
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _format_row(row) -> str:
+        cycle_idx, step_idx, node_tag, reacs = row
+        # reacs suele tener 3 valores (Fx, Fy, Mz) para 2D, protegido por si falla.
+        rx = reacs[0] if len(reacs) > 0 else 0.0
+        ry = reacs[1] if len(reacs) > 1 else 0.0
+        rz = reacs[2] if len(reacs) > 2 else 0.0
+        is_ghost = node_tag >= 2000000
+        return f"{cycle_idx},{step_idx},{node_tag},{is_ghost},{rx},{ry},{rz}\n"
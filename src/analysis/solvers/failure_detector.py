@@ -1,3 +1,4 @@
+from collections import deque
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
@@ -10,12 +11,79 @@ class FloorFailureState:
     k_tan: float
     current_drift: float
 
+class _FloorTracker:
+    """Estado incremental de una planta: muestras para K_ini y ventana circular para K_tan."""
+    __slots__ = ['count', 'disp_0', 'shear_0', 'k_ini', 'disp_window', 'shear_window', 'H']
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.disp_0 = 0.0
+        self.shear_0 = 0.0
+        self.k_ini = None
+        self.disp_window = deque(maxlen=window)
+        self.shear_window = deque(maxlen=window)
+        self.H = 0.0
+
+
 class FailureDetector:
     """Clase responsable de analizar secuencias de resultados de un Pushover para detectar la pérdida de capacidad estructural"""
+
+    # Pasos mínimos de historia antes de evaluar, índice para K_ini y ancho de ventana para K_tan
+    MIN_STEPS = 100
+    INI_INDEX = 20
+    TAN_WINDOW = 20
+
     def __init__(self, sensitivity: float = 0.001, max_drift: Optional[float] = None):
         #sensitivity: Factor multiplicador para considerar "plana" la rigidez tangente frente a la inicial.ProcessLookupError
         self.sensitivity = sensitivity
         self.max_drift = max_drift
+        self._trackers: Dict[float, _FloorTracker] = {}
+
+    def reset(self):
+        """Olvida el estado incremental (se llama al inicio de cada ronda de Pushover)."""
+        self._trackers = {}
+
+    def update(self, step_state: Dict[float, Dict[str, float]]) -> List[FloorFailureState]:
+        """
+        API incremental: recibe el estado de un único paso {y: {"disp", "shear", "H"}}
+        y evalúa cada planta en tiempo constante. Da el mismo resultado que 'analyze'
+        sobre la historia acumulada desde el último reset().
+        """
+        failed_floors: List[FloorFailureState] = []
+
+        for y, data in step_state.items():
+            tracker = self._trackers.get(y)
+            if tracker is None:
+                tracker = _FloorTracker(self.TAN_WINDOW)
+                self._trackers[y] = tracker
+
+            disp = data["disp"]
+            shear = data["shear"]
+            tracker.H = data.get("H", 0.0)
+
+            # Muestras fijas para la rigidez inicial (pasos 0 e INI_INDEX), cacheada una sola vez
+            if tracker.count == 0:
+                tracker.disp_0 = disp
+                tracker.shear_0 = shear
+            elif tracker.count == self.INI_INDEX:
+                tracker.k_ini = self._secant_stiffness(tracker.disp_0, disp, tracker.shear_0, shear)
+
+            tracker.disp_window.append(disp)
+            tracker.shear_window.append(shear)
+            tracker.count += 1
+
+            if tracker.count < self.MIN_STEPS:
+                continue
+
+            dq_tan = tracker.disp_window[-1] - tracker.disp_window[0]
+            dv_tan = tracker.shear_window[-1] - tracker.shear_window[0]
+            k_tan = self._tangent_from_increments(dq_tan, dv_tan)
+
+            failure_state = self._evaluate_floor(y, tracker.k_ini, k_tan, disp, tracker.H)
+            if failure_state:
+                failed_floors.append(failure_state)
+
+        return failed_floors
 
     def analyze(self, results: Dict[str, Any]) -> List[FloorFailureState]:
         """
@@ -32,7 +100,7 @@ class FailureDetector:
 
             # Filtro : Necesitamos suficiente historia de pasos en la ronda 
 
-            if len(disps) < 100:
+            if len(disps) < self.MIN_STEPS:
                 continue
 
             #1. Extraemos las magnitudes netas a través de nuestros helpers
@@ -40,48 +108,51 @@ class FailureDetector:
             k_tan = self._calculate_tangent_stiffness(disps, shears)
             current_drift = disps[-1]
 
-            #2. Evaluacióndel Mecanismo (Curva Plana)
-            is_flat = (k_tan < 0) or (abs(k_tan) < (self.sensitivity * k_ini))
-
-            #3. Evaculación de la deriva.
-            is_excessive_drift = False 
-
-            if self.max_drift is not None and H > 0:
-                drift_ratio = abs(current_drift)/H
-                is_excessive_drift = drift_ratio > self.max_drift
-
-            #4. Empaquetar y reportar si se activó el fallo
-            if is_flat or is_excessive_drift:
-                #Construimos un string dinámico con el motivo exacto del fallo
-                causes = []
-                if is_flat:
-                    causes.append(f"Caida Rigidiez: {(k_tan/k_ini)*100:.4f}%")
-                if is_excessive_drift:
-                    causes.append(f"Deriva de piso límite ({self.max_drift * 100:.1f}%)")
-        
-                failure_state = FloorFailureState(
-                    y_level = y,
-                    cause = " | ".join(causes),
-                    k_ini = k_ini,
-                    k_tan = k_tan,
-                    current_drift = current_drift
-                )
+            failure_state = self._evaluate_floor(y, k_ini, k_tan, current_drift, H)
+            if failure_state:
                 failed_floors.append(failure_state)
 
         return failed_floors
 
+    def _evaluate_floor(self, y: float, k_ini: float, k_tan: float, current_drift: float, H: float) -> Optional[FloorFailureState]:
+        """Aplica los criterios de fallo (curva plana y deriva máxima) a las magnitudes de una planta."""
+
+        #2. Evaluacióndel Mecanismo (Curva Plana)
+        is_flat = (k_tan < 0) or (abs(k_tan) < (self.sensitivity * k_ini))
+
+        #3. Evaculación de la deriva.
+        is_excessive_drift = False 
+
+        if self.max_drift is not None and H > 0:
+            drift_ratio = abs(current_drift)/H
+            is_excessive_drift = drift_ratio > self.max_drift
+
+        #4. Empaquetar y reportar si se activó el fallo
+        if not (is_flat or is_excessive_drift):
+            return None
+
+        #Construimos un string dinámico con el motivo exacto del fallo
+        causes = []
+        if is_flat:
+            causes.append(f"Caida Rigidiez: {(k_tan/k_ini)*100:.4f}%")
+        if is_excessive_drift:
+            causes.append(f"Deriva de piso límite ({self.max_drift * 100:.1f}%)")
+
+        return FloorFailureState(
+            y_level = y,
+            cause = " | ".join(causes),
+            k_ini = k_ini,
+            k_tan = k_tan,
+            current_drift = current_drift
+        )
+
     def _calculate_initial_stiffness(self, disps: List[float], shears: List[float]) -> float:
         """ 
         Calcula la Rigidez Inicial (K_ini) usando los primeros pasoso de la ronda 
         para evitar ruido numérico en el paso 0. Devuelve la magnitud absoluta.
         """
 
-        dq_ini = disps[20] - disps[0]
-        dv_ini = shears[20] - shears[0]
-
-        if abs(dq_ini) > 1e-9:
-            return abs(dv_ini /dq_ini)
-        return 1.0e9 #Asumir rigidez infinita si no hay desplazamiento válido
+        return self._secant_stiffness(disps[0], disps[self.INI_INDEX], shears[0], shears[self.INI_INDEX])
 
 
     def _calculate_tangent_stiffness(self, disps: List[float], shears: List[float]) -> float:
@@ -90,15 +161,26 @@ class FailureDetector:
         lineal simple de los últimos 5 puntyos para la estabilidad numérica.
         """
 
-        d_last = disps[-20:]
-        v_last = shears[-20:]
+        d_last = disps[-self.TAN_WINDOW:]
+        v_last = shears[-self.TAN_WINDOW:]
 
         dq_tan = d_last[-1] - d_last[0]
         dv_tan = v_last[-1] - v_last[0]
 
+        return self._tangent_from_increments(dq_tan, dv_tan)
+
+    @staticmethod
+    def _secant_stiffness(d_0: float, d_1: float, v_0: float, v_1: float) -> float:
+        dq_ini = d_1 - d_0
+        dv_ini = v_1 - v_0
+
+        if abs(dq_ini) > 1e-9:
+            return abs(dv_ini /dq_ini)
+        return 1.0e9 #Asumir rigidez infinita si no hay desplazamiento válido
+
+    @staticmethod
+    def _tangent_from_increments(dq_tan: float, dv_tan: float) -> float:
         try:
             return dv_tan/dq_tan
         except ZeroDivisionError:
             return 1.0e9 #Vertcial / Plana por infinito
-
-    
@@ -8,8 +8,7 @@ class GravitySolver:
 
     def run(self):
         """Ejecuta un análisis de gravedad básico."""
-        if self.builder.debug_file: 
-            self.builder.debug_file.write("\n# --- Gravity Analysis ---\n")
+        self.builder.log_comment("--- Gravity Analysis ---")
         
         self.builder.log_command('system', 'UmfPack')
         self.builder.log_command('numberer', 'RCM')
@@ -19,10 +18,12 @@ class GravitySolver:
         self.builder.log_command('analysis', 'Static')
         
         ok = self.builder.log_command('analyze', 10)
+        self.builder.command_log.flush()
         
         if ok == 0:
             print("[OpenSees] Análisis de Gravedad completado con EXITO")
             self.builder.log_command('loadConst', '-time', 0.0)
+            self.builder.mark_gravity_applied()
             return True
         else:
             print(f"[OpenSees] FALLÓ el análisis de Gravedad.")
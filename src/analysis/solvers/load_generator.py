@@ -60,8 +60,7 @@ class LoadPushoverGenerator:
         """
         floor_masses = self.manager.get_floor_masses()
 
-        if self.builder.debug_file:
-            self.builder.debug_file.write("\n# --- Anañysis Modal --- \n")
+        self.builder.log_comment("--- Análisis Modal ---")
 
         lambdas = ops.eigen(n_modes)
         self.builder.log_command('eigen', n_modes)
@@ -1,19 +1,69 @@
+import time
 import openseespy.opensees as ops
 
 class PushoverConfigurator:
-    def __init__(self, builder, debug_file=None):
+    # Cadena de algoritmos: el primero es el principal, el resto son respaldos cada vez más robustos
+    # (OpenSeesPy espera el flag '-initial' para la tangente inicial)
+    FALLBACK_CHAIN = [
+        ('KrylovNewton',),
+        ('NewtonLineSearch', 0.8),
+        ('NewtonLineSearch', 0.6),
+        ('Broyden', 20),
+        ('ModifiedNewton', '-initial'),
+        ('Newton', '-initial'),
+    ]
+
+    def __init__(self, builder):
         self.builder = builder
-        self.debug_file = debug_file
         
         # Guardamos los parámetros originales para restaurarlos tras los fallbacks
         self.base_tol = 1e-06
         self.base_iter = 100
 
-    def setup_static_analysis(self, control_node_tag, incr_disp):
+        # Control adaptativo del incremento de desplazamiento (None = paso fijo)
+        self.step_control = None
+        self.control_node_tag = None
+        self.current_incr = None
+        self.incr_ceiling = None
+
+        # Memoria del algoritmo que rescató el último paso difícil
+        self.memory_window = 20
+        self._remembered = 0
+        self._remembered_steps_left = 0
+        self._step_stats = {}
+
+    def enable_adaptive_stepping(self, incr_min, incr_max, fast_iter=4, grow_factor=1.5, max_bisections=8):
+        """
+        Activa el paso adaptativo: el incremento crece (x grow_factor) mientras el paso converge
+        en fast_iter iteraciones o menos, y se biseca ante un fallo. Siempre dentro de [incr_min, incr_max].
+        """
+        if incr_min <= 0 or incr_max < incr_min:
+            raise ValueError(f"Límites de paso no válidos: min={incr_min}, max={incr_max}")
+        self.step_control = {
+            "incr_min": incr_min, "incr_max": incr_max, "fast_iter": fast_iter,
+            "grow_factor": grow_factor, "max_bisections": max_bisections
+        }
+
+    def disable_adaptive_stepping(self):
+        self.step_control = None
+
+    @property
+    def adaptive_stepping(self):
+        return self.step_control is not None
+
+    def setup_static_analysis(self, control_node_tag, incr_disp, incr_ceiling=None):
         """
         Configura el entorno de OpenSees para el paso estático del Pushover.
         Centraliza los comandos que rigen el motor matemático.
+        'incr_ceiling' limita además el crecimiento del paso adaptativo en esta ejecución.
         """
+        self.control_node_tag = control_node_tag
+        self.incr_ceiling = incr_ceiling
+        if self.step_control:
+            incr_disp = min(max(incr_disp, self.step_control["incr_min"]), self._incr_max())
+        self.current_incr = incr_disp
+        self._remembered_steps_left = 0
+
         self.builder.log_command('wipeAnalysis')
         self.builder.log_command('system', 'UmfPack') 
         self.builder.log_command('numberer', 'RCM')   
@@ -32,74 +82,190 @@ class PushoverConfigurator:
         """
         Intenta resolver un paso estático. Si el algoritmo principal falla, 
         intenta iterativamente con algoritmos más robustos según las mejores prácticas.
+        El algoritmo que rescata un paso se recuerda durante 'memory_window' pasos:
+        mientras tanto es el primer intento, evitando pagar el fallo del principal en cada paso.
         """
-        # Intento primario (KrylovNewton)
-        ok = ops.analyze(1)
-        if ok == 0:
-            return ok
-            
-        print("[Configurator] Convergencia falló con KrylovNewton, intentando algoritmos de respaldo...")
-        
-        # Respaldo 1: NewtonLineSearch 0.8
-        if ok != 0:
-            print(" -> Intentando NewtonWithLineSearch 0.8 ...")
-            ops.algorithm('NewtonLineSearch', 0.8)
-            ok = ops.analyze(1)
-            if ok == 0: 
-                print(" -> ¡Éxito! Restaurando a KrylovNewton.")
-            
-            # Restaurar estado original pase lo que pase
-            ops.test('NormDispIncr', self.base_tol, self.base_iter)
-            ops.algorithm('KrylovNewton')
-
-        # Respaldo 2: NewtonLineSearch 0.6
-        if ok != 0:
-            print(" -> Intentando NewtonWithLineSearch 0.6 ...")
-            ops.algorithm('NewtonLineSearch', 0.6)
-            ok = ops.analyze(1)
-            if ok == 0: 
-                print(" -> ¡Éxito! Restaurando a KrylovNewton.")
-            
-            # Restaurar estado original
-            ops.test('NormDispIncr', self.base_tol, self.base_iter)
-            ops.algorithm('KrylovNewton')
-            
-        # Respaldo 3: Broyden
-        if ok != 0:
-            print(" -> Intentando Broyden 20 ...")
-            ops.algorithm('Broyden', 20)
-            ok = ops.analyze(1)
-            if ok == 0: 
-                print(" -> ¡Éxito! Restaurando a KrylovNewton.")
-            
-            # Restaurar estado original
-            ops.test('NormDispIncr', self.base_tol, self.base_iter)
-            ops.algorithm('KrylovNewton')
-
-        # Respaldo 4: ModifiedNewton con Tangente Inicial
-        if ok != 0:
-            print(" -> Intentando ModifiedNewton con Tangente Inicial ...")
-            # OpenSeesPy espera el flag '-initial' para la tangente inicial
-            ops.algorithm('ModifiedNewton', '-initial')
-            ok = ops.analyze(1)
-            if ok == 0: 
-                print(" -> ¡Éxito! Restaurando a KrylovNewton.")
-            
-            # Restaurar estado original
-            ops.test('NormDispIncr', self.base_tol, self.base_iter)
-            ops.algorithm('KrylovNewton')
-
-        # Respaldo 5: Newton con Tangente Inicial
+        t0 = time.perf_counter()
+        stats = self._step_stats
+        stats.setdefault("fallbacks", 0)
+        stats.setdefault("iterations", 0)
+        stats.setdefault("wall_time", 0.0)
+
+        # Intento primario: el algoritmo recordado (ya activo en OpenSees) o KrylovNewton
+        first = self._remembered if self._remembered_steps_left > 0 else 0
+        current = used = first
+        ok = self._analyze()
+        stats["iterations"] += ops.testIter()
+
         if ok != 0:
-            print(" -> Intentando Newton con Tangente Inicial ...")
-            # OpenSeesPy espera el flag '-initial'
-            ops.algorithm('Newton', '-initial')
-            ok = ops.analyze(1)
-            if ok == 0: 
-                print(" -> ¡Éxito! Restaurando a KrylovNewton.")
-            
-            # Restaurar estado original
-            ops.test('NormDispIncr', self.base_tol, self.base_iter)
-            ops.algorithm('KrylovNewton')
-        
+            print(f"[Configurator] Convergencia falló con {self._algorithm_name(first)}, intentando algoritmos de respaldo...")
+            stats["fallbacks"] += 1
+
+            for idx in range(len(self.FALLBACK_CHAIN)):
+                if idx == first:
+                    continue
+                print(f" -> Intentando {self._algorithm_name(idx)} ...")
+                self._set_algorithm(idx)
+                current = idx
+                ok = self._analyze()
+                stats["iterations"] += ops.testIter()
+                if ok == 0:
+                    used = idx
+                    print(f" -> ¡Éxito con {self._algorithm_name(idx)}!")
+                    break
+                stats["fallbacks"] += 1
+
+        if ok == 0 and used != 0 and self.memory_window > 0:
+            if used != first:
+                # Nuevo rescate: se mantiene activo y se abre la ventana de memoria
+                self._remembered = used
+                self._remembered_steps_left = self.memory_window
+            else:
+                self._remembered_steps_left -= 1
+        else:
+            self._remembered_steps_left = 0
+
+        # Agotada la memoria (o sin ella): volver al estado original
+        if self._remembered_steps_left <= 0 and current != 0:
+            self._set_algorithm(0)
+
+        stats["algorithm"] = self._algorithm_name(used) if ok == 0 else None
+        stats["wall_time"] += time.perf_counter() - t0
         return ok
+
+    def _analyze(self):
+        # Los pasos (también los intentos fallidos) quedan en el diario para poder reproducirlos
+        if self.builder.journal is not None:
+            self.builder.journal.append(("analyze",))
+        return ops.analyze(1)
+
+    def _set_algorithm(self, idx):
+        if self.builder.journal is not None:
+            self.builder.journal.append(("algorithm", idx))
+        ops.test('NormDispIncr', self.base_tol, self.base_iter)
+        ops.algorithm(*self.FALLBACK_CHAIN[idx])
+
+    def replay_journal(self, journal):
+        """
+        Reproduce en el dominio actual un diario grabado (comandos, cambios de algoritmo y pasos).
+        Los errores de comandos se ignoran igual que en la ejecución original (p.ej. materiales repetidos).
+        Devuelve el número de pasos reproducidos.
+        """
+        saved, self.builder.journal = self.builder.journal, None
+        self.builder.mark_domain_modified()
+        n_steps = 0
+        try:
+            for entry in journal:
+                kind = entry[0]
+                if kind == "analyze":
+                    ops.analyze(1)
+                    n_steps += 1
+                elif kind == "algorithm":
+                    self._set_algorithm(entry[1])
+                else:
+                    try:
+                        getattr(ops, entry[1])(*entry[2])
+                    except Exception:
+                        pass
+        finally:
+            self.builder.journal = saved
+        return n_steps
+
+    def export_state(self):
+        """Estado Python del configurador necesario para continuar un análisis (checkpoints)."""
+        return {
+            "control_node_tag": self.control_node_tag,
+            "current_incr": self.current_incr,
+            "incr_ceiling": self.incr_ceiling,
+            "remembered": self._remembered,
+            "remembered_steps_left": self._remembered_steps_left,
+            "base_tol": self.base_tol,
+            "base_iter": self.base_iter,
+        }
+
+    def restore_state(self, state):
+        self.control_node_tag = state["control_node_tag"]
+        self.current_incr = state["current_incr"]
+        self.incr_ceiling = state["incr_ceiling"]
+        self._remembered = state["remembered"]
+        self._remembered_steps_left = state["remembered_steps_left"]
+        self.base_tol = state["base_tol"]
+        self.base_iter = state["base_iter"]
+
+    def _algorithm_name(self, idx):
+        return " ".join(str(a) for a in self.FALLBACK_CHAIN[idx])
+
+    # --- Telemetría por paso ---
+    @staticmethod
+    def new_telemetry():
+        """Historia columnar de la telemetría del solver (una entrada por paso convergido)."""
+        return {"algorithm": [], "iterations": [], "wall_time": [], "fallbacks": [], "incr": []}
+
+    def run_step(self, remaining_disp, incr_disp, telemetry=None):
+        """
+        Ejecuta un paso del Pushover (fijo o adaptativo) y, si converge, añade su fila de telemetría.
+        Devuelve (ok, incremento aplicado).
+        """
+        self._step_stats = {}
+        if self.adaptive_stepping:
+            ok, incr = self.run_adaptive_step(remaining_disp)
+        else:
+            ok, incr = self.run_static_step_with_fallback(), incr_disp
+
+        if ok == 0 and telemetry is not None:
+            stats = self._step_stats
+            telemetry["algorithm"].append(stats["algorithm"])
+            telemetry["iterations"].append(stats["iterations"])
+            telemetry["wall_time"].append(stats["wall_time"])
+            telemetry["fallbacks"].append(stats["fallbacks"])
+            telemetry["incr"].append(incr)
+        return ok, incr
+
+    @staticmethod
+    def summarize_telemetry(telemetry):
+        """Agrega la telemetría por algoritmo: {algoritmo: {"steps", "iterations", "wall_time"}}."""
+        summary = {}
+        for algo, iters, wall in zip(telemetry["algorithm"], telemetry["iterations"], telemetry["wall_time"]):
+            entry = summary.setdefault(algo, {"steps": 0, "iterations": 0, "wall_time": 0.0})
+            entry["steps"] += 1
+            entry["iterations"] += iters
+            entry["wall_time"] += wall
+        return summary
+
+    def _incr_max(self):
+        incr_max = self.step_control["incr_max"]
+        if self.incr_ceiling is not None:
+            incr_max = min(incr_max, self.incr_ceiling)
+        return max(incr_max, self.step_control["incr_min"])
+
+    def _set_increment(self, incr_disp):
+        self.builder.log_command('integrator', 'DisplacementControl', self.control_node_tag, 1, incr_disp)
+
+    def run_adaptive_step(self, remaining_disp):
+        """
+        Paso con incremento variable (requiere enable_adaptive_stepping).
+        Nunca sobrepasa 'remaining_disp'; ante un fallo biseca el incremento hasta incr_min.
+        Devuelve (ok, incremento aplicado).
+        """
+        sc = self.step_control
+        incr = min(self.current_incr, remaining_disp)
+        self._set_increment(incr)
+
+        ok = self.run_static_step_with_fallback()
+        bisections = 0
+        while ok != 0 and bisections < sc["max_bisections"] and incr > sc["incr_min"]:
+            incr = max(incr * 0.5, sc["incr_min"])
+            bisections += 1
+            print(f"[Configurator] Bisección {bisections}: reintentando con incremento {incr:.3e}")
+            self._set_increment(incr)
+            ok = self.run_static_step_with_fallback()
+
+        if ok != 0:
+            return ok, 0.0
+
+        # Convergencia barata: crecer el incremento para el siguiente paso
+        if bisections == 0 and ops.testIter() <= sc["fast_iter"]:
+            self.current_incr = min(incr * sc["grow_factor"], self._incr_max())
+        else:
+            self.current_incr = incr
+        return ok, incr
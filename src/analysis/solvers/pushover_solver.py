@@ -1,12 +1,32 @@
 from src.analysis.loads import NodalLoad
 import os
+import math
+import numpy as np
 import openseespy.opensees as ops
+from dataclasses import dataclass
+from typing import List, Tuple
 from src.analysis.manager import ProjectManager
 from src.analysis.solvers.failure_detector import FailureDetector
+from src.analysis.solvers.gravity_solver import GravitySolver
 from src.analysis.solvers.load_generator import LoadPushoverGenerator
 from src.analysis.solvers.pushover_configurator import PushoverConfigurator
+from src.analysis.solvers.results_store import NodeHistoryStore
+from src.analysis.solvers.diagnostics import ReactionLogSink
+from src.analysis.solvers.recorder_capture import RecorderCapture
+from src.analysis.solvers.checkpoint import CheckpointManager, PushoverCheckpoint
+from src.analysis.solvers.results_stream import ResultsStream, tail_view
 from src.analysis.element import ForceBeamColumn
 
+@dataclass
+class FloorCapturePlan:
+    """Topología precompilada para la captura por planta (columnas planas + nodos de referencia)."""
+    floor_ys: List[float]                   # Cotas de las plantas capturadas (ordenadas)
+    columns: List[Tuple[int, int, int]]     # (tag columna, índice de sección, índice de planta)
+    col_floor_idx: np.ndarray               # Índice de planta por columna (para acumular cortantes)
+    ref_nodes: List[Tuple[int, int]]        # (nodo top, nodo bot) de la columna representante
+    heights: List[float]                    # Altura de cada planta
+
+
 class PushoverSolver:
     """
     Organizador del Análisis Pushover.
@@ -22,17 +42,220 @@ class PushoverSolver:
         self.failure_detector = FailureDetector()
         self.active_support_nodes = []
 
+        # Canal de diagnóstico de reacciones (None = desactivado, coste cero)
+        self.reaction_log = None
+
+        # Plan de captura por planta (se construye al inicio de cada run_pushover)
+        self._capture_plan = None
+
+        # Modo de captura: "direct" (consultas ops por paso) o "recorder" (recorders binarios + lectura en bloque)
+        self.capture_mode = "direct"
+        self.capture_dir = os.path.join("pushover_data", "capture")
+
+        # Progreso y cancelación cooperativa (usados por el worker de la UI)
+        self.progress_callback = None   # callable(resultados_parciales, info)
+        self.progress_every = 50        # Emitir progreso cada N pasos
+        self._cancel_requested = False
+        self._consolidated = None       # Historia adaptativa en curso (para los parciales)
+
+        # Checkpoints (None = desactivados). El estado de la ejecución en curso vive en _run_state
+        self.checkpoints = None
+        self._run_state = None
+
+        # Resultados por bloques en disco (None = listas en memoria)
+        self.results_stream = None
+
+    def request_cancel(self):
+        """Pide detener el análisis entre dos pasos (seguro para llamar desde otro hilo)."""
+        self._cancel_requested = True
+
+    @property
+    def cancel_requested(self):
+        return self._cancel_requested
+
+    # --- Checkpoints ---
+    def enable_checkpoints(self, directory=None, every_n_steps=None, stop_at_round_end=False):
+        """
+        Guarda checkpoints al final de cada ronda adaptativa con fallo y, opcionalmente, cada N pasos
+        (solo en modo de captura "direct"). Devuelve el directorio de destino.
+        Con 'stop_at_round_end' el adaptativo se detiene en el primer fallo, antes de congelar
+        (la ruta del checkpoint queda en results["branch_checkpoint"]).
+        """
+        if directory is None:
+            directory = os.path.join("pushover_data", "checkpoints")
+        self.checkpoints = CheckpointManager(directory, every_n_steps=every_n_steps,
+                                             stop_at_round_end=stop_at_round_end)
+        return directory
+
+    def disable_checkpoints(self):
+        self.checkpoints = None
+
+    # --- Resultados por bloques ---
+    def enable_results_streaming(self, directory=None, chunk_size=2000, tail_steps=2000):
+        """
+        Escribe la historia del Pushover en disco por bloques de 'chunk_size' pasos a medida que avanza,
+        conservando en memoria como mínimo los últimos 'tail_steps' (los que se trazan en vivo).
+        Devuelve el directorio de destino.
+        """
+        if directory is None:
+            directory = os.path.join("pushover_data", "results")
+        self.results_stream = ResultsStream(directory, chunk_size=chunk_size, tail_size=tail_steps)
+        return directory
+
+    def disable_results_streaming(self):
+        self.results_stream = None
+
+    def _series(self, dtype=np.float64):
+        """Serie vacía de resultados: lista en memoria o serie por bloques si hay streaming."""
+        if self.results_stream is None:
+            return []
+        return self.results_stream.series(dtype)
+
+    def _new_telemetry(self):
+        if self.results_stream is None:
+            return self.configurator.new_telemetry()
+        return self.results_stream.telemetry()
+
+    def _close_results_stream(self, results):
+        """Vuelca las colas y escribe el manifiesto (results["stream_dir"] apunta a la ejecución)."""
+        if self.results_stream is not None:
+            results["stream_dir"] = self.results_stream.close(results)
+
+    def _begin_checkpointing(self, mode, params, project=None, journal=None):
+        """Empieza a grabar el diario del dominio para esta ejecución (si hay checkpoints activos)."""
+        if self.checkpoints is None:
+            # Sin checkpoints no se graba: un diario que quedase de una ejecución interrumpida se descarta
+            self.builder.journal = None
+            self._run_state = None
+            return
+        self.builder.journal = list(journal) if journal is not None else []
+        self.checkpoints.begin_run()
+        self._run_state = {
+            "mode": mode, "params": params,
+            "project": project if project is not None else self.manager.project_to_dict(),
+            "round": 0, "pattern_tag": 200, "frozen_floors": set(), "base_force_vector": None
+        }
+
+    def _end_checkpointing(self):
+        self.builder.journal = None
+        self._run_state = None
+
+    def _write_checkpoint(self, phase, round_results=None, **position):
+        rs = self._run_state
+        configurator = self.configurator
+        state = {
+            "mode": rs["mode"], "params": rs["params"], "phase": phase,
+            "round": rs["round"], "step": 0, "advanced": 0.0, "pattern_tag": rs["pattern_tag"],
+            "pending_failures": [],
+            "frozen_floors": sorted(float(y) for y in rs["frozen_floors"]),
+            "base_force_vector": rs["base_force_vector"],
+            "active_support_nodes": list(self.active_support_nodes),
+            "configurator": configurator.export_state(),
+            "step_control": configurator.step_control,
+            "memory_window": configurator.memory_window,
+            "capture_mode": self.capture_mode,
+            "pushover_loads": [load.to_dict() for load in self.manager.pushover_loads],
+        }
+        state.update(position)
+        checkpoint = PushoverCheckpoint(rs["project"], self.builder.journal, state,
+                                        consolidated=self._consolidated, round_results=round_results)
+        return self.checkpoints.write(checkpoint)
+
+    def resume_from_checkpoint(self, checkpoint, **overrides):
+        """
+        Continúa un análisis desde un checkpoint (ruta o PushoverCheckpoint) en el dominio actual.
+        Reconstruye el modelo, repite la gravedad y reproduce el diario grabado hasta el checkpoint:
+        cada paso convergido se vuelve a resolver, así que reanudar no ahorra cálculo frente a repetir
+        el análisis; sirve para continuar (o ramificar) un análisis interrumpido o cerrado.
+        'overrides' cambia los parámetros de lo que queda por correr (p.ej. freeze_method para ramificar
+        desde el final de una ronda). Devuelve la historia completa, como el análisis original.
+        """
+        if isinstance(checkpoint, str):
+            checkpoint = PushoverCheckpoint.load(checkpoint)
+        state = checkpoint.state
+        params = dict(state["params"])
+        params.update(overrides)
+        print(f"[Checkpoint] Reanudando desde: {checkpoint.label}")
+
+        #1. Modelo del checkpoint: debe ser el abierto (cargarlo es cosa de la UI, en su hilo)
+        if not checkpoint.matches_project(self.manager):
+            raise RuntimeError("El modelo abierto no coincide con el del checkpoint: cárguelo antes de reanudar.")
+        self.builder.build_model(incremental=False)     # Mismo orden de alta que el original: réplica exacta
+        if not GravitySolver(self.builder).run():
+            raise RuntimeError("El análisis de gravedad falló al reconstruir el checkpoint.")
+
+        #2. Dominio: los recorders se crean antes del diario para que vuelvan a escribir toda la historia
+        self._setup_recorders()
+        self.capture_mode = state["capture_mode"]
+        self.configurator.step_control = state["step_control"]
+        self.configurator.memory_window = state["memory_window"]
+        self.configurator.restore_state(state["configurator"])
+        n_replayed = self.configurator.replay_journal(checkpoint.journal)
+        print(f"[Checkpoint] Diario reproducido: {len(checkpoint.journal)} entradas, {n_replayed} pasos.")
+
+        #3. Estado Python del solver
+        self.active_support_nodes = list(state["active_support_nodes"])
+        self.manager.pushover_loads.clear()
+        self.manager.pushover_loads.extend(NodalLoad.from_dict(d) for d in state["pushover_loads"])
+        self._cancel_requested = False
+        self._begin_checkpointing(state["mode"], params, project=checkpoint.project, journal=checkpoint.journal)
+
+        consolidated, round_results = checkpoint.consolidated, checkpoint.round_results
+        if self.results_stream is not None:
+            # La historia del checkpoint continúa en una ejecución nueva por bloques
+            self.results_stream.begin_run()
+            consolidated = self.results_stream.adopt(consolidated) if consolidated is not None else None
+            round_results = self.results_stream.adopt(round_results) if round_results is not None else None
+
+        resume = None
+        if state["phase"] == "in_round":
+            resume = {"round_results": round_results, "step": state["step"], "advanced": state["advanced"]}
+
+        if state["mode"] == "mono":
+            try:
+                return self.run_pushover(params["control_node_tag"], params["max_disp"], params["n_steps"],
+                                         params["load_pattern_type"], setup_recorders=False, resume=resume)
+            finally:
+                self._end_checkpointing()
+
+        return self._run_adaptive_rounds(
+            params, consolidated, state["base_force_vector"], state["frozen_floors"],
+            start_round=state["round"], pending_failures=state["pending_failures"], resume=resume
+        )
+
+    def _snapshot_results(self, round_results, cycle_idx):
+        """
+        Copia ligera (sin historia nodal) de la historia consolidada + la ronda en curso.
+        Con streaming solo incluye las colas en memoria de cada serie.
+        """
+        snapshot = {"roof_disp": [], "base_shear": [], "steps": [], "cycle_id": [], "floors": {}, "failed_floors": []}
+
+        base = self._consolidated
+        if base is not None:
+            snapshot.update(tail_view(base))
+
+        self._merge_results(snapshot, tail_view(round_results), cycle_idx)
+        return snapshot
+
+    def _emit_progress(self, round_results, step_idx, n_steps, cycle_idx, fraction=None):
+        if self.progress_callback is None:
+            return
+        if fraction is None:
+            fraction = step_idx / n_steps if n_steps else 1.0
+        info = {"round": cycle_idx, "step": step_idx, "n_steps": n_steps, "fraction": fraction}
+        self.progress_callback(self._snapshot_results(round_results, cycle_idx), info)
 
     def _initialize_results_structure(self):
         """ Helpers para preparar los diccionarios limpios antes de un run."""
         results = {
-            "roof_disp": [],
-            "base_shear": [],
-            "steps": [],
-            "node_displacements": [],
+            "roof_disp": self._series(),
+            "base_shear": self._series(),
+            "steps": self._series(np.int64),
+            "node_displacements": self._new_node_history(),
             "element_forces_history": [],
             "failed_floors": [],
-            "floors": {}
+            "floors": {},
+            "telemetry": self._new_telemetry()
         }
 
         floor_data = self.manager.get_floor_data()
@@ -40,10 +263,17 @@ class PushoverSolver:
             base_y = min(floor_data.keys())
             for y in sorted(floor_data.keys()):
                 if y > base_y: # Ignorar la planta base (y=0)
-                    results["floors"][y] = {"disp": [], "shear":[], "H": 0.0}
+                    results["floors"][y] = {"disp": self._series(), "shear": self._series(), "H": 0.0}
 
 
         return results
+
+    def _new_node_history(self) -> NodeHistoryStore:
+        """Crea un almacén columnar vacío con una columna por cada nodo del proyecto."""
+        tags = [n.tag for n in self.manager.get_all_nodes()]
+        if self.results_stream is not None:
+            return self.results_stream.node_history(tags)
+        return NodeHistoryStore(tags)
     
     def _initialize_supports(self):
         """Reinicia la lista de apoyos leyendo los anclajes originales"""
@@ -57,6 +287,34 @@ class PushoverSolver:
             if n.fixity[0] == 1:
                 self.active_support_nodes.append(n.tag)
 
+    def run_modal_analysis(self, n_modes=1):
+        """
+        Análisis modal (eigen) sobre el estado actual del dominio.
+        Devuelve {"periods": [T_1, ...], "mode_shapes": {tag: [[ux, uy, rz] por modo]}} o None si falla.
+        """
+        self.builder.log_comment("--- Análisis Modal ---")
+        try:
+            lambdas = self.builder.log_command('eigen', n_modes)
+        except Exception as e:
+            print(f"[Modal] El análisis modal falló en OpenSees ({e})")
+            return None
+
+        if not lambdas or len(lambdas) < n_modes or min(lambdas) <= 0.0:
+            print(f"[Modal] Valores propios no válidos: {lambdas}. Revisar masas y restricciones")
+            return None
+
+        periods = []
+        for count, lam in enumerate(lambdas, 1):
+            T = 2 * math.pi / math.sqrt(lam)
+            periods.append(T)
+            print(f"[Modal] Modo {count} T = {T:.4f}s")
+
+        mode_shapes = {
+            tag: [ops.nodeEigenvector(tag, mode) for mode in range(1, n_modes + 1)]
+            for tag in self.manager.node_store.active("tag").tolist()
+        }
+        return {"periods": periods, "mode_shapes": mode_shapes}
+
 
     def _apply_load_pattern(self, load_pattern_type: str, pattern_tag: int, precalc_vector=None):
         """Helper para delegar la creación del patrón al generador."""
@@ -95,11 +353,11 @@ class PushoverSolver:
         results_dict["roof_disp"].append(ops.nodeDisp(control_node_tag,1))
         results_dict["base_shear"].append(self._get_base_shear(step_idx, cycle_idx))
 
-        #2.
-        results_dict["node_displacements"].append(self._get_all_node_displacements())
+        #2. Snapshot cinemático (escrito directamente en el almacén columnar)
+        self._get_all_node_displacements(results_dict["node_displacements"])
 
-        #3. Estado de Meacanismos por planta
-        self._capture_floor_data(results_dict)
+        #3. Estado de Meacanismos por planta (devuelto también para el detector incremental)
+        return self._capture_floor_data(results_dict)
         
 
     def _get_base_shear(self, step_idx=0, cycle_idx=0) -> float:
@@ -107,39 +365,43 @@ class PushoverSolver:
         ops.reactions()
 
         total_shear = 0.0
-        
-        # --- CHIVATO: Logueando en .csv ---
-        import os
-        log_file = os.path.join(self.manager.base_dir if hasattr(self.manager, 'base_dir') else '.', "debug_reactions.csv")
-        
-        # Si es el primer paso de la primera ronda, limpiar o crear cabecera
-        if step_idx == 1 and cycle_idx == 0:
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write("Cycle,Step,NodeTag,IsGhost,ReacX,ReacY,ReacZ\n")
-        # ----------------------------------
+        reaction_log = self.reaction_log
 
         for b_node in self.active_support_nodes:
             reacs = ops.nodeReaction(b_node)
 
             if reacs:
-                is_ghost = b_node >= 2000000
-                
-                # --- Guardamos el valor exacto devuelto por OpenSees ---
-                with open(log_file, "a", encoding="utf-8") as f:
-                    # reacs suele tener 3 valores (Fx, Fy, Mz) para 2D, protegido por si falla.
-                    rx = reacs[0] if len(reacs) > 0 else 0.0
-                    ry = reacs[1] if len(reacs) > 1 else 0.0
-                    rz = reacs[2] if len(reacs) > 2 else 0.0
-                    f.write(f"{cycle_idx},{step_idx},{b_node},{is_ghost},{rx},{ry},{rz}\n")
-                # -------------------------------------------------------
+                # Diagnóstico opcional: solo se acumula en memoria si el canal está activo
+                if reaction_log is not None:
+                    reaction_log.write(cycle_idx, step_idx, b_node, reacs)
 
                 # por lo que invertimos su reacción.
-                    total_shear += reacs[0]
+                total_shear += reacs[0]
 
         return -total_shear
 
+    def enable_reaction_log(self, path=None, chunk_size=4096):
+        """
+        Activa el registro de reacciones por apoyo (desactivado por defecto).
+        Las filas se vuelcan por bloques a CSV desde un hilo escritor.
+        """
+        self.disable_reaction_log()
+        if path is None:
+            base_dir = self.manager.base_dir if hasattr(self.manager, 'base_dir') else '.'
+            path = os.path.join(base_dir, "debug_reactions.csv")
+        self.reaction_log = ReactionLogSink(path, chunk_size=chunk_size)
+        return path
+
+    def disable_reaction_log(self):
+        """Cierra el canal de diagnóstico (volcando lo pendiente) si estaba activo."""
+        if self.reaction_log is not None:
+            reaction_log, self.reaction_log = self.reaction_log, None
+            reaction_log.close()
+
+    def _flush_reaction_log(self):
+        if self.reaction_log is not None:
+            self.reaction_log.flush()
 
-    
     def _setup_recorders(self, output_dir="pushover_data"):
         """
         Configura los recorders de OpenSees para capturar fuerzas y deformaciones
@@ -170,68 +432,125 @@ class PushoverSolver:
 
         print(f"[Recorders] {count} elementos registrados en '{output_dir}/'")
 
-    def _get_all_node_displacements(self) -> dict:
-        """Captura (dx, dy, rz) de todos los nodos para la animación."""
-        step_disp = {}
-    
-        for n in self.manager.get_all_nodes():
-            step_disp[n.tag] = ops.nodeDisp(n.tag)
+    def _get_all_node_displacements(self, store: NodeHistoryStore):
+        """Captura (dx, dy, rz) de todos los nodos para la animación en una nueva fila del almacén."""
+        row = store.new_step()
 
-        return step_disp
+        for col, tag in enumerate(store.tags):
+            row[col] = ops.nodeDisp(tag)
 
-    def _capture_floor_data(self, results_dict):
-        """Calcula el drift y el contante de cada planta y lo guarda"""
+    def _build_capture_plan(self) -> "FloorCapturePlan":
+        """
+        Precompila, una sola vez por análisis, todo lo que la captura por planta necesita:
+        columnas (tag, sección de cortante, índice de planta) y nodos de referencia para la deriva.
+        """
+        floor_ys = []
+        columns = []
+        ref_nodes = []
+        heights = []
 
         floor_data = self.manager.get_floor_data()
-        if not floor_data: return
+        if floor_data:
+            base_y = min(floor_data.keys())
 
-        base_y = min(floor_data.keys())
+            for y, data in floor_data.items():
+                if y <= base_y: continue # Ignorar la planta base
+
+                cols = data.get("columns", [])
+                if not cols: continue
+
+                floor_idx = len(floor_ys)
+                floor_ys.append(y)
+
+                for col in cols:
+                    #Obtenemos nodos de la columna para saber cual es la base y el top
+                    node_i = self.manager.get_node(col.node_i)
+                    node_j = self.manager.get_node(col.node_j)
+                    n_points = int(getattr(col, 'integration_points', 0) or 0)
 
-        for y, data in floor_data.items():
-            if y <= base_y: continue # Ignorar la planta base
+                    # El cortante suele eestar en la sección más baja o alta
+                    sec_idx = n_points if node_j.y >= node_i.y else 1
+                    columns.append((col.tag, sec_idx, floor_idx))
 
-            cols = data.get("columns", [])
-            if not cols: continue
+                # Deriva Relativa (U-top - U_bot) de la primera columna como representante
+                ref_col = cols[0]
+                node_top = self.manager.get_node(ref_col.node_j)
+                node_bot = self.manager.get_node(ref_col.node_i)
+                ref_nodes.append((node_top.tag, node_bot.tag))
+                heights.append(abs(node_top.y - node_bot.y))
 
-            #1 calcular cortante de la planta (Sumando cortantes en las columnas)
-            shear_total = 0.0
-            for col in cols:
-                #Obtenemos nodos de la columna para saber cual es la base y el top
-                node_i = self.manager.get_node(col.node_i)
-                node_j = self.manager.get_node(col.node_j)
-                n_points = int(getattr(col, 'integration_points', 0) or 0)
+        return FloorCapturePlan(
+            floor_ys=floor_ys,
+            columns=columns,
+            col_floor_idx=np.array([c[2] for c in columns], dtype=np.intp),
+            ref_nodes=ref_nodes,
+            heights=heights
+        )
 
-                # El cortante suele eestar en la sección más baja o alta
-                sec_idx = n_points if node_j.y >= node_i.y else 1
-                forces = ops.eleResponse(col.tag, 'section', sec_idx, 'force')
+    def _capture_floor_data(self, results_dict):
+        """
+        Calcula el drift y el contante de cada planta y lo guarda.
+        Devuelve el estado del paso {y: {"disp", "shear", "H"}} para el detector de fallos.
+        Solo consulta OpenSees: la topología viene resuelta en el plan de captura.
+        """
+        step_state = {}
+
+        plan = self._capture_plan
+        if plan is None:
+            plan = self._capture_plan = self._build_capture_plan()
+        if not plan.floor_ys: return step_state
 
-                if forces and len(forces) >= 3:
-                    shear_total += float(forces[2]) #El cortante se encuentra en esa posición
+        #1 calcular cortante de la planta (Sumando cortantes en las columnas)
+        col_shear = np.zeros(len(plan.columns))
+        for k, (col_tag, sec_idx, _) in enumerate(plan.columns):
+            forces = ops.eleResponse(col_tag, 'section', sec_idx, 'force')
 
-            #2. Clacular Deriva Relativa (U-top - U_bot) de la primera columna como representante
+            if forces and len(forces) >= 3:
+                col_shear[k] = forces[2] #El cortante se encuentra en esa posición
 
-            ref_col = cols[0]
-            node_top = self.manager.get_node(ref_col.node_j)
-            node_bot = self.manager.get_node(ref_col.node_i)
+        floor_shear = np.zeros(len(plan.floor_ys))
+        np.add.at(floor_shear, plan.col_floor_idx, col_shear)
 
-            h_floor = abs(node_top.y - node_bot.y)
-            u_top = ops.nodeDisp(node_top.tag, 1)
-            u_bot = ops.nodeDisp(node_bot.tag, 1)
-            drift = u_top - u_bot
+        #2. Clacular Deriva Relativa y guardar en el dict
+        floors = results_dict["floors"]
+        for floor_idx, y in enumerate(plan.floor_ys):
+            top_tag, bot_tag = plan.ref_nodes[floor_idx]
+            drift = ops.nodeDisp(top_tag, 1) - ops.nodeDisp(bot_tag, 1)
+            shear_total = float(floor_shear[floor_idx])
+            h_floor = plan.heights[floor_idx]
 
             #3. Guardar en el dict
-            results_dict["floors"][y]["disp"].append(drift)
-            results_dict["floors"][y]["shear"].append(shear_total)
-            results_dict["floors"][y]["H"] = h_floor
+            floor_res = floors[y]
+            floor_res["disp"].append(drift)
+            floor_res["shear"].append(shear_total)
+            floor_res["H"] = h_floor
 
-    def run_pushover(self, control_node_tag, max_disp, n_steps, load_pattern_type, failure_detector=None, frozen_floors=None, pattern_tag=200, precalc_vector=None, setup_recorders=True):
+            step_state[y] = {"disp": drift, "shear": shear_total, "H": h_floor}
+
+        return step_state
+
+    def run_pushover(self, control_node_tag, max_disp, n_steps, load_pattern_type, failure_detector=None, frozen_floors=None, pattern_tag=200, precalc_vector=None, setup_recorders=True, resume=None):
         """
         Ejecución limpia de un Pushover Monotónico estándar.
+        'resume' ({"round_results", "step", "advanced"}) continúa una ejecución cuyo dominio ya fue
+        reconstruido desde un checkpoint: no se vuelven a aplicar cargas ni a configurar el análisis.
         """
 
         if frozen_floors is None:
             frozen_floors = set()
 
+        # Llamada directa (fuera del adaptativo): empezar sin cancelaciones pendientes
+        standalone = self._consolidated is None
+        owns_checkpointing = standalone and resume is None
+        if owns_checkpointing and self.results_stream is not None:
+            self.results_stream.begin_run()
+        if owns_checkpointing:
+            self._cancel_requested = False
+            self._begin_checkpointing("mono", dict(control_node_tag=control_node_tag, max_disp=max_disp,
+                                                   n_steps=n_steps, load_pattern_type=load_pattern_type))
+        if self._run_state is not None:
+            self._run_state["pattern_tag"] = pattern_tag
+
         # Asegurarnos de tener los apoyos base si alguien llama a este método directamente
         # (El análisis adaptativo ya los inicializa por fuera para mantener los fantasmas)
         if not self.active_support_nodes:
@@ -241,28 +560,82 @@ class PushoverSolver:
         if setup_recorders:
             self._setup_recorders()
             
-        results = self._initialize_results_structure()
-        
+        results = self._initialize_results_structure() if resume is None else resume["round_results"]
 
-        #1. Aplicar Cargas 
-        self._apply_load_pattern(load_pattern_type, pattern_tag=pattern_tag, precalc_vector=precalc_vector)
+        # Plan de captura precompilado: el bucle de pasos solo consulta OpenSees y escribe arrays
+        self._capture_plan = self._build_capture_plan()
 
-        #2. Configurar motor matématico
         incr_disp = max_disp/n_steps
-        self.configurator.setup_static_analysis(control_node_tag, incr_disp)
+        if resume is None:
+            #1. Aplicar Cargas 
+            self._apply_load_pattern(load_pattern_type, pattern_tag=pattern_tag, precalc_vector=precalc_vector)
+
+            #2. Configurar motor matématico
+            # Las ventanas del detector de fallos se miden en pasos: con detector activo el paso
+            # adaptativo solo puede reducirse (bisección), nunca crecer por encima del nominal
+            self.configurator.setup_static_analysis(control_node_tag, incr_disp,
+                                                    incr_ceiling=incr_disp if failure_detector else None)
+
+        # Paso adaptativo: el bucle avanza hasta max_disp con incrementos variables.
+        # El número de pasos solo fija el incremento inicial; el tope garantiza la terminación.
+        adaptive_steps = self.configurator.adaptive_stepping
+        if adaptive_steps:
+            max_step_count = int(math.ceil(max_disp / self.configurator.step_control["incr_min"])) + 1
+        else:
+            max_step_count = n_steps
+        advanced = 0.0 if resume is None else resume["advanced"]
+        start_step = 1 if resume is None else resume["step"] + 1
+
+        # El detector trabaja en modo incremental: su historia empieza con cada ronda
+        if failure_detector:
+            failure_detector.reset()
+            if resume is not None:
+                # Reconstruir las ventanas con los pasos de la ronda ya capturados
+                floors = results["floors"]
+                for k in range(len(results["steps"])):
+                    failure_detector.update({y: {"disp": floors[y]["disp"][k], "shear": floors[y]["shear"][k],
+                                                 "H": floors[y]["H"]} for y in self._capture_plan.floor_ys})
+
+        # Captura masiva: OpenSees escribe el estado en binario y se lee en bloque al final
+        bulk_capture = None
+        if self.capture_mode == "recorder":
+            bulk_capture = RecorderCapture(
+                self.capture_dir, pattern_tag,
+                node_tags=results["node_displacements"].tags,
+                support_tags=self.active_support_nodes,
+                plan=self._capture_plan
+            )
+            bulk_capture.start()
+
+        cycle_idx = getattr(self, '_current_cycle_idx', 0)
 
         #3. Bucle Estático Principal
-        for i in range(1, n_steps+1):
-            ok = self.configurator.run_static_step_with_fallback()
+        for i in range(start_step, max_step_count+1):
+            if self._cancel_requested:
+                print(f"[Pushover] ⏹ Análisis cancelado por el usuario en el paso {i}.")
+                results["cancelled"] = True
+                break
+
+            ok, incr = self.configurator.run_step(max_disp - advanced, incr_disp, telemetry=results["telemetry"])
             if ok !=0:
                 print(f"[Pushover] 🔴 Fin prematuro por falta de convergencia en paso {i}.")
                 break
+            advanced += incr
+
+            if bulk_capture is None:
+                step_state = self._capture_step_state(results, i, control_node_tag, cycle_idx=cycle_idx)
+            else:
+                # Solo control de convergencia; las plantas se consultan únicamente si el detector las necesita
+                results["steps"].append(i)
+                step_state = self._capture_floor_data(results) if failure_detector else None
 
-            self._capture_step_state(results, i, control_node_tag, cycle_idx=getattr(self, '_current_cycle_idx', 0))
+            if self.progress_callback is not None and i % self.progress_every == 0:
+                self._emit_progress(results, i, n_steps, cycle_idx,
+                                    fraction=advanced / max_disp if adaptive_steps else None)
 
-            #4. Evaluación paso a paso:
+            #4. Evaluación paso a paso (O(1) por planta):
             if failure_detector:
-                fallos_dectectados = failure_detector.analyze(results)
+                fallos_dectectados = failure_detector.update(step_state)
                 nuevos_fallos = [f for f in fallos_dectectados if f.y_level not in frozen_floors]
                 
                 if nuevos_fallos:
@@ -270,14 +643,45 @@ class PushoverSolver:
                     print(f"[Pushover] ⚠️ Fallo detectado en piso (Y={f.y_level}) Causa principal: '{f.cause}'. Rompiendo bucle estático.")
                     break
 
+            if adaptive_steps and advanced >= max_disp * (1.0 - 1e-9):
+                break
+
+            # Checkpoint intermedio (la captura por recorders solo tiene la historia al final de la ronda)
+            if self._run_state is not None and bulk_capture is None and self.checkpoints.step_due(i):
+                self._write_checkpoint("in_round", round_results=results, step=i, advanced=advanced)
+
+        if bulk_capture is not None:
+            bulk_capture.load_into(results, control_node_tag,
+                                   capture_floors=failure_detector is None,
+                                   reaction_log=self.reaction_log, cycle_idx=cycle_idx)
+
+        self._flush_reaction_log()
+        self.builder.command_log.flush()
+        self._print_telemetry_summary(results["telemetry"])
+        if standalone:
+            self._close_results_stream(results)
+        if owns_checkpointing:
+            self._end_checkpointing()
         return results
 
+    def _print_telemetry_summary(self, telemetry):
+        summary = self.configurator.summarize_telemetry(telemetry)
+        if not summary:
+            return
+        print(f"[Pushover] Telemetría: {len(telemetry['algorithm'])} pasos, {sum(telemetry['fallbacks'])} fallbacks")
+        for algo, entry in sorted(summary.items(), key=lambda kv: -kv[1]["wall_time"]):
+            print(f"   - {algo}: {entry['steps']} pasos, {entry['iterations']} iteraciones, {entry['wall_time']:.3f} s")
+
 
     def _merge_results(self, consolidated: dict, new_res: dict, cycle_idx: int):
         """Helper para unir los resultados de una ronda adaptativa a la historia global"""
         consolidated["roof_disp"].extend(new_res["roof_disp"])
         consolidated["base_shear"].extend(new_res["base_shear"])
-        consolidated.setdefault("node_displacements",[]).extend(new_res.get("node_displacements",[]))
+        if "node_displacements" in consolidated:
+            consolidated["node_displacements"].extend(new_res.get("node_displacements"))
+        if "telemetry" in consolidated and "telemetry" in new_res:
+            for key, values in new_res["telemetry"].items():
+                consolidated["telemetry"][key].extend(values)
 
         count = len(new_res["roof_disp"])
         consolidated["cycle_id"].extend([cycle_idx] * count)
@@ -291,7 +695,7 @@ class PushoverSolver:
             if y in consolidated["failed_floors"]:
                 continue
             if y not in consolidated["floors"]:
-                consolidated["floors"][y] = {"disp":[], "shear": [], "H": data.get("H",0.0)}
+                consolidated["floors"][y] = {"disp": self._series(), "shear": self._series(), "H": data.get("H",0.0)}
 
             consolidated["floors"][y]["disp"].extend(data["disp"])
             consolidated["floors"][y]["shear"].extend(data["shear"]) 
@@ -334,95 +738,158 @@ class PushoverSolver:
         Análisis Pushover secuancial
         Corre Pushover iterativamente delegando la matemática; cuando un planta colapsa, la congela y reinicia.
         """
-        MAX_ROUND = len(self.manager.get_floor_data())
-        disp_per_round = max_disp
-
-        #1. Preparar el FailureDetector
-        kwargs = {}
-        if sensitivity is not None: kwargs['sensitivity'] = sensitivity/100.0
-
-        if max_drift is not None: kwargs['max_drift'] = max_drift/100.0
+        params = dict(control_node_tag=control_node_tag, max_disp=max_disp, steps=steps,
+                      load_pattern_type=load_pattern_type, sensitivity=sensitivity,
+                      freeze_method=freeze_method, max_drift=max_drift)
 
-        self.failure_detector = FailureDetector(**kwargs)
-        
         self._initialize_supports()
         self._setup_recorders()
+        self._begin_checkpointing("adaptive", params)
+        if self.results_stream is not None:
+            self.results_stream.begin_run()
 
-        #2. Diccionario consolidado 
+        #1. Diccionario consolidado 
         consolidated = {
-            "roof_disp": [], "base_shear": [], "steps": [],
-            "cycle_id": [], "node_displacements": [], "floors": {}, "failed_floors": []
+            "roof_disp": self._series(), "base_shear": self._series(), "steps": self._series(np.int64),
+            "cycle_id": self._series(np.int64), "node_displacements": self._new_node_history(), "floors": {},
+            "failed_floors": [], "telemetry": self._new_telemetry()
         }
 
-        frozen_floors = set()
-        print(f"[Adaptative] Iniciando Pushover Adaptativo ({MAX_ROUND} posibles fallos, Dmax={max_disp})")
+        print(f"[Adaptative] Iniciando Pushover Adaptativo ({len(self.manager.get_floor_data())} posibles fallos, Dmax={max_disp})")
 
         # Novedad: Precalcular y congelar la distribución de carga original
         print(f"[Adaptive] Precalculando patrón modal original ({load_pattern_type}) intacto.")
         result_pattern = self.load_generator.generate_pattern(pattern_type=load_pattern_type)
         base_force_vector = result_pattern.force_vector
 
-        # --- BUCLE DE RONDAS ADAPTATIVAS ---
-        for round_idx in range(MAX_ROUND):
-            print(f"\n[Adaptive] --- Ronda {round_idx + 1}")
+        return self._run_adaptive_rounds(params, consolidated, base_force_vector, frozen_floors=set())
 
-            if round_idx > 0:
-                self.builder.log_command('loadConst', '-time', 0.0)
+    def _run_adaptive_rounds(self, params, consolidated, base_force_vector, frozen_floors, start_round=0, pending_failures=None, resume=None):
+        """
+        Bucle de rondas del Pushover adaptativo, desde 'start_round'.
+        'pending_failures' (plantas falladas aún sin congelar) y 'resume' (ronda a medias) vienen de un checkpoint.
+        """
+        MAX_ROUND = len(self.manager.get_floor_data())
+        disp_per_round = params["max_disp"]
+        freeze_method = params["freeze_method"]
 
-            current_pattern_tag = 200 + round_idx
-            
-            # Pasamos el cycle_idx actual al solver a través de un flag temporal para usarlo en el CSV
-            self._current_cycle_idx = round_idx
-            
-            # 3. Correr un Pushover Estándar (Delegar el Empuje)
-            round_results = self.run_pushover(
-                control_node_tag=control_node_tag, 
-                max_disp=disp_per_round, 
-                n_steps=steps, 
-                load_pattern_type=load_pattern_type,
-                failure_detector=self.failure_detector,
-                frozen_floors=frozen_floors, pattern_tag=current_pattern_tag,
-                precalc_vector=base_force_vector,
-                setup_recorders=False  # Los recorders ya están configurados antes del bucle
-            )
+        #2. Preparar el FailureDetector
+        kwargs = {}
+        if params["sensitivity"] is not None: kwargs['sensitivity'] = params["sensitivity"]/100.0
 
-            #4. Fusión de Datos
-            self._merge_results(consolidated, round_results, round_idx)
+        if params["max_drift"] is not None: kwargs['max_drift'] = params["max_drift"]/100.0
 
-            #5. Evaluar Fallos
-            nuevos_fallos = [f.y_level for f in self.failure_detector.analyze(consolidated) if f.y_level not in frozen_floors]
+        self.failure_detector = FailureDetector(**kwargs)
 
-            if not nuevos_fallos:
-                nuevos_fallos = [f.y_level for f in self.failure_detector.analyze(consolidated) if f.y_level not in frozen_floors]
-                break
+        # Los parciales de progreso se construyen sobre la historia consolidada
+        self._cancel_requested = False
+        self._consolidated = consolidated
+
+        if self._run_state is not None:
+            self._run_state["frozen_floors"] = frozen_floors
+            self._run_state["base_force_vector"] = {int(tag): float(f) for tag, f in base_force_vector.items()}
 
-            #6. Congelar la planta
-            sorted_ys = sorted(self.manager.get_floor_data().keys())
+        # try/finally: si una ronda falla, el solver no puede quedarse en modo adaptativo
+        # (diario grabando, historia consolidada colgada) para el siguiente análisis
+        try:
+            # Reanudación desde el final de una ronda: congelar lo pendiente y pasar a la siguiente
+            if pending_failures:
+                collapse = self._freeze_failed_floors(consolidated, pending_failures, frozen_floors, freeze_method)
+                start_round = MAX_ROUND if collapse else start_round + 1
+
+            # --- BUCLE DE RONDAS ADAPTATIVAS ---
+            for round_idx in range(start_round, MAX_ROUND):
+                print(f"\n[Adaptive] --- Ronda {round_idx + 1}")
+
+                round_resume = resume if round_idx == start_round else None
+                if round_idx > 0 and round_resume is None:
+                    self.builder.log_command('loadConst', '-time', 0.0)
+
+                current_pattern_tag = 200 + round_idx
             
-            for y_fail in nuevos_fallos:
-                idx = sorted_ys.index(y_fail)
-                print(f"[Adaptive] ⚠️ Fallo detectado en piso {idx} cota Y={y_fail}. Aplicando Freeze='{freeze_method}'")
+                # Pasamos el cycle_idx actual al solver a través de un flag temporal para usarlo en el CSV
+                self._current_cycle_idx = round_idx
+                if self._run_state is not None:
+                    self._run_state["round"] = round_idx
+            
+                # 3. Correr un Pushover Estándar (Delegar el Empuje)
+                round_results = self.run_pushover(
+                    control_node_tag=params["control_node_tag"], 
+                    max_disp=disp_per_round, 
+                    n_steps=params["steps"], 
+                    load_pattern_type=params["load_pattern_type"],
+                    failure_detector=self.failure_detector,
+                    frozen_floors=frozen_floors, pattern_tag=current_pattern_tag,
+                    precalc_vector=base_force_vector,
+                    setup_recorders=False,  # Los recorders ya están configurados antes del bucle
+                    resume=round_resume
+                )
+
+                #4. Fusión de Datos
+                self._merge_results(consolidated, round_results, round_idx)
+                if self.results_stream is not None:
+                    # La ronda ya vive en la historia consolidada: sus bloques temporales sobran
+                    ResultsStream.discard(round_results)
+
+                if round_results.get("cancelled"):
+                    consolidated["cancelled"] = True
+                    print("[Adaptive] ⏹ Análisis cancelado. Se conservan las rondas completadas.")
+                    break
 
-                # REFACTOR SRP: Extraermos el estacio espacial de los nodos
-                deformed_state = self._get_deformed_floor_state(y_fail)
+                #5. Evaluar Fallos
+                nuevos_fallos = [f.y_level for f in self.failure_detector.analyze(consolidated) if f.y_level not in frozen_floors]
 
+                if not nuevos_fallos:
+                    nuevos_fallos = [f.y_level for f in self.failure_detector.analyze(consolidated) if f.y_level not in frozen_floors]
+                    break
 
-                # Recibimos los tags de los fantasmas recién anclados a la pared!
-                new_ghosts = self.builder.freeze_floor(deformed_state, freeze_method)
-                
-                # Actualizamos nuestra memoria global de apoyos activos
-                self.active_support_nodes.extend(new_ghosts)
-                
-                frozen_floors.add(y_fail)
-                consolidated["failed_floors"].append(y_fail)
-
-            # Check fatal: Si el fallo incluyó el techo supremo, la estructura es irreparable.
-            if sorted_ys[-1] in nuevos_fallos:
-                 print("[Adaptive] La última planta estructural ha fallado rotundo. Colapso Total.")
-                 break
-                 
-        ops.remove('recorders')
+                # Checkpoint de fin de ronda: antes de congelar, para poder ramificar con otro método
+                if self._run_state is not None and self.checkpoints.at_round_end:
+                    path = self._write_checkpoint("round_end", step=len(consolidated["steps"]),
+                                                  pending_failures=[float(y) for y in nuevos_fallos])
+                    if self.checkpoints.stop_at_round_end:
+                        consolidated["branch_checkpoint"] = path
+                        print("[Adaptive] Análisis detenido en el punto de ramificación (antes de congelar).")
+                        break
+
+                #6. Congelar la planta
+                if self._freeze_failed_floors(consolidated, nuevos_fallos, frozen_floors, freeze_method):
+                    break
+        finally:
+            ops.remove('recorders')
+            self._consolidated = None
+            self._end_checkpointing()
+
+        self._close_results_stream(consolidated)
+        self.builder.command_log.flush()
         print("[Adaptive] Análisis Finalizado Exitosamente.")
 
 
-        return consolidated                
\ No newline at end of file
+        return consolidated
+
+    def _freeze_failed_floors(self, consolidated, nuevos_fallos, frozen_floors, freeze_method) -> bool:
+        """Congela las plantas falladas. Devuelve True si el fallo incluye la última planta (colapso total)."""
+        sorted_ys = sorted(self.manager.get_floor_data().keys())
+        
+        for y_fail in nuevos_fallos:
+            idx = sorted_ys.index(y_fail)
+            print(f"[Adaptive] ⚠️ Fallo detectado en piso {idx} cota Y={y_fail}. Aplicando Freeze='{freeze_method}'")
+
+            # REFACTOR SRP: Extraermos el estacio espacial de los nodos
+            deformed_state = self._get_deformed_floor_state(y_fail)
+
+
+            # Recibimos los tags de los fantasmas recién anclados a la pared!
+            new_ghosts = self.builder.freeze_floor(deformed_state, freeze_method)
+            
+            # Actualizamos nuestra memoria global de apoyos activos
+            self.active_support_nodes.extend(new_ghosts)
+            
+            frozen_floors.add(y_fail)
+            consolidated["failed_floors"].append(y_fail)
+
+        # Check fatal: Si el fallo incluyó el techo supremo, la estructura es irreparable.
+        if sorted_ys[-1] in nuevos_fallos:
+             print("[Adaptive] La última planta estructural ha fallado rotundo. Colapso Total.")
+             return True
+        return False
@@ -0,0 +1,127 @@
+import os
+import numpy as np
+import openseespy.opensees as ops
+from typing import Dict, List
+
+
+def read_binary_recorder(path: str, n_cols: int) -> np.ndarray:
+    """
+    Lee de una vez un fichero '-binary' de OpenSees.
+    Cada fila son n_cols doubles nativos seguidos de un salto de línea ('\\n').
+    """
+    if n_cols <= 0 or not os.path.exists(path):
+        return np.zeros((0, max(n_cols, 0)))
+
+    row_type = np.dtype([('values', np.float64, (n_cols,)), ('eol', np.uint8)])
+    n_rows = os.path.getsize(path) // row_type.itemsize
+    raw = np.fromfile(path, dtype=row_type, count=n_rows)
+    return raw['values']
+
+
+class RecorderCapture:
+    """
+    Captura masiva del estado del Pushover mediante recorders binarios de OpenSees.
+    Durante el análisis OpenSees escribe desplazamientos, reacciones y fuerzas de sección;
+    al terminar se cargan en bloque (lectura vectorizada) en el diccionario de resultados.
+    """
+
+    def __init__(self, output_dir: str, run_id, node_tags: List[int], support_tags: List[int], plan):
+        self.output_dir = output_dir
+        self.node_tags = list(node_tags)
+        self.support_tags = list(support_tags)
+        self.plan = plan
+        self._recorder_tags = []
+
+        self.disp_file = os.path.join(output_dir, f"capture_{run_id}_disp.bin")
+        self.reaction_file = os.path.join(output_dir, f"capture_{run_id}_reaction.bin")
+
+        # Las columnas se agrupan por índice de sección: un recorder por grupo
+        self.section_groups: Dict[int, List[int]] = {}
+        for k, (_, sec_idx, _) in enumerate(plan.columns):
+            self.section_groups.setdefault(sec_idx, []).append(k)
+        self.section_files = {
+            sec_idx: os.path.join(output_dir, f"capture_{run_id}_sec{sec_idx}.bin")
+            for sec_idx in self.section_groups
+        }
+
+    def start(self):
+        """Registra los recorders binarios en el dominio actual."""
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+
+        self._recorder_tags.append(ops.recorder('Node', '-binary', self.disp_file,
+                                                '-node', *self.node_tags, '-dof', 1, 2, 3, 'disp'))
+        if self.support_tags:
+            self._recorder_tags.append(ops.recorder('Node', '-binary', self.reaction_file,
+                                                    '-node', *self.support_tags, '-dof', 1, 2, 3, 'reaction'))
+
+        for sec_idx, col_ks in self.section_groups.items():
+            col_tags = [self.plan.columns[k][0] for k in col_ks]
+            self._recorder_tags.append(ops.recorder('Element', '-binary', self.section_files[sec_idx],
+                                                    '-ele', *col_tags, 'section', sec_idx, 'force'))
+
+    def stop(self):
+        """Elimina los recorders propios (cierra y vuelca los ficheros), sin tocar los del usuario."""
+        for tag in self._recorder_tags:
+            try:
+                ops.remove('recorder', tag)
+            except Exception:
+                pass
+        self._recorder_tags = []
+
+    def load_into(self, results: dict, control_node_tag: int, capture_floors: bool = True, reaction_log=None, cycle_idx: int = 0):
+        """Lee todos los ficheros de una vez y rellena el diccionario de resultados."""
+        self.stop()
+
+        n_nodes = len(self.node_tags)
+        disps = read_binary_recorder(self.disp_file, 3 * n_nodes).reshape(-1, n_nodes, 3)
+        n_steps = min(len(disps), len(results["steps"]))
+        disps = disps[:n_steps]
+
+        # 1. Historia cinemática completa en el almacén columnar
+        store = results["node_displacements"]
+        store.extend_array(disps)
+        col_of = store.index
+
+        # 2. Globales: desplazamiento de control y cortante basal (suma de Rx invertida)
+        results["roof_disp"].extend(disps[:, col_of[control_node_tag], 0].tolist())
+
+        n_sup = len(self.support_tags)
+        if n_sup:
+            reacs = read_binary_recorder(self.reaction_file, 3 * n_sup).reshape(-1, n_sup, 3)[:n_steps]
+            base_shear = -reacs[:, :, 0].sum(axis=1)
+            if reaction_log is not None:
+                for step, step_reacs in zip(results["steps"], reacs):
+                    for b_node, r in zip(self.support_tags, step_reacs):
+                        reaction_log.write(cycle_idx, step, b_node, r.tolist())
+        else:
+            base_shear = np.zeros(n_steps)
+        results["base_shear"].extend(base_shear.tolist())
+
+        # 3. Plantas: cortante por columnas acumulado por planta + deriva de la columna representante
+        if capture_floors and self.plan.floor_ys:
+            col_shear = np.zeros((n_steps, len(self.plan.columns)))
+            for sec_idx, col_ks in self.section_groups.items():
+                # Cada columna aporta sus componentes de sección (P, Mz, Vy) en bloque
+                forces = read_binary_recorder(self.section_files[sec_idx], 3 * len(col_ks))[:n_steps]
+                col_shear[:len(forces), col_ks] = forces.reshape(len(forces), len(col_ks), 3)[:, :, 2]
+
+            floor_shear = np.zeros((n_steps, len(self.plan.floor_ys)))
+            np.add.at(floor_shear.T, self.plan.col_floor_idx, col_shear.T)
+
+            for floor_idx, y in enumerate(self.plan.floor_ys):
+                top_tag, bot_tag = self.plan.ref_nodes[floor_idx]
+                drift = disps[:, col_of[top_tag], 0] - disps[:, col_of[bot_tag], 0]
+                floor_res = results["floors"][y]
+                floor_res["disp"].extend(drift.tolist())
+                floor_res["shear"].extend(floor_shear[:, floor_idx].tolist())
+                floor_res["H"] = self.plan.heights[floor_idx]
+
+        self._cleanup()
+
+    def _cleanup(self):
+        for path in [self.disp_file, self.reaction_file, *self.section_files.values()]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
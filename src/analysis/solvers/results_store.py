@@ -0,0 +1,130 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+
+class StepDisplacements:
+    """
+    Vista de solo lectura sobre un paso de la historia de desplazamientos.
+    Se comporta como el antiguo diccionario {tag: [dx, dy, rz]} pero sin copiar datos.
+    """
+    __slots__ = ['data', 'index']
+
+    def __init__(self, data: np.ndarray, index: Dict[int, int]):
+        self.data = data        # Array (n_nodos x 3) -> vista sobre el almacén
+        self.index = index      # Mapa tag -> columna
+
+    def get(self, tag, default=None):
+        col = self.index.get(tag)
+        if col is None:
+            return default
+        return self.data[col]
+
+    def __getitem__(self, tag):
+        return self.data[self.index[tag]]
+
+    def __contains__(self, tag):
+        return tag in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def keys(self):
+        return self.index.keys()
+
+    def items(self):
+        for tag, col in self.index.items():
+            yield tag, self.data[col]
+
+
+class NodeHistoryStore:
+    """
+    Almacén columnar (pasos x nodos x 3) para la historia de desplazamientos nodales del Pushover.
+    Reserva memoria por bloques y crece duplicando capacidad, evitando millones de listas pequeñas.
+    """
+
+    def __init__(self, node_tags: Iterable[int], capacity: int = 256):
+        self.tags: List[int] = list(node_tags)
+        self.index: Dict[int, int] = {tag: col for col, tag in enumerate(self.tags)}
+        self._data = np.zeros((max(capacity, 1), len(self.tags), 3), dtype=np.float64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __getitem__(self, step_idx) -> StepDisplacements:
+        if step_idx < 0:
+            step_idx += self._size
+        if not 0 <= step_idx < self._size:
+            raise IndexError(f"Paso {step_idx} fuera de rango (0-{self._size - 1})")
+        return StepDisplacements(self._data[step_idx], self.index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield StepDisplacements(self._data[i], self.index)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Vista (pasos x nodos x 3) de los pasos ya escritos."""
+        return self._data[:self._size]
+
+    def _reserve(self, n_rows: int):
+        needed = self._size + n_rows
+        capacity = self._data.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        new_data = np.zeros((capacity, len(self.tags), 3), dtype=np.float64)
+        new_data[:self._size] = self._data[:self._size]
+        self._data = new_data
+
+    def new_step(self) -> np.ndarray:
+        """Reserva una fila nueva y devuelve la vista (nodos x 3) para rellenarla in situ."""
+        self._reserve(1)
+        row = self._data[self._size]
+        self._size += 1
+        return row
+
+    def append(self, step_disp):
+        """Añade un paso desde un array (nodos x 3) o un diccionario {tag: [dx, dy, rz]}."""
+        row = self.new_step()
+        if isinstance(step_disp, dict):
+            for tag, disp in step_disp.items():
+                col = self.index.get(tag)
+                if col is not None:
+                    row[col, :len(disp)] = disp[:3]
+        else:
+            row[:] = step_disp
+
+    def extend(self, other: Optional["NodeHistoryStore"]):
+        """Concatena la historia de otro almacén (p.ej. una ronda adaptativa) al final de este."""
+        if not other:
+            return
+        n = len(other)
+        self._reserve(n)
+        if other.tags == self.tags:
+            self._data[self._size:self._size + n] = other.array
+        else:
+            # Los nodos no coinciden: remapear columna a columna por tag
+            block = self._data[self._size:self._size + n]
+            block[:] = 0.0
+            for tag, src_col in other.index.items():
+                dst_col = self.index.get(tag)
+                if dst_col is not None:
+                    block[:, dst_col] = other.array[:, src_col]
+        self._size += n
+
+    def extend_array(self, block: np.ndarray):
+        """Añade en bloque un array (pasos x nodos x 3) con las columnas en el orden de 'tags'."""
+        n = len(block)
+        if n == 0:
+            return
+        self._reserve(n)
+        self._data[self._size:self._size + n] = block
+        self._size += n
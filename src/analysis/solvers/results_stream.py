@@ -0,0 +1,453 @@
+import os
+import json
+import time
+import shutil
+import bisect
+import numpy as np
+from typing import Dict, Iterable, Iterator, List
+
+from src.analysis.solvers.results_store import NodeHistoryStore, StepDisplacements
+
+
+class _ChunkFiles:
+    """Bloques .npy consecutivos de una serie (lectura perezosa con mmap, caché del último bloque)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.names: List[str] = []
+        self.offsets: List[int] = []    # Fila global donde empieza cada bloque
+        self.size = 0
+        self._cached = (None, None)
+
+    def write(self, block: np.ndarray):
+        name = f"{len(self.names):05d}.npy"
+        np.save(os.path.join(self.directory, name), block)
+        self.names.append(name)
+        self.offsets.append(self.size)
+        self.size += len(block)
+
+    def load(self, k: int) -> np.ndarray:
+        if self._cached[0] != k:
+            self._cached = (k, np.load(os.path.join(self.directory, self.names[k]), mmap_mode="r"))
+        return self._cached[1]
+
+    def locate(self, row: int):
+        """(bloque, fila dentro del bloque) de una fila global en disco."""
+        k = bisect.bisect_right(self.offsets, row) - 1
+        return k, row - self.offsets[k]
+
+    def lengths(self) -> List[int]:
+        return [b - a for a, b in zip(self.offsets, self.offsets[1:] + [self.size])]
+
+    def manifest(self) -> dict:
+        return {"chunks": list(self.names), "lengths": self.lengths()}
+
+    @classmethod
+    def from_manifest(cls, directory: str, info: dict) -> "_ChunkFiles":
+        files = cls(directory)
+        for name, length in zip(info["chunks"], info["lengths"]):
+            files.names.append(name)
+            files.offsets.append(files.size)
+            files.size += length
+        return files
+
+
+class ChunkedSeries:
+    """
+    Serie de resultados (un valor por paso) que vive en disco por bloques y solo guarda en memoria la cola.
+    Se usa como la lista a la que sustituye: append/extend, len, índices, cortes e iteración.
+    Cuando la cola supera tail_size + chunk_size, los chunk_size valores más antiguos se vuelcan a disco.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 2000, tail_size: int = 2000, dtype=np.float64):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_size = max(1, chunk_size)
+        self.tail_size = max(0, tail_size)
+        self.dtype = np.dtype(dtype)
+        self._files = _ChunkFiles(directory)
+        self._tail: list = []
+
+    # --- Escritura ---
+    def append(self, value):
+        self._tail.append(value)
+        self._spill()
+
+    def extend(self, values):
+        if isinstance(values, ChunkedSeries):
+            for block in values.iter_blocks():
+                self._tail.extend(block.tolist())
+                self._spill()
+        else:
+            self._tail.extend(values)
+            self._spill()
+
+    def _spill(self):
+        while len(self._tail) >= self.chunk_size + self.tail_size:
+            self._files.write(np.asarray(self._tail[:self.chunk_size], dtype=self.dtype))
+            del self._tail[:self.chunk_size]
+
+    def flush(self):
+        """Vuelca también la cola (al cerrar la ejecución)."""
+        if self._tail:
+            self._files.write(np.asarray(self._tail, dtype=self.dtype))
+            self._tail = []
+
+    def discard(self):
+        """Borra los bloques de disco (series temporales, p.ej. una ronda ya fusionada)."""
+        self._tail = []
+        self._files = _ChunkFiles(self.directory)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --- Lectura ---
+    def __len__(self):
+        return self._files.size + len(self._tail)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, key):
+        n = len(self)
+        if isinstance(key, slice):
+            start, stop, step = key.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._read_range(start, stop).tolist()
+
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError(f"Paso {key} fuera de rango (0-{n - 1})")
+        disk = self._files.size
+        if key >= disk:
+            return self._tail[key - disk]
+        k, row = self._files.locate(key)
+        return self._files.load(k)[row].item()
+
+    def _read_range(self, start: int, stop: int) -> np.ndarray:
+        if stop <= start:
+            return np.empty(0, dtype=self.dtype)
+        parts = []
+        disk = self._files.size
+        if start < disk:
+            k, row = self._files.locate(start)
+            pos = start
+            while pos < min(stop, disk):
+                block = self._files.load(k)
+                take = min(len(block) - row, min(stop, disk) - pos)
+                parts.append(np.asarray(block[row:row + take]))
+                pos += take
+                k, row = k + 1, 0
+        if stop > disk:
+            parts.append(np.asarray(self._tail[max(start - disk, 0):stop - disk], dtype=self.dtype))
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+    def iter_blocks(self) -> Iterator[np.ndarray]:
+        """Recorre la serie por bloques (arrays), sin cargarla entera."""
+        for k in range(len(self._files.names)):
+            yield self._files.load(k)
+        if self._tail:
+            yield np.asarray(self._tail, dtype=self.dtype)
+
+    def __iter__(self):
+        for block in self.iter_blocks():
+            yield from block.tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self._read_range(0, len(self))
+        return arr.astype(dtype) if dtype is not None else arr
+
+    def tail(self) -> list:
+        """Valores que siguen en memoria (para el trazado en vivo)."""
+        return list(self._tail)
+
+    def tolist(self) -> list:
+        return self._read_range(0, len(self)).tolist()
+
+    def manifest(self) -> dict:
+        info = self._files.manifest()
+        info["dtype"] = self.dtype.str
+        return info
+
+    @classmethod
+    def open(cls, directory: str, info: dict) -> "ChunkedSeries":
+        series = cls.__new__(cls)
+        series.directory = directory
+        series.chunk_size = max(info["lengths"] or [1])
+        series.tail_size = 0
+        series.dtype = np.dtype(info["dtype"])
+        series._files = _ChunkFiles.from_manifest(directory, info)
+        series._tail = []
+        return series
+
+
+class ChunkedNodeHistory:
+    """
+    Versión por bloques en disco de NodeHistoryStore (pasos x nodos x 3).
+    La cola vive en un NodeHistoryStore; leer un paso solo carga (mmap) el bloque que lo contiene.
+    """
+
+    def __init__(self, directory: str, node_tags: Iterable[int], chunk_size: int = 2000, tail_size: int = 2000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.tags: List[int] = list(node_tags)
+        self.index: Dict[int, int] = {tag: col for col, tag in enumerate(self.tags)}
+        self.chunk_size = max(1, chunk_size)
+        self.tail_size = max(0, tail_size)
+        self._files = _ChunkFiles(directory)
+        self._tail = NodeHistoryStore(self.tags, capacity=self.chunk_size + self.tail_size)
+
+    # --- Escritura (misma API que NodeHistoryStore) ---
+    def _spill(self):
+        while len(self._tail) >= self.chunk_size + self.tail_size:
+            data = self._tail.array
+            self._files.write(np.ascontiguousarray(data[:self.chunk_size]))
+            rest = data[self.chunk_size:].copy()
+            self._tail = NodeHistoryStore(self.tags, capacity=self.chunk_size + self.tail_size)
+            self._tail.extend_array(rest)
+
+    def new_step(self) -> np.ndarray:
+        # Volcar antes de reservar: la fila devuelta se rellena después in situ
+        self._spill()
+        return self._tail.new_step()
+
+    def append(self, step_disp):
+        self._spill()
+        self._tail.append(step_disp)
+
+    def extend_array(self, block: np.ndarray):
+        self._tail.extend_array(block)
+        self._spill()
+
+    def extend(self, other):
+        if not other:
+            return
+        blocks = other.iter_blocks() if isinstance(other, ChunkedNodeHistory) else [other.array]
+        for block in blocks:
+            if other.tags != self.tags:
+                # Los nodos no coinciden: remapear columna a columna por tag
+                remapped = np.zeros((len(block), len(self.tags), 3))
+                for tag, src_col in other.index.items():
+                    dst_col = self.index.get(tag)
+                    if dst_col is not None:
+                        remapped[:, dst_col] = block[:, src_col]
+                block = remapped
+            self.extend_array(np.asarray(block))
+
+    def flush(self):
+        if self._tail:
+            self._files.write(np.ascontiguousarray(self._tail.array))
+            self._tail = NodeHistoryStore(self.tags, capacity=self.chunk_size + self.tail_size)
+
+    def discard(self):
+        self._files = _ChunkFiles(self.directory)
+        self._tail = NodeHistoryStore(self.tags, capacity=1)
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --- Lectura ---
+    def __len__(self):
+        return self._files.size + len(self._tail)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, step_idx) -> StepDisplacements:
+        n = len(self)
+        if step_idx < 0:
+            step_idx += n
+        if not 0 <= step_idx < n:
+            raise IndexError(f"Paso {step_idx} fuera de rango (0-{n - 1})")
+        disk = self._files.size
+        if step_idx >= disk:
+            return self._tail[step_idx - disk]
+        k, row = self._files.locate(step_idx)
+        return StepDisplacements(self._files.load(k)[row], self.index)
+
+    def __iter__(self):
+        for block in self.iter_blocks():
+            for row in block:
+                yield StepDisplacements(row, self.index)
+
+    def iter_blocks(self) -> Iterator[np.ndarray]:
+        for k in range(len(self._files.names)):
+            yield self._files.load(k)
+        if self._tail:
+            yield self._tail.array
+
+    @property
+    def array(self) -> np.ndarray:
+        """Historia completa en memoria (pasos x nodos x 3). Evitar en análisis muy largos."""
+        blocks = [np.asarray(b) for b in self.iter_blocks()]
+        if not blocks:
+            return np.zeros((0, len(self.tags), 3))
+        return np.concatenate(blocks)
+
+    def manifest(self) -> dict:
+        info = self._files.manifest()
+        info["tags"] = list(self.tags)
+        return info
+
+    @classmethod
+    def open(cls, directory: str, info: dict) -> "ChunkedNodeHistory":
+        history = cls.__new__(cls)
+        history.directory = directory
+        history.tags = list(info["tags"])
+        history.index = {tag: col for col, tag in enumerate(history.tags)}
+        history.chunk_size = max(info["lengths"] or [1])
+        history.tail_size = 0
+        history._files = _ChunkFiles.from_manifest(directory, info)
+        history._tail = NodeHistoryStore(history.tags, capacity=1)
+        return history
+
+
+class ResultsStream:
+    """
+    Fábrica de series por bloques para una ejecución del Pushover.
+    Cada serie tiene su carpeta dentro de la de la ejecución; close() vuelca las colas
+    y escribe manifest.json, de modo que open_streamed_results() puede reabrir los resultados.
+    """
+
+    SERIES_DTYPES = {"roof_disp": np.float64, "base_shear": np.float64, "steps": np.int64, "cycle_id": np.int64}
+    TELEMETRY_DTYPES = {"algorithm": "<U40", "iterations": np.int64, "wall_time": np.float64,
+                        "fallbacks": np.int64, "incr": np.float64}
+
+    def __init__(self, directory: str, chunk_size: int = 2000, tail_size: int = 2000):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.tail_size = tail_size
+        self.run_dir = None
+        self._seq = 0
+
+    def begin_run(self) -> str:
+        self.run_dir = os.path.join(self.directory, time.strftime("run_%Y%m%d_%H%M%S") + f"_{os.getpid()}")
+        suffix = 1
+        while os.path.exists(self.run_dir):
+            suffix += 1
+            self.run_dir = os.path.join(self.directory, time.strftime("run_%Y%m%d_%H%M%S") + f"_{os.getpid()}_{suffix}")
+        self._seq = 0
+        return self.run_dir
+
+    def _next_dir(self) -> str:
+        if self.run_dir is None:
+            self.begin_run()
+        self._seq += 1
+        return os.path.join(self.run_dir, f"s{self._seq:04d}")
+
+    def series(self, dtype=np.float64) -> ChunkedSeries:
+        return ChunkedSeries(self._next_dir(), self.chunk_size, self.tail_size, dtype=dtype)
+
+    def node_history(self, node_tags) -> ChunkedNodeHistory:
+        return ChunkedNodeHistory(self._next_dir(), node_tags, self.chunk_size, self.tail_size)
+
+    def telemetry(self) -> dict:
+        return {key: self.series(dtype) for key, dtype in self.TELEMETRY_DTYPES.items()}
+
+    def adopt(self, results: dict) -> dict:
+        """Copia en series por bloques un diccionario de resultados en listas (p.ej. cargado de un checkpoint)."""
+        streamed = dict(results)
+        for key, dtype in self.SERIES_DTYPES.items():
+            if key in results:
+                streamed[key] = self.series(dtype)
+                streamed[key].extend(results[key])
+        store = results.get("node_displacements")
+        if store is not None:
+            streamed["node_displacements"] = self.node_history(store.tags)
+            streamed["node_displacements"].extend(store)
+        streamed["floors"] = {}
+        for y, data in results.get("floors", {}).items():
+            streamed["floors"][y] = {"disp": self.series(), "shear": self.series(), "H": data.get("H", 0.0)}
+            streamed["floors"][y]["disp"].extend(data["disp"])
+            streamed["floors"][y]["shear"].extend(data["shear"])
+        if "telemetry" in results:
+            streamed["telemetry"] = self.telemetry()
+            for key, values in results["telemetry"].items():
+                streamed["telemetry"][key].extend(values)
+        return streamed
+
+    @staticmethod
+    def discard(results: dict):
+        """Borra del disco las series de un diccionario de resultados (p.ej. una ronda ya fusionada)."""
+        for value in _iter_series(results):
+            value.discard()
+
+    def close(self, results: dict) -> str:
+        """Vuelca las colas y escribe el manifiesto de 'results'. Devuelve la carpeta de la ejecución."""
+        run_dir = self.run_dir or self.begin_run()
+        os.makedirs(run_dir, exist_ok=True)
+        manifest = {"series": {}, "floors": [], "telemetry": {}, "extra": {}}
+
+        def entry(series):
+            series.flush()
+            info = series.manifest()
+            info["dir"] = os.path.relpath(series.directory, run_dir)
+            return info
+
+        for key, value in results.items():
+            if isinstance(value, (ChunkedSeries, ChunkedNodeHistory)):
+                manifest["series"][key] = entry(value)
+            elif key == "floors":
+                for y, data in value.items():
+                    if isinstance(data["disp"], ChunkedSeries):
+                        manifest["floors"].append({"y": y, "H": data.get("H", 0.0),
+                                                   "disp": entry(data["disp"]), "shear": entry(data["shear"])})
+            elif key == "telemetry":
+                manifest["telemetry"] = {k: entry(s) for k, s in value.items() if isinstance(s, ChunkedSeries)}
+            else:
+                manifest["extra"][key] = value
+
+        with open(os.path.join(run_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        return run_dir
+
+
+def _iter_series(results: dict):
+    for key, value in results.items():
+        if isinstance(value, (ChunkedSeries, ChunkedNodeHistory)):
+            yield value
+        elif key == "floors":
+            for data in value.values():
+                for s in (data["disp"], data["shear"]):
+                    if isinstance(s, ChunkedSeries):
+                        yield s
+        elif key == "telemetry":
+            for s in value.values():
+                if isinstance(s, ChunkedSeries):
+                    yield s
+
+
+def open_streamed_results(run_dir: str) -> dict:
+    """Reabre (de forma perezosa) unos resultados escritos por ResultsStream.close()."""
+    with open(os.path.join(run_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    results = dict(manifest["extra"])
+    for key, info in manifest["series"].items():
+        directory = os.path.join(run_dir, info["dir"])
+        results[key] = ChunkedNodeHistory.open(directory, info) if "tags" in info else ChunkedSeries.open(directory, info)
+
+    results["floors"] = {
+        f["y"]: {"disp": ChunkedSeries.open(os.path.join(run_dir, f["disp"]["dir"]), f["disp"]),
+                 "shear": ChunkedSeries.open(os.path.join(run_dir, f["shear"]["dir"]), f["shear"]),
+                 "H": f["H"]}
+        for f in manifest["floors"]
+    }
+    if manifest["telemetry"]:
+        results["telemetry"] = {k: ChunkedSeries.open(os.path.join(run_dir, info["dir"]), info)
+                                for k, info in manifest["telemetry"].items()}
+    results["stream_dir"] = run_dir
+    return results
+
+
+def tail_view(results: dict) -> dict:
+    """
+    Copia ligera (listas, sin historia nodal) de un diccionario de resultados.
+    De las series por bloques solo se toma la cola en memoria: es lo que se traza en vivo.
+    """
+    def values(seq):
+        return seq.tail() if isinstance(seq, ChunkedSeries) else list(seq)
+
+    view = {key: values(results[key]) for key in ("roof_disp", "base_shear", "steps", "cycle_id", "failed_floors")
+            if key in results}
+    view["floors"] = {y: {"disp": values(d["disp"]), "shear": values(d["shear"]), "H": d.get("H", 0.0)}
+                      for y, d in results.get("floors", {}).items()}
+    return view
@@ -178,18 +178,20 @@ class ElementLoadsDialog(QDialog):
         wy = self.wy_input.get_value_base()
 
         count = 0
-        for el_tag in target_ids:
-            # Verificar que el elemento existe
-            if not self.manager.get_element(el_tag):
-                continue
-
-            self._remove_load_for_element(el_tag)
-
-            # Crear nueva Carga
-            new_tag = self.manager.get_next_load_tag()
-            load = ElementLoad(new_tag, el_tag, wx, wy)
-            self.manager.add_load(load)
-            count += 1
+        # Una sola transacción: un único dataChanged para todas las cargas
+        with self.manager.batch():
+            for el_tag in target_ids:
+                # Verificar que el elemento existe
+                if not self.manager.get_element(el_tag):
+                    continue
+
+                self._remove_load_for_element(el_tag)
+
+                # Crear nueva Carga
+                new_tag = self.manager.get_next_load_tag()
+                load = ElementLoad(new_tag, el_tag, wx, wy)
+                self.manager.add_load(load)
+                count += 1
         
         self.populate_elements()
         QMessageBox.information(self, "Éxito", f"Carga aplicada a {count} elementos.")
@@ -205,16 +207,16 @@ class ElementLoadsDialog(QDialog):
         if not target_ids:
             return
 
-        for el_tag in target_ids:
-            self._remove_load_for_element(el_tag)
+        # Una sola transacción: un único dataChanged para todas las cargas
+        with self.manager.batch():
+            for el_tag in target_ids:
+                self._remove_load_for_element(el_tag)
 
         self.populate_elements()
 
     def _remove_load_for_element(self, element_tag):
-        loads = self.manager.get_all_loads() 
-        for load in loads:
-            if isinstance(load, ElementLoad) and load.element_tag == element_tag:
-                self.manager.delete_load(load.tag)
+        for load in self.manager.get_loads_of_element(element_tag):
+            self.manager.delete_load(load.tag)
 
     def on_element_selected(self):
         selected_items = self.element_list.selectedItems()
@@ -224,12 +226,8 @@ class ElementLoadsDialog(QDialog):
         el_tag = item.data(Qt.ItemDataRole.UserRole)
         
         # Buscar Carga
-        loads = self.manager.get_all_loads()
-        found_load = None
-        for load in loads:
-            if isinstance(load, ElementLoad) and load.element_tag == el_tag:
-                found_load = load
-                break
+        loads = self.manager.get_loads_of_element(el_tag)
+        found_load = loads[0] if loads else None
         
         # Actualizar UI
         if found_load:
@@ -111,7 +111,7 @@ class GeometryDialog(QDialog):
 
         #Se lo pasamos al manager para que lo almacene
         manager.add_node(new_node)
-        manager.dataChanged.emit()
+        manager.notify_changed()
 
         #Limpiamos los spinbox
         self.spin_x.set_value_base(0.0)
@@ -144,8 +144,9 @@ class GeometryDialog(QDialog):
         tag_to_delete = item.data(Qt.ItemDataRole.UserRole)
 
         manager = ProjectManager.instance()
-        manager.delete_node(tag_to_delete)
-        manager.dataChanged.emit()
+        # Los elementos conectados y las cargas no pueden quedar huérfanos
+        manager.delete_node(tag_to_delete, cascade=True)
+        manager.notify_changed()
         self.refresh_node_list()
 
     def update_node(self):
@@ -159,9 +160,8 @@ class GeometryDialog(QDialog):
         node = manager.get_node(tag_to_modify)
 
         if node:
-            node.x = self.spin_x.get_value_base()
-            node.y = self.spin_y.get_value_base()
-            manager.dataChanged.emit()
+            manager.update_node(tag_to_modify, x=self.spin_x.get_value_base(), y=self.spin_y.get_value_base())
+            manager.notify_changed()
             self.refresh_node_list()
             
             # Restaurar la selección
@@ -306,7 +306,7 @@ class GeometryDialog(QDialog):
 
         #Pasamos el elementos al manager para que lo guarde
         manager.add_element(new_element)
-        manager.dataChanged.emit()
+        manager.notify_changed()
         self.load_data()
 
     def on_element_selected(self, item):
@@ -334,8 +334,8 @@ class GeometryDialog(QDialog):
         tag_to_delete = item.data(Qt.ItemDataRole.UserRole)
 
         manager = ProjectManager.instance()
-        manager.delete_element(tag_to_delete)
-        manager.dataChanged.emit()
+        manager.delete_element(tag_to_delete, cascade=True)
+        manager.notify_changed()
         self.load_data()
 
     def update_element(self):
@@ -349,17 +349,16 @@ class GeometryDialog(QDialog):
         ele = manager.get_element(tag_to_modify)
 
         if ele:
-            ele.node_i = self.cb_node_i.currentData()
-            ele.node_j = self.cb_node_j.currentData()
-            ele.section_tag = self.cb_section.currentData()
-            ele.transf_tag = self.spin_transf.value()
-            ele.integration_points = self.spin_int_pts.value()
+            changes = dict(node_i=self.cb_node_i.currentData(), node_j=self.cb_node_j.currentData(),
+                           section_tag=self.cb_section.currentData(), transf_tag=self.spin_transf.value(),
+                           integration_points=self.spin_int_pts.value())
 
-            section = manager.get_section(ele.section_tag)
+            section = manager.get_section(changes["section_tag"])
             if section:
-                ele.mass_density = section.get_mass_per_length(manager)
+                changes["mass_density"] = section.get_mass_per_length(manager)
+            manager.update_element(tag_to_modify, **changes)
 
-            manager.dataChanged.emit()
+            manager.notify_changed()
             self.load_data()
             
             # Restaurar la selección
@@ -168,18 +168,20 @@ class NodalLoadsDialog(QDialog):
         mz = self.mz_input.get_value_base()
 
         count = 0
-        for node_tag in target_ids:
-            if not self.manager.get_node(node_tag):
-                continue
+        # Una sola transacción: un único dataChanged para todas las cargas
+        with self.manager.batch():
+            for node_tag in target_ids:
+                if not self.manager.get_node(node_tag):
+                    continue
             
-            # Quitar carga previa
-            self._remove_load_for_node(node_tag)
-
-            # Nueva carga
-            new_tag = self.manager.get_next_load_tag()
-            load = NodalLoad(new_tag, node_tag, fx, fy, mz)
-            self.manager.add_load(load)
-            count += 1
+                # Quitar carga previa
+                self._remove_load_for_node(node_tag)
+
+                # Nueva carga
+                new_tag = self.manager.get_next_load_tag()
+                load = NodalLoad(new_tag, node_tag, fx, fy, mz)
+                self.manager.add_load(load)
+                count += 1
         self.populate_nodes()
         print(f"fx:{fx}, fy:{fy}, mz:{mz}")
         QMessageBox.information(self, "Éxito", f"Carga aplicada a {count} nodos.")
@@ -193,16 +195,16 @@ class NodalLoadsDialog(QDialog):
         
         if not target_ids: return
 
-        for node_tag in target_ids:
-            self._remove_load_for_node(node_tag)
+        # Una sola transacción: un único dataChanged para todas las cargas
+        with self.manager.batch():
+            for node_tag in target_ids:
+                self._remove_load_for_node(node_tag)
         
         self.populate_nodes()
 
     def _remove_load_for_node(self, node_tag):
-        loads = self.manager.get_all_loads()
-        for load in loads:
-            if isinstance(load, NodalLoad) and load.node_tag == node_tag:
-                self.manager.delete_load(load.tag)
+        for load in self.manager.get_loads_of_node(node_tag):
+            self.manager.delete_load(load.tag)
 
     def on_node_selected(self):
         selected_items = self.node_list.selectedItems()
@@ -211,12 +213,8 @@ class NodalLoadsDialog(QDialog):
         item = selected_items[0]
         node_tag = item.data(Qt.ItemDataRole.UserRole)
         
-        loads = self.manager.get_all_loads()
-        found_load = None
-        for load in loads:
-            if isinstance(load, NodalLoad) and load.node_tag == node_tag:
-                found_load = load
-                break
+        loads = self.manager.get_loads_of_node(node_tag)
+        found_load = loads[0] if loads else None
         
         # Actualizar UI
         if found_load:
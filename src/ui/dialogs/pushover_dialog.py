@@ -1,12 +1,20 @@
 from PyQt6.QtWidgets import QSpinBox
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, 
-                             QComboBox, QPushButton, QCheckBox)
+                             QComboBox, QPushButton, QCheckBox, QProgressBar, QLabel, QMessageBox)
+from PyQt6.QtCore import Qt, QThread
 from src.analysis.manager import ProjectManager
+from src.analysis.analysis_cache import AnalysisCache
+from src.analysis.fingerprint import model_fingerprint
+from src.analysis.loads import NodalLoad
+from src.analysis.solvers.checkpoint import PushoverCheckpoint
 from src.ui.widgets.unit_spinbox import UnitSpinBox
 from src.utils.units import UnitManager
 from src.utils.units import UnitType
 
 class PushoverDialog(QDialog):
+    # Espera máxima (ms) a que un análisis remoto atienda la cancelación al cerrar el diálogo
+    STOP_GRACE_MS = 3000
+
     def __init__(self, parent = None):
         super().__init__(parent)
         self.setWindowTitle("Análisis Pushover")
@@ -61,7 +69,7 @@ class PushoverDialog(QDialog):
         form_layout.addRow("Estrategia:", self.chk_adaptive)
 
         # --- Selector de Método de Congelamiento ---
-        from PyQt6.QtWidgets import QHBoxLayout, QLabel
+        from PyQt6.QtWidgets import QHBoxLayout
         freeze_method_layout = QHBoxLayout()
         self.freeze_method_combo = QComboBox()
         self.freeze_method_combo.addItems(["Springs", "Node Fix (Anclaje Rígido)", "Load Pattern (Fuerzas Opuestas)"])
@@ -109,6 +117,61 @@ class PushoverDialog(QDialog):
 
         self.chk_custom_failure.toggled.connect(self.failure_params_group.setVisible)
         
+        # 3.6 Modo de captura de resultados
+        self.chk_recorder_capture = QCheckBox("Captura masiva con recorders binarios de OpenSees")
+        self.chk_recorder_capture.setToolTip("Registra desplazamientos, reacciones y cortantes con recorders y los lee en bloque al final de cada ronda.")
+        form_layout.addRow("Captura:", self.chk_recorder_capture)
+
+        # 3.7 Paso adaptativo
+        self.chk_adaptive_step = QCheckBox("Paso adaptativo (crece en rama elástica, biseca ante fallos)")
+        self.chk_adaptive_step.setToolTip("El número de pasos fija el incremento inicial; el análisis avanza hasta el desplazamiento máximo.")
+        form_layout.addRow("Control de paso:", self.chk_adaptive_step)
+
+        self.spin_incr_min = UnitSpinBox(UnitType.LENGTH)
+        self.spin_incr_min.setDecimals(6)
+        self.spin_incr_min.setRange(0, 100)
+        self.spin_incr_min.set_value_base(1e-5)
+        self.spin_incr_max = UnitSpinBox(UnitType.LENGTH)
+        self.spin_incr_max.setDecimals(6)
+        self.spin_incr_max.setRange(0, 100)
+        self.spin_incr_max.set_value_base(0.005)
+        form_layout.addRow("Incremento mínimo:", self.spin_incr_min)
+        form_layout.addRow("Incremento máximo:", self.spin_incr_max)
+        for w in (self.spin_incr_min, self.spin_incr_max):
+            w.setEnabled(False)
+            self.chk_adaptive_step.toggled.connect(w.setEnabled)
+
+        # 3.8 Checkpoints (permiten reanudar o ramificar el análisis)
+        self.chk_checkpoints = QCheckBox("Guardar checkpoints (fin de ronda con fallo)")
+        self.chk_checkpoints.setToolTip("Guarda en pushover_data/checkpoints el estado necesario para reanudar el análisis.\n"
+                                        "Reanudar vuelve a resolver todos los pasos ya calculados: no ahorra tiempo de cálculo, "
+                                        "permite continuar o ramificar un análisis interrumpido.")
+        form_layout.addRow("Checkpoints:", self.chk_checkpoints)
+
+        self.spin_checkpoint_every = QSpinBox()
+        self.spin_checkpoint_every.setRange(0, 100000)
+        self.spin_checkpoint_every.setSingleStep(100)
+        self.spin_checkpoint_every.setValue(0)
+        self.spin_checkpoint_every.setSpecialValueText("Solo fin de ronda")
+        self.spin_checkpoint_every.setToolTip("Checkpoint adicional cada N pasos (no disponible con captura por recorders).")
+        self.spin_checkpoint_every.setEnabled(False)
+        self.chk_checkpoints.toggled.connect(self.spin_checkpoint_every.setEnabled)
+        form_layout.addRow("Checkpoint cada N pasos:", self.spin_checkpoint_every)
+
+        # 3.9 Resultados en disco (análisis muy largos: la historia no se guarda entera en memoria)
+        self.chk_stream_results = QCheckBox("Guardar historia en disco por bloques")
+        self.chk_stream_results.setToolTip("Escribe los resultados en pushover_data/results a medida que avanza el análisis.")
+        form_layout.addRow("Resultados:", self.chk_stream_results)
+
+        self.spin_tail_steps = QSpinBox()
+        self.spin_tail_steps.setRange(100, 1000000)
+        self.spin_tail_steps.setSingleStep(500)
+        self.spin_tail_steps.setValue(2000)
+        self.spin_tail_steps.setToolTip("Pasos más recientes que se conservan en memoria para la gráfica en vivo.")
+        self.spin_tail_steps.setEnabled(False)
+        self.chk_stream_results.toggled.connect(self.spin_tail_steps.setEnabled)
+        form_layout.addRow("Pasos en memoria:", self.spin_tail_steps)
+
         # 4. Checkbox Ver Cargas
         self.chk_show_loads = QCheckBox("Visualizar distribución de cargas del análisis")
         self.chk_show_loads.setChecked(True) # Activado por defecto
@@ -121,6 +184,30 @@ class PushoverDialog(QDialog):
         self.btn_run.clicked.connect(self.run_pushover)
         layout.addWidget(self.btn_run)
 
+        self.btn_resume = QPushButton("Reanudar desde checkpoint...")
+        self.btn_resume.setToolTip("Continúa un análisis guardado. Con el modo adaptativo marcado se aplica el método de congelamiento elegido.\n"
+                                  "El modelo se reconstruye y se vuelven a resolver todos los pasos hasta el checkpoint.")
+        self.btn_resume.clicked.connect(self.resume_pushover)
+        layout.addWidget(self.btn_resume)
+
+        # Progreso y cancelación (el análisis corre en un hilo aparte)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        self.lbl_progress = QLabel("")
+        layout.addWidget(self.lbl_progress)
+
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.cancel_pushover)
+        layout.addWidget(self.btn_cancel)
+
+        self._thread = None
+        self._worker = None
+        self._results_widget = None
+        self._cache_key = None      # (huella, parámetros) del análisis en curso, para guardarlo en la caché
+
 
 
     def populate_nodes(self):
@@ -132,10 +219,28 @@ class PushoverDialog(QDialog):
             self.combo_node.addItem(f"Nodo {n.tag} (Y={n.y:.2f})", userData=n.tag)
 
     
+    def _selected_freeze_method(self):
+        idx_method = self.freeze_method_combo.currentIndex()
+        if idx_method == 0: return "spring"
+        elif idx_method == 1: return "fix"
+        return "load"
+
+    def _configure_storage(self, translator):
+        if self.chk_checkpoints.isChecked():
+            every = self.spin_checkpoint_every.value() or None
+            directory = translator.enable_checkpoints(every_n_steps=every)
+            print(f"[UI] Checkpoints activados en '{directory}'")
+        if self.chk_stream_results.isChecked():
+            directory = translator.set_results_streaming(True, tail_steps=self.spin_tail_steps.value())
+            print(f"[UI] Resultados por bloques en '{directory}'")
+
     def run_pushover(self):
         from src.analysis.opensees_translator import OpenSeesTranslator
         um = UnitManager.instance()
 
+        if self.is_running():
+            return
+
         #1. Obtenner inputs
         idx = self.combo_node.currentIndex()
         load_pattern_type = self.combo_load_pattern_type.currentText()
@@ -148,62 +253,212 @@ class PushoverDialog(QDialog):
         #2. Instacniar Tranaltor y ejecutar
         translator = OpenSeesTranslator()
 
-        # Reabrir archivo existente para que registre log de pushover
-        try:
-            translator.builder.debug_file = open("model_debug.py", "a", encoding="utf-8")
-            translator.builder.debug_file.write("\n\n# ====== CONFIGURACION DE PUSHOVER ======\n")
-        except Exception as e:
-            print(f"Aviso: No se pudo reabrir model_debug.py ({e})")
+        if self.chk_recorder_capture.isChecked():
+            translator.set_capture_mode("recorder")
+
+        self._configure_storage(translator)
+
+        if self.chk_adaptive_step.isChecked():
+            try:
+                translator.set_adaptive_stepping(self.spin_incr_min.get_value_base(), self.spin_incr_max.get_value_base())
+            except ValueError as e:
+                print(f"Aviso: {e}. Se usará paso fijo.")
 
         print(f"Lanzando Pushover: Node {control_node}, Disp {max_disp}, Pattern {load_pattern_type}")
 
+        adaptive = self.chk_adaptive.isChecked()
+        if adaptive:
+            print("[UI] Ejecutando Pushover Adaptativo (Freeze Forward)...")
+            
+            # Extraer parámetros personalizados si aplica
+            sen = self.spin_sensitivity.value() if self.chk_custom_failure.isChecked() else None
+            drf = self.spin_max_drift.value() if self.chk_custom_failure.isChecked() else None
+            
+            # Extraer método de congelamiento escogido
+            freeze_method = self._selected_freeze_method()
+
+            params = dict(control_node_tag=control_node, max_disp=max_disp, steps=steps, load_pattern_type=load_pattern_type,
+                          sensitivity=sen, freeze_method=freeze_method, max_drift=drf)
+        else:
+            print("[UI] Ejecutando Pushover Monotónico Normal...")
+            params = dict(control_node_tag=control_node, max_disp=max_disp, n_steps=steps, load_pattern_type=load_pattern_type)
+
+        #3. Mismo modelo y mismos parámetros ya analizados: resultados de la caché al instante.
+        # Con checkpoints o historia en disco se ejecuta siempre (el usuario quiere esos ficheros)
+        self._cache_key = None
+        if not (self.chk_checkpoints.isChecked() or self.chk_stream_results.isChecked()):
+            fingerprint = model_fingerprint(self.manager)
+            key_params = dict(params, adaptive=adaptive, settings=translator.pushover_settings())
+            cached = AnalysisCache.instance().get(fingerprint, "pushover", key_params)
+            if cached is not None:
+                print("[Caché] Resultados de Pushover recuperados")
+                self.manager.pushover_loads.clear()
+                self.manager.pushover_loads.extend(NodalLoad.from_dict(d) for d in cached["pushover_loads"])
+                self._on_finished(cached["results"])
+                self.lbl_progress.setText("El modelo no ha cambiado: se muestran los resultados guardados.")
+                return
+            self._cache_key = (fingerprint, key_params)
+
+        #4. Lanzar el worker en un hilo aparte (la UI sigue respondiendo)
+        self._start_worker(translator, params, adaptive=adaptive)
+
+    def resume_pushover(self):
+        """Continúa un análisis desde un checkpoint guardado (elegido como carpeta)."""
+        from PyQt6.QtWidgets import QFileDialog
+        from src.analysis.opensees_translator import OpenSeesTranslator
 
+        if self.is_running():
+            return
 
-        try: 
-            #Ejecutar lógica backend
-            results = None
-            if self.chk_adaptive.isChecked():
-                print("[UI] Ejecutando Pushover Adaptativo (Freeze Forward)...")
-                
-                # Extraer parámetros personalizados si aplica
-                sen = self.spin_sensitivity.value() if self.chk_custom_failure.isChecked() else None
-                drf = self.spin_max_drift.value() if self.chk_custom_failure.isChecked() else None
-                
-                # Extraer método de congelamiento escogido
-                idx_method = self.freeze_method_combo.currentIndex()
-                if idx_method == 0: freeze_method = "spring"
-                elif idx_method == 1: freeze_method = "fix"
-                else: freeze_method = "load"
-                
-                results = translator.run_adaptive_pushover(control_node, max_disp, steps, load_pattern_type, 
-                                                           sensitivity=sen, freeze_method=freeze_method, max_drift = drf)
-            else:
-                print("[UI] Ejecutando Pushover Monotónico Normal...")
-                results = translator.run_pushover_analysis(control_node, max_disp, steps, load_pattern_type)
-
-            if results:
-                # Guardar resultados en el Manager para persistencia
-                self.manager.pushover_results = results
-                
-                # Activar la nueva barra de animación en la ventana principal
-                if hasattr(self.parent(), 'toggle_animation_toolbar'):
-                    self.parent().toggle_animation_toolbar(True)
-                    
-                # Mostrar cargas si se solicitó
-                if hasattr(self.parent(), 'set_pushover_loads_visible'):
-                    self.parent().set_pushover_loads_visible(self.chk_show_loads.isChecked())
-                
-                # Pasamos el diccionario crudo al dialog de resultados para la curva XY
-                from src.ui.dialogs.pushover_result_dialog import PushoverResultsWidget
-                
-                # Pasamos también el estado inicial del checkbox para que el result_dialog arranque sincronizado
-                widget = PushoverResultsWidget(results, self.chk_show_loads.isChecked())
-                if hasattr(self.parent(), 'add_tool_window'):
-                    self.parent().add_tool_window(widget,"Curva de Capacidad (Pushover)")
-
-
-        except Exception as e:
-            print(f"Error crítico en Pushover: {e}")
-            import traceback
-            traceback.print_exc()
+        path = QFileDialog.getExistingDirectory(self, "Seleccionar checkpoint", "pushover_data/checkpoints")
+        if not path:
+            return
 
+        # El checkpoint se reanuda sobre su propio modelo: si el abierto es otro, se carga aquí
+        # (en el hilo de la UI, con confirmación) antes de lanzar el worker
+        try:
+            checkpoint = PushoverCheckpoint.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Checkpoint no válido", f"No se pudo leer el checkpoint:\n{e}")
+            return
+        if not checkpoint.matches_project(self.manager):
+            reply = QMessageBox.question(
+                self, "Reanudar desde checkpoint",
+                "El modelo abierto no coincide con el del checkpoint.\n\n"
+                "Para reanudar se cargará el modelo del checkpoint y se perderán los cambios no guardados "
+                "del proyecto actual. ¿Desea continuar?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            self.manager.load_project_data(checkpoint.project)
+            self.combo_node.clear()
+            self.populate_nodes()
+
+        translator = OpenSeesTranslator()
+        self._configure_storage(translator)
+        self._cache_key = None
+
+        # Ramificar: el método de congelamiento elegido sustituye al del análisis original
+        overrides = {"freeze_method": self._selected_freeze_method()} if self.chk_adaptive.isChecked() else {}
+        print(f"[UI] Reanudando Pushover desde '{path}' {overrides}")
+        self._start_worker(translator, overrides, resume_path=path)
+
+    def _start_worker(self, translator, params, adaptive=False, resume_path=None):
+        from src.ui.workers.pushover_worker import PushoverWorker
+
+        progress_every = max(1, self.spin_steps.value() // 20)
+        self._worker = PushoverWorker(translator, params, adaptive=adaptive, progress_every=progress_every,
+                                      resume_path=resume_path)
+        self._thread = QThread(self)
+        self._worker.moveToThread(self._thread)
+
+        self._thread.started.connect(self._worker.run)
+        self._worker.progress.connect(self._on_progress)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.failed.connect(self._on_failed)
+        # Conexión directa: permite cerrar el hilo aunque la UI esté esperando en wait()
+        self._worker.finished.connect(self._thread.quit, Qt.ConnectionType.DirectConnection)
+        self._worker.failed.connect(self._thread.quit, Qt.ConnectionType.DirectConnection)
+
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_cancel.setVisible(True)
+        self.btn_cancel.setEnabled(True)
+        self.btn_run.setEnabled(False)
+        self.btn_resume.setEnabled(False)
+        self.lbl_progress.setText("Iniciando análisis...")
+
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.isRunning()
+
+    def cancel_pushover(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.lbl_progress.setText("Cancelando al terminar el paso en curso...")
+
+    def _show_results(self, results):
+        """Crea el widget de resultados la primera vez y después solo lo actualiza."""
+        if self._results_widget is not None:
+            self._results_widget.set_results(results)
+            return
+
+        # Pasamos el diccionario crudo al dialog de resultados para la curva XY
+        from src.ui.dialogs.pushover_result_dialog import PushoverResultsWidget
+        
+        # Pasamos también el estado inicial del checkbox para que el result_dialog arranque sincronizado
+        self._results_widget = PushoverResultsWidget(results, self.chk_show_loads.isChecked())
+        if hasattr(self.parent(), 'add_tool_window'):
+            self.parent().add_tool_window(self._results_widget,"Curva de Capacidad (Pushover)")
+
+    def _on_progress(self, partial_results, info):
+        self.progress_bar.setValue(int(100 * min(info["fraction"], 1.0)))
+        self.lbl_progress.setText(f"Ronda {info['round'] + 1} · Paso {info['step']} ({100 * info['fraction']:.0f} %)")
+        self._show_results(partial_results)
+
+    def _on_finished(self, results):
+        self._reset_run_controls()
+
+        if not results:
+            return
+
+        if results.get("cancelled"):
+            self.lbl_progress.setText("Análisis cancelado: se muestran los resultados parciales.")
+        else:
+            self.lbl_progress.setText("Análisis finalizado.")
+
+        # Guardar resultados en el Manager para persistencia
+        self.manager.pushover_results = results
+
+        # Y en la caché de análisis (un resultado parcial no sirve para repetir el análisis)
+        if self._cache_key is not None and not results.get("cancelled"):
+            fingerprint, key_params = self._cache_key
+            AnalysisCache.instance().put(fingerprint, "pushover", key_params, results, self.manager.pushover_loads)
+        self._cache_key = None
+        
+        # Activar la nueva barra de animación en la ventana principal
+        if hasattr(self.parent(), 'toggle_animation_toolbar'):
+            self.parent().toggle_animation_toolbar(True)
+            
+        # Mostrar cargas si se solicitó
+        if hasattr(self.parent(), 'set_pushover_loads_visible'):
+            self.parent().set_pushover_loads_visible(self.chk_show_loads.isChecked())
+
+        self._show_results(results)
+
+    def _on_failed(self, error_trace):
+        self._reset_run_controls()
+        self.lbl_progress.setText("Error crítico en Pushover (ver consola).")
+        print(f"Error crítico en Pushover:\n{error_trace}")
+
+    def _reset_run_controls(self):
+        self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+        self.btn_run.setEnabled(True)
+        self.btn_resume.setEnabled(True)
+
+    def _stop_worker(self):
+        """
+        Cancela un análisis en curso y espera a que el hilo termine.
+        En modo remoto la espera está acotada: si OpenSees no llega al siguiente punto de cancelación
+        (colgado dentro de un paso), se mata su proceso y la petición termina con error.
+        """
+        if not self.is_running():
+            return
+        self._worker.cancel()
+        translator = self._worker.translator
+        if translator.is_remote and not self._thread.wait(self.STOP_GRACE_MS):
+            print("[UI] OpenSees no respondió a la cancelación: se termina el proceso remoto")
+            translator.terminate_worker()
+        self._thread.wait()
+
+    def reject(self):
+        self._stop_worker()
+        super().reject()
+
+    def closeEvent(self, event):
+        self._stop_worker()
+        super().closeEvent(event)
@@ -1,17 +1,31 @@
+import numpy as np
 import pyqtgraph as pg
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QFormLayout, 
                              QComboBox, QPushButton, QLabel, QDialogButtonBox, QSlider, QHBoxLayout, QListWidget, QListWidgetItem)
 from PyQt6.QtCore import Qt
 from src.analysis.manager import ProjectManager
+from src.analysis.solvers.results_stream import ChunkedSeries
 from src.ui.widgets.unit_spinbox import UnitSpinBox
 from src.utils.units import UnitManager
 from src.utils.units import UnitType
 
 
+def _abs_max(series) -> float:
+    """Máximo |valor| de una serie; las series por bloques se recorren bloque a bloque."""
+    blocks = series.iter_blocks() if isinstance(series, ChunkedSeries) else [np.asarray(series, dtype=np.float64)]
+    return max((float(np.abs(block).max()) for block in blocks if len(block)), default=0.0)
+
+
+def _head(series, limit) -> np.ndarray:
+    """Primeros 'limit' valores: de una serie por bloques solo se leen los bloques necesarios."""
+    return np.asarray(series[:limit], dtype=np.float64)
+
+
 class PushoverResultsWidget(QWidget):
     def __init__(self, results, initial_load_viz_state=False, parent = None):
         super().__init__(parent)
         self.results = results
+        self._extents = {}  # Curva -> (máx |desp|, máx |cortante|) en unidades base, por resultados
         
         self.manager = ProjectManager.instance()
 
@@ -59,23 +73,9 @@ class PushoverResultsWidget(QWidget):
         item_global.setCheckState(Qt.CheckState.Checked)  # Global activado por defecto
         self.list_curves.addItem(item_global)
         
-        # Añadir pisos disponibles (ordenados)
-        sorted_floors = sorted(self.results["floors"].keys())
-        
         # Mapa de alturas -> Nombres de Piso
         self.floor_map = {}
-        
-        for i, y in enumerate(sorted_floors):
-             floor_num = i + 1
-             name = f"Piso {floor_num}"
-             self.floor_map[y] = name
-             
-             label = f"{name} (Y={y:.2f})"
-             item_floor = QListWidgetItem(label)
-             item_floor.setFlags(item_floor.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-             item_floor.setData(Qt.ItemDataRole.UserRole, y)
-             item_floor.setCheckState(Qt.CheckState.Unchecked)
-             self.list_curves.addItem(item_floor)
+        self._populate_floor_items()
 
         # --- GRAFICO ---
         um = UnitManager.instance()
@@ -114,6 +114,41 @@ class PushoverResultsWidget(QWidget):
         # Pintar inicial
         self.update_plot()
         
+    def _populate_floor_items(self):
+        """Añade a la lista los pisos disponibles (ordenados) que aún no estén presentes."""
+        sorted_floors = sorted(self.results["floors"].keys())
+
+        for i, y in enumerate(sorted_floors):
+             if y in self.floor_map:
+                 continue
+             floor_num = i + 1
+             name = f"Piso {floor_num}"
+             self.floor_map[y] = name
+             
+             label = f"{name} (Y={y:.2f})"
+             item_floor = QListWidgetItem(label)
+             item_floor.setFlags(item_floor.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+             item_floor.setData(Qt.ItemDataRole.UserRole, y)
+             item_floor.setCheckState(Qt.CheckState.Unchecked)
+             self.list_curves.addItem(item_floor)
+
+    def set_results(self, results):
+        """
+        Sustituye los resultados mostrados (p.ej. parciales que llegan durante el análisis).
+        Si el slider estaba en el último paso, sigue al nuevo final de la curva.
+        """
+        follow_tail = self.current_step_val is None or self.current_step_val >= self.slider_step.maximum()
+        self.results = results
+        self._extents = {}
+
+        self.list_curves.blockSignals(True)
+        self._populate_floor_items()
+        self.list_curves.blockSignals(False)
+
+        if follow_tail:
+            self.current_step_val = None
+        self.update_plot()
+
     def _on_toggle_loads(self, state):
         from PyQt6.QtCore import Qt
         is_checked = (state == Qt.CheckState.Checked.value or state == 2) # PyQt6 values
@@ -126,6 +161,12 @@ class PushoverResultsWidget(QWidget):
         self.current_step_val = value
         self.update_plot()
 
+    def _extent(self, key, dx, dy):
+        """Alcance total de una curva (fija los ejes); se calcula una vez por conjunto de resultados."""
+        if key not in self._extents:
+            self._extents[key] = (_abs_max(dx), _abs_max(dy))
+        return self._extents[key]
+
     def update_plot(self):
         # Limpiar gráfico
         self.plot_widget.clear()
@@ -182,9 +223,9 @@ class PushoverResultsWidget(QWidget):
         self.slider_step.blockSignals(True)
         if self.slider_step.maximum() != global_max_steps:
             self.slider_step.setMaximum(global_max_steps)
-            if self.current_step_val is None or self.current_step_val > global_max_steps:
-                self.slider_step.setValue(global_max_steps)
-                self.current_step_val = global_max_steps
+        if self.current_step_val is None or self.current_step_val > global_max_steps:
+            self.slider_step.setValue(global_max_steps)
+            self.current_step_val = global_max_steps
         self.slider_step.blockSignals(False)
         
         if self.current_step_val == global_max_steps:
@@ -203,60 +244,46 @@ class PushoverResultsWidget(QWidget):
 
         # Dibujar cada curva
         for i, c_data in enumerate(curves_data):
-            dx_full = c_data["dx"]
-            dy_full = c_data["dy"]
-            
-            # Rebanar para animación
-            dx_cut = dx_full[:limit]
-            dy_cut = dy_full[:limit]
-
-            # Convertir Unidades Puntos Reales
-            vis_dx = [um.from_base(val, UnitType.LENGTH) for val in dx_cut]
-            vis_dy = [um.from_base(val, UnitType.FORCE) for val in dy_cut]
+            # Solo hasta el paso del slider (las series pueden ser listas o series por bloques en disco)
+            vis_dx = um.from_base(_head(c_data["dx"], limit), UnitType.LENGTH)
+            vis_dy = um.from_base(_head(c_data["dy"], limit), UnitType.FORCE)
             
             # Formatear la cadena de carga/desp para esta curva
-            if vis_dx and vis_dy:
+            if len(vis_dx) and len(vis_dy):
                 # Usar color html basado en el índice para que coincida con el plot
                 c_hex = pg.intColor(i, hues=len(curves_data), alpha=230).name()
                 info_lines.append(f"<span style='color:{c_hex};'>&#9632;</span> <b>{c_data['name']}</b><br>Disp: {vis_dx[-1]:.4f} {u_len} | Cortante: {vis_dy[-1]:.2f} {u_force}")
 
             # Obtener el alcance teórico total (sin recorte) para anclar el auto-rango
-            full_vis_dx = [um.from_base(val, UnitType.LENGTH) for val in dx_full]
-            full_vis_dy = [um.from_base(val, UnitType.FORCE) for val in dy_full]
-            if full_vis_dx: max_limit_x = max(max_limit_x, max([abs(x) for x in full_vis_dx]))
-            if full_vis_dy: max_limit_y = max(max_limit_y, max([abs(y) for y in full_vis_dy]))
+            extent_x, extent_y = self._extent(c_data["key"], c_data["dx"], c_data["dy"])
+            max_limit_x = max(max_limit_x, abs(float(um.from_base(extent_x, UnitType.LENGTH))))
+            max_limit_y = max(max_limit_y, abs(float(um.from_base(extent_y, UnitType.FORCE))))
 
             # Color distinto para cada gráfica
             base_color = pg.intColor(i, hues=len(curves_data), alpha=230)
             
             # === DIBUJO CON SOPORTE PARA CICLOS (Opcional, usando un solo color consolidado por curva principal) ===
-            cycle_ids = self.results.get("cycle_id", [])[:limit]
+            cycle_ids = np.asarray(self.results.get("cycle_id", [])[:limit], dtype=np.int64)
             has_cycles = (len(cycle_ids) == len(vis_dx))
 
             if has_cycles and c_data["key"] == "global":
                 # Si queremos mantener el arcoiris de ciclos SOLO para el global y está solo él seleccionado
                 if len(curves_data) == 1:
-                    unique_cycles = sorted(list(set(cycle_ids)))
+                    unique_cycles = np.unique(cycle_ids).tolist()
                     n_cycles = len(unique_cycles) if unique_cycles else 1
-                    cycle_points = {c: {"x":[], "y":[]} for c in unique_cycles}
-                    
-                    for idx_p, c_id in enumerate(cycle_ids):
-                        cycle_points[c_id]["x"].append(vis_dx[idx_p])
-                        cycle_points[c_id]["y"].append(vis_dy[idx_p])
                     
                     for idx_c, c_id in enumerate(unique_cycles):
-                        c_pts = cycle_points[c_id]
-                        if not c_pts["x"]: continue
+                        mask = cycle_ids == c_id
                         color = pg.intColor(idx_c, hues=n_cycles, values=1, maxValue=255, alpha=200)
-                        self.plot_widget.plot(c_pts["x"], c_pts["y"], pen=pg.mkPen(color, width=3), name=f"Ciclo {c_id+1}" if idx_c == 0 else None)
+                        self.plot_widget.plot(vis_dx[mask], vis_dy[mask], pen=pg.mkPen(color, width=3), name=f"Ciclo {c_id+1}" if idx_c == 0 else None)
                         
-                    if vis_dx and vis_dy:
-                        last_color = pg.intColor(cycle_ids[-1] if cycle_ids else (n_cycles-1), hues=n_cycles, values=1, maxValue=255, alpha=200)
+                    if len(vis_dx) and len(vis_dy):
+                        last_color = pg.intColor(int(cycle_ids[-1]) if len(cycle_ids) else (n_cycles-1), hues=n_cycles, values=1, maxValue=255, alpha=200)
                         self.plot_widget.plot([vis_dx[-1]], [vis_dy[-1]], pen=None, symbol='o', symbolBrush=last_color, symbolSize=8)
                     continue
 
             # MODO MULTICURVA NORMAL (Un color solido por curva)
-            if vis_dx and vis_dy:
+            if len(vis_dx) and len(vis_dy):
                 self.plot_widget.plot(vis_dx, vis_dy, pen=pg.mkPen(base_color, width=3), name=c_data["name"])
                 # Cursor rastreador final
                 self.plot_widget.plot([vis_dx[-1]], [vis_dy[-1]], pen=None, symbol='o', symbolBrush=base_color, symbolSize=8)
@@ -0,0 +1,295 @@
+import os
+import pyqtgraph as pg
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox, QPushButton,
+                             QCheckBox, QSpinBox, QLineEdit, QProgressBar, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QSplitter)
+from PyQt6.QtCore import Qt, QThread
+from src.analysis.manager import ProjectManager
+from src.utils.units import UnitManager
+from src.utils.units import UnitType
+
+
+class PushoverSweepDialog(QDialog):
+    """Barrido de parámetros del Pushover en paralelo con tabla consolidada de curvas de capacidad."""
+
+    COLUMNS = ["Caso", "Pasos", "Vb máx", "Desp. en Vb máx", "Desp. final", "Pisos fallados", "Tiempo [s]", "Estado"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Barrido de Parámetros Pushover")
+        self.resize(1100, 700)
+
+        self.manager = ProjectManager.instance()
+        self._thread = None
+        self._worker = None
+        self._sweep = None
+        self._results = []
+
+        layout = QVBoxLayout(self)
+
+        #--- Formulario ---
+        form_layout = QFormLayout()
+        um = UnitManager.instance()
+        u_len = um.get_current_unit(UnitType.LENGTH)
+
+        #1. Selector Nodo Control
+        self.combo_node = QComboBox()
+        self.populate_nodes()
+        form_layout.addRow("Nodo de Control:", self.combo_node)
+
+        #2. Patrones de carga
+        patterns_layout = QHBoxLayout()
+        self.chk_modal = QCheckBox("Modal")
+        self.chk_modal.setChecked(True)
+        self.chk_uniform = QCheckBox("Uniforme")
+        patterns_layout.addWidget(self.chk_modal)
+        patterns_layout.addWidget(self.chk_uniform)
+        patterns_layout.addStretch()
+        form_layout.addRow("Modo de aplicación de fuerza:", patterns_layout)
+
+        #3. Listas de valores (separados por comas)
+        self.edit_disps = QLineEdit(f"{um.from_base(0.3, UnitType.LENGTH):g}")
+        self.edit_disps.setToolTip("Valores separados por comas, p.ej. 0.2, 0.3, 0.4")
+        form_layout.addRow(f"Desplazamientos Máx [{u_len}]:", self.edit_disps)
+
+        self.spin_steps = QSpinBox()
+        self.spin_steps.setRange(1, 100000)
+        self.spin_steps.setSingleStep(500)
+        self.spin_steps.setValue(1000)
+        form_layout.addRow("Número de pasos:", self.spin_steps)
+
+        #4. Adaptativo
+        self.chk_adaptive = QCheckBox("Análisis Adaptativo Secuencial (Freeze Forward)")
+        form_layout.addRow("Estrategia:", self.chk_adaptive)
+
+        self.edit_sensitivities = QLineEdit("1")
+        self.edit_sensitivities.setToolTip("Sensibilidades de caída (%) separadas por comas")
+        self.edit_drifts = QLineEdit("8")
+        self.edit_drifts.setToolTip("Derivas máximas de piso (%) separadas por comas")
+        self.freeze_method_combo = QComboBox()
+        self.freeze_method_combo.addItems(["Springs", "Node Fix (Anclaje Rígido)", "Load Pattern (Fuerzas Opuestas)"])
+        form_layout.addRow("Sensibilidades [%]:", self.edit_sensitivities)
+        form_layout.addRow("Derivas Máximas [%]:", self.edit_drifts)
+        form_layout.addRow("Método Congelamiento:", self.freeze_method_combo)
+
+        self.chk_branch_freeze = QCheckBox("Comparar todos los métodos de congelamiento")
+        self.chk_branch_freeze.setToolTip("Cada caso se ejecuta una vez por método de congelamiento, como casos independientes del barrido.")
+        form_layout.addRow("Ramificar:", self.chk_branch_freeze)
+        for w in (self.edit_sensitivities, self.edit_drifts, self.freeze_method_combo, self.chk_branch_freeze):
+            w.setEnabled(False)
+            self.chk_adaptive.toggled.connect(w.setEnabled)
+        self.chk_branch_freeze.toggled.connect(lambda checked: self.freeze_method_combo.setEnabled(not checked))
+
+        #5. Procesos
+        self.spin_workers = QSpinBox()
+        self.spin_workers.setRange(1, 64)
+        self.spin_workers.setValue(os.cpu_count() or 1)
+        form_layout.addRow("Procesos en paralelo:", self.spin_workers)
+
+        layout.addLayout(form_layout)
+
+        # --- BOTONES ---
+        buttons_layout = QHBoxLayout()
+        self.btn_run = QPushButton("Ejecutar Barrido")
+        self.btn_run.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 10px;")
+        self.btn_run.clicked.connect(self.run_sweep)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel_sweep)
+        self.btn_export = QPushButton("Exportar CSV")
+        self.btn_export.setEnabled(False)
+        self.btn_export.clicked.connect(self.export_csv)
+        buttons_layout.addWidget(self.btn_run)
+        buttons_layout.addWidget(self.btn_cancel)
+        buttons_layout.addWidget(self.btn_export)
+        layout.addLayout(buttons_layout)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        # --- RESULTADOS: tabla resumen + curvas superpuestas ---
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        splitter.addWidget(self.table)
+
+        self.plot_widget = pg.PlotWidget(title="Curvas de Capacidad del Barrido")
+        self.plot_widget.setLabel('bottom', f"Desplazamiento Techo [{u_len}]")
+        self.plot_widget.setLabel('left', f"Cortante Basal Vb [{um.get_current_unit(UnitType.FORCE)}]")
+        self.plot_widget.getAxis('bottom').enableAutoSIPrefix(False)
+        self.plot_widget.getAxis('left').enableAutoSIPrefix(False)
+        self.plot_widget.showGrid(x=True, y=True, alpha=0.3)
+        self.plot_widget.setBackground('w')
+        self.plot_widget.addLegend()
+        splitter.addWidget(self.plot_widget)
+
+        layout.addWidget(splitter, stretch=1)
+
+    def populate_nodes(self):
+        nodes = self.manager.get_all_nodes()
+        if not nodes: return
+        sorted_nodes = sorted(nodes, key=lambda n: n.y, reverse=True)
+
+        for n in sorted_nodes:
+            self.combo_node.addItem(f"Nodo {n.tag} (Y={n.y:.2f})", userData=n.tag)
+
+    @staticmethod
+    def _parse_values(text):
+        return [float(v) for v in text.replace(";", ",").split(",") if v.strip()]
+
+    def _build_cases(self):
+        from src.analysis.pushover_sweep import expand_grid
+        um = UnitManager.instance()
+
+        patterns = [name for chk, name in ((self.chk_modal, "Modal"), (self.chk_uniform, "Uniforme")) if chk.isChecked()]
+        disps = [um.to_base(v, UnitType.LENGTH) for v in self._parse_values(self.edit_disps.text())]
+        adaptive = self.chk_adaptive.isChecked()
+        sensitivities = self._parse_values(self.edit_sensitivities.text()) if adaptive else [None]
+        drifts = self._parse_values(self.edit_drifts.text()) if adaptive else [None]
+        freeze_method = ["spring", "fix", "load"][self.freeze_method_combo.currentIndex()]
+
+        return expand_grid(patterns, disps, self.spin_steps.value(), adaptive=adaptive,
+                           sensitivities=sensitivities or [None], max_drifts=drifts or [None],
+                           freeze_method=freeze_method)
+
+    def run_sweep(self):
+        from src.analysis.pushover_sweep import PushoverSweep, FREEZE_METHODS, expand_freeze_branches
+        from src.ui.workers.pushover_worker import PushoverSweepWorker
+
+        if self._thread is not None and self._thread.isRunning():
+            return
+        idx = self.combo_node.currentIndex()
+        if idx < 0: return
+
+        try:
+            cases = self._build_cases()
+        except ValueError:
+            QMessageBox.warning(self, "Valores no válidos", "Revise las listas de valores (números separados por comas).")
+            return
+        if not cases:
+            QMessageBox.warning(self, "Barrido vacío", "Seleccione al menos un patrón de carga y un desplazamiento.")
+            return
+
+        # Ramas: una fila (y un caso independiente) por cada (caso, método de congelamiento)
+        if self.chk_adaptive.isChecked() and self.chk_branch_freeze.isChecked():
+            cases = expand_freeze_branches(cases, FREEZE_METHODS)
+
+        print(f"[Sweep] Lanzando {len(cases)} casos en {self.spin_workers.value()} procesos...")
+
+        # Los procesos se conservan entre barridos mientras el número no cambie
+        if self._sweep is None or self._sweep.n_workers != self.spin_workers.value():
+            if self._sweep is not None:
+                self._sweep.shutdown()
+            self._sweep = PushoverSweep(self.combo_node.itemData(idx), n_workers=self.spin_workers.value())
+        self._sweep.control_node_tag = self.combo_node.itemData(idx)
+
+        self._results = [None] * len(cases)
+        self.table.setRowCount(len(cases))
+        for row, case in enumerate(cases):
+            self._set_row(row, [case.label, "", "", "", "", "", "", "En cola"])
+        self.plot_widget.clear()
+
+        self._worker = PushoverSweepWorker(self._sweep, cases)
+        self._thread = QThread(self)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.caseFinished.connect(self._on_case_finished)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.failed.connect(self._on_failed)
+        self._worker.finished.connect(self._thread.quit, Qt.ConnectionType.DirectConnection)
+        self._worker.failed.connect(self._thread.quit, Qt.ConnectionType.DirectConnection)
+
+        self.progress_bar.setRange(0, len(cases))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.btn_run.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.btn_export.setEnabled(False)
+
+        self._thread.start()
+
+    def _set_row(self, row, values):
+        for col, value in enumerate(values):
+            self.table.setItem(row, col, QTableWidgetItem(value))
+
+    def _on_case_finished(self, row, result):
+        um = UnitManager.instance()
+        self._results[row] = result
+        self.progress_bar.setValue(sum(r is not None for r in self._results))
+
+        info = result.summary()
+        if result.ok:
+            fmt_len = lambda v: f"{um.from_base(v, UnitType.LENGTH):.4f}"
+            self._set_row(row, [
+                info["label"], str(info["steps"]),
+                f"{um.from_base(info['v_max'], UnitType.FORCE):.2f}",
+                fmt_len(info["disp_at_v_max"]), fmt_len(info["disp_final"]),
+                ", ".join(f"{y:.2f}" for y in info["failed_floors"]),
+                f"{info['elapsed']:.1f}", "OK" if not result.results.get("cancelled") else "Cancelado"
+            ])
+            self._plot_curves()
+        else:
+            self._set_row(row, [info["label"], "", "", "", "", "", f"{info['elapsed']:.1f}", "Error" if result.error != "Cancelado" else "Cancelado"])
+            if result.error and result.error != "Cancelado":
+                self.table.item(row, len(self.COLUMNS) - 1).setToolTip(result.error)
+
+    def _plot_curves(self):
+        um = UnitManager.instance()
+        self.plot_widget.clear()
+        n = len(self._results)
+        for i, result in enumerate(self._results):
+            if result is None or not result.ok:
+                continue
+            disp, shear = result.curve
+            vis_dx = [um.from_base(v, UnitType.LENGTH) for v in disp]
+            vis_dy = [um.from_base(v, UnitType.FORCE) for v in shear]
+            color = pg.intColor(i, hues=max(n, 1), alpha=230)
+            self.plot_widget.plot(vis_dx, vis_dy, pen=pg.mkPen(color, width=2), name=result.case.label)
+
+    def _on_finished(self, results):
+        self._results = results
+        self._reset_run_controls()
+        self.btn_export.setEnabled(any(r.ok for r in results))
+        print(f"[Sweep] Barrido terminado: {sum(r.ok for r in results)}/{len(results)} casos correctos.")
+
+    def _on_failed(self, error_trace):
+        self._reset_run_controls()
+        print(f"Error crítico en el barrido:\n{error_trace}")
+
+    def _reset_run_controls(self):
+        self.progress_bar.setVisible(False)
+        self.btn_run.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+
+    def cancel_sweep(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.btn_cancel.setEnabled(False)
+
+    def export_csv(self):
+        from src.analysis.pushover_sweep import export_capacity_curves_csv
+        filename, _ = QFileDialog.getSaveFileName(self, "Exportar curvas de capacidad", "", "CSV (*.csv)")
+        if not filename:
+            return
+        export_capacity_curves_csv([r for r in self._results if r is not None], filename)
+        print(f"[Sweep] Curvas exportadas a: {filename}")
+
+    def _stop_sweep(self):
+        if self._thread is not None and self._thread.isRunning():
+            self._worker.cancel()
+            self._thread.wait()
+        if self._sweep is not None:
+            self._sweep.shutdown()
+            self._sweep = None
+
+    def reject(self):
+        self._stop_sweep()
+        super().reject()
+
+    def closeEvent(self, event):
+        self._stop_sweep()
+        super().closeEvent(event)
@@ -126,13 +126,12 @@ class RestraintsDialog(QDialog):
         # 3. Aplicar a cada nodo
         count = 0
         for tag in target_ids:
-            node = self.manager.get_node(tag)
-            if node:
-                node.fixity = fixity
+            if self.manager.get_node(tag):
+                self.manager.update_node(tag, fixity=fixity)
                 count += 1
         
         # 4. Refrescar UI
-        self.manager.dataChanged.emit() # Avisar a la MainWindow que refresque gráficos
+        self.manager.notify_changed() # Avisar a la MainWindow que refresque gráficos
         self._refresh_list()
         QMessageBox.information(self, "Info", f"Restricciones aplicadas a {count} nodo(s).")
 
@@ -146,13 +145,11 @@ class RestraintsDialog(QDialog):
             # El texto es "Nodo X: [1, 1, 1]"
             try:
                 tag = int(item.text().split(':')[0].replace("Nodo ", ""))
-                node = self.manager.get_node(tag)
-                if node:
-                    node.fixity = [0, 0, 0]
+                self.manager.update_node(tag, fixity=[0, 0, 0])
             except:
                 pass
         
-        self.manager.dataChanged.emit()
+        self.manager.notify_changed()
         self._refresh_list()
 
     def _refresh_list(self):
@@ -67,41 +67,43 @@ class SelfWeightDialog(QDialog):
             QMessageBox.critical(self, "Error", f"Error generando cargas: {str(e)}")
 
     def apply_self_weight(self, g, only_beams, delete_existing):
-        if delete_existing:
-            loads_to_remove = [l.tag for l in self.manager.get_all_loads() if isinstance(l, ElementLoad)]
-            for tag in loads_to_remove:
-                self.manager.delete_load(tag)
+        # Una sola transacción: un único redibujado al final en lugar de uno por carga
+        with self.manager.batch():
+            if delete_existing:
+                loads_to_remove = [l.tag for l in self.manager.get_all_loads() if isinstance(l, ElementLoad)]
+                for tag in loads_to_remove:
+                    self.manager.delete_load(tag)
 
-        elements = self.manager.get_all_elements()
-        new_loads_count = 0
+            elements = self.manager.get_all_elements()
+            new_loads_count = 0
 
-        for ele in elements:
-            # Geometría
-            ni = self.manager.get_node(ele.node_i)
-            nj = self.manager.get_node(ele.node_j)
-            dx = nj.x - ni.x
-            dy = nj.y - ni.y
-            L = (dx**2 + dy**2)**0.5
-            if L == 0: continue
-            # Chequeo de "Es Viga Horizontal"
-            is_beam = False
-            if abs(dx) > 0:
-                 if abs(dy) / abs(dx) < 0.1: # Pendiente < 10%
-                     is_beam = True
+            for ele in elements:
+                # Geometría
+                ni = self.manager.get_node(ele.node_i)
+                nj = self.manager.get_node(ele.node_j)
+                dx = nj.x - ni.x
+                dy = nj.y - ni.y
+                L = (dx**2 + dy**2)**0.5
+                if L == 0: continue
+                # Chequeo de "Es Viga Horizontal"
+                is_beam = False
+                if abs(dx) > 0:
+                     if abs(dy) / abs(dx) < 0.1: # Pendiente < 10%
+                         is_beam = True
             
-            # Si el usuario quiere SOLO vigas y esto NO es una viga -> Saltar
-            if only_beams and not is_beam:
-                continue
-            # Cálculo de Carga
-            rho = ele.mass_density
+                # Si el usuario quiere SOLO vigas y esto NO es una viga -> Saltar
+                if only_beams and not is_beam:
+                    continue
+                # Cálculo de Carga
+                rho = ele.mass_density
             
-            W = rho * g
+                W = rho * g
                       
-            wy = -W * (dx / L)
-            wx = -W * (dy / L)
+                wy = -W * (dx / L)
+                wx = -W * (dy / L)
             
-            load = ElementLoad(tag=0, element_tag=ele.tag, wy=wy, wx=wx)
-            self.manager.add_load(load)
-            new_loads_count += 1
+                load = ElementLoad(tag=0, element_tag=ele.tag, wy=wy, wx=wx)
+                self.manager.add_load(load)
+                new_loads_count += 1
             
         return new_loads_count
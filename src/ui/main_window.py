@@ -109,7 +109,7 @@ class MainWindow(QMainWindow):
         self.console_widget.log_message("Sistema listo. Prueba: 'tag nodes on'", "blue")
 
     def refresh_project(self):
-        ProjectManager.instance().dataChanged.emit()
+        ProjectManager.instance().notify_changed()
 
     @property
     def _viewports(self):
@@ -4,8 +4,10 @@ from src.ui.dialogs.pushover_dialog import PushoverDialog
 from src.ui.dialogs.pushover_result_dialog import PushoverResultsWidget
 from src.ui.dialogs.moment_curvature_dialog import MomentCurvatureWidget
 from src.analysis.manager import ProjectManager
+from src.analysis.analysis_cache import AnalysisCache
+from src.analysis.fingerprint import model_fingerprint
 from PyQt6.QtWidgets import QMenu
-from PyQt6.QtGui import QAction
+from PyQt6.QtGui import QAction, QActionGroup
 
 
 
@@ -26,6 +28,38 @@ class AnalyzeMenu(QMenu):
 
         # Pushover
         self.addAction("Análisis Pushover (No Lineal)", self.show_pushover_dialog)
+        self.addAction("Barrido de Parámetros Pushover...", self.show_pushover_sweep_dialog)
+
+        # Ejecución aislada: un fallo de OpenSees no tumba la aplicación
+        self.action_remote = QAction("Ejecutar OpenSees en proceso aparte", self)
+        self.action_remote.setCheckable(True)
+        self.action_remote.setStatusTip("Construye y analiza el modelo en un proceso de OpenSees persistente fuera de la interfaz")
+        self.action_remote.toggled.connect(OpenSeesTranslator.use_remote_worker)
+        self.addAction(self.action_remote)
+        self.action_timeout = QAction("Tiempo máximo sin respuesta del proceso...", self)
+        self.action_timeout.setStatusTip("Si OpenSees no responde en ese tiempo (p.ej. colgado en un paso), se reinicia su proceso")
+        self.action_timeout.setEnabled(False)
+        self.action_timeout.triggered.connect(self._set_request_timeout)
+        self.action_remote.toggled.connect(self.action_timeout.setEnabled)
+        self.addAction(self.action_timeout)
+
+        # Registro de comandos de OpenSees (script de depuración), desactivado por defecto
+        self.log_menu = QMenu("Registro de comandos OpenSees", self)
+        self.log_group = QActionGroup(self)
+        for label, mode in (("Desactivado", "off"), ("En memoria (últimos comandos)", "memory"),
+                            ("Archivo model_debug.py", "file")):
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(mode == "off")
+            action.triggered.connect(lambda checked, mode=mode: self._set_command_log(mode))
+            self.log_group.addAction(action)
+            self.log_menu.addAction(action)
+        self.log_menu.addSeparator()
+        self.action_save_log = QAction("Guardar registro en memoria como script...", self)
+        self.action_save_log.setEnabled(False)
+        self.action_save_log.triggered.connect(self._save_command_log)
+        self.log_menu.addAction(self.action_save_log)
+        self.addMenu(self.log_menu)
 
         self.addSeparator()
 
@@ -67,6 +101,34 @@ class AnalyzeMenu(QMenu):
         self.act_clear.triggered.connect(self._clear_results)
         self.results_menu.addAction(self.act_clear)
 
+    def _set_command_log(self, mode):
+        OpenSeesTranslator.use_command_log(mode)
+        self.action_save_log.setEnabled(mode == "memory")
+
+    def _set_request_timeout(self):
+        from PyQt6.QtWidgets import QInputDialog
+
+        current = OpenSeesTranslator.default_request_timeout
+        seconds, ok = QInputDialog.getInt(self, "Tiempo máximo sin respuesta",
+                                          "Segundos sin respuesta ni progreso de OpenSees (0 = sin límite):",
+                                          int(current or 0), 0, 86400)
+        if ok:
+            OpenSeesTranslator.default_request_timeout = seconds or None
+
+    def _save_command_log(self):
+        from PyQt6.QtWidgets import QFileDialog
+        from src.analysis.model_builder import ModelBuilder
+        from src.analysis.command_log import MemoryCommandLog
+
+        command_log = ModelBuilder.default_command_log
+        if not isinstance(command_log, MemoryCommandLog):
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Guardar registro de comandos", "model_debug.py",
+                                                  "Scripts Python (*.py);;Todos los archivos (*)")
+        if filename:
+            command_log.dump(filename)
+            print(f"[OpenSees] Registro de comandos guardado en: {filename}")
+
     def _set_deformed_visibility(self, visible):
         if self.parent() and hasattr(self.parent(), "viz_widget"):
             self.parent().viz_widget.set_visibility("deformed", visible)
@@ -82,6 +144,18 @@ class AnalyzeMenu(QMenu):
             self.parent().viz_widget.show_force_diagrams(type_)
 
     def run_gravity(self):
+        manager = ProjectManager.instance()
+        cache = AnalysisCache.instance()
+        fingerprint = model_fingerprint(manager)
+
+        #0. Si este mismo modelo ya se analizó, los resultados salen de la caché sin pasar por OpenSees
+        cached = cache.get(fingerprint, "gravity", {})
+        if cached is not None:
+            print("[Caché] Resultados de gravedad recuperados")
+            self._show_gravity_results(cached["results"])
+            QMessageBox.information(self, "Análisis Completado", "El modelo no ha cambiado: se muestran los resultados guardados.")
+            return
+
         #1. Instancia al traductor
         translator = OpenSeesTranslator()
 
@@ -95,20 +169,13 @@ class AnalyzeMenu(QMenu):
             if success:
                 #4. Obtener resultados 
                 results = translator.get_analysis_results()
-                
-                # Guardar resultados globalmente
-                from src.analysis.manager import ProjectManager
-                ProjectManager.instance().gravity_results = results
+                cache.put(fingerprint, "gravity", {}, results)
 
                 # Debug: Mostrar en consola para verificar
                 print("[DEBUG] [Resultados obtenidos]")
                 print(f"Nodos con desplazamiento: {len(results['displacements'])}")
-                
-                # Visualizar en el Graph Widget
-                if self.parent() and hasattr(self.parent(), "broadcast_results"):
-                    # Pasamos el objeto results COMPLETO
-                    self.parent().broadcast_results(results)
 
+                self._show_gravity_results(results)
                 QMessageBox.information(self, "Análisis Completado", "El análisis finalizó correctamente.")
             else:
                 QMessageBox.warning(self, "Error de análisis", "El análisis de gravedad falló en OpenSees.")
@@ -117,9 +184,29 @@ class AnalyzeMenu(QMenu):
             QMessageBox.critical(self, "Error crítico", f"Ocurrió error inesperado:\n{str(e)}")
             print(e)
 
+    def _show_gravity_results(self, results):
+        # Guardar resultados globalmente
+        ProjectManager.instance().gravity_results = results
+
+        # Visualizar en el Graph Widget
+        if self.parent() and hasattr(self.parent(), "broadcast_results"):
+            # Pasamos el objeto results COMPLETO
+            self.parent().broadcast_results(results)
+
     def run_modal(self):
         translator = OpenSeesTranslator()
-        translator.run_modal_analysis(1)
+        try:
+            results = translator.run_modal_analysis(1)
+        except Exception as e:
+            QMessageBox.critical(self, "Error crítico", f"Ocurrió error inesperado:\n{str(e)}")
+            print(e)
+            return
+
+        if results is None:
+            QMessageBox.warning(self, "Error de análisis", "El análisis modal falló en OpenSees.")
+            return
+        periods = "\n".join(f"Modo {i}: T = {T:.4f} s" for i, T in enumerate(results["periods"], 1))
+        QMessageBox.information(self, "Análisis modal", periods)
 
 
     def show_pushover_dialog(self):
@@ -139,6 +226,11 @@ class AnalyzeMenu(QMenu):
         dlg = PushoverDialog(self.parent())
         dlg.exec()
 
+    def show_pushover_sweep_dialog(self):
+        from src.ui.dialogs.pushover_sweep_dialog import PushoverSweepDialog
+        dlg = PushoverSweepDialog(self.parent())
+        dlg.exec()
+
     def _show_curve_pushover(self):
 
         results = ProjectManager.instance().pushover_results
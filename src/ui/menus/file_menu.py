@@ -26,6 +26,11 @@ class FileMenu(QMenu):
         self.actions_save_project = QAction("Guardar Proyecto", self)
         self.actions_save_project.triggered.connect(self.open_save_dialog)
         self.addAction(self.actions_save_project)
+
+        #Guardar projecto con resultados (evita repetir análisis largos al reabrirlo)
+        self.actions_save_project_results = QAction("Guardar Proyecto con resultados", self)
+        self.actions_save_project_results.triggered.connect(lambda: self.open_save_dialog(include_results=True))
+        self.addAction(self.actions_save_project_results)
     
         #Salir
         self.actions_exit =QAction("Salir",self)
@@ -33,17 +38,17 @@ class FileMenu(QMenu):
         self.addAction(self.actions_exit)
 
         
-    def open_save_dialog(self):
+    def open_save_dialog(self, include_results=False):
         manager = ProjectManager.instance()
         filename, _ = QFileDialog.getSaveFileName(
             self,
             "Guardar Projecto",
             "",
-            "Archivos Json (*.json);;Todos los archivos (*)"
+            "Archivos Json (*.json);;Proyecto binario (*.npz);;Todos los archivos (*)"
         )
 
         if filename:
-            manager.save_project(filename)
+            manager.save_project(filename, include_results=include_results)
 
     def open_load_dialog(self):
         manager = ProjectManager.instance()
@@ -51,10 +56,19 @@ class FileMenu(QMenu):
             self,
             "Cargar Proyecto",
             "",
-            "Archivos JSON (*.json);;Todos los archivos (*)"
+            "Proyectos (*.json *.npz);;Archivos JSON (*.json);;Proyecto binario (*.npz);;Todos los archivos (*)"
         )
-        if filename:
-            manager.load_project(filename)
+        if filename and manager.load_project(filename):
+            self.show_restored_results()
+
+    def show_restored_results(self):
+        """Lleva a las vistas los resultados restaurados del fichero (si los había)."""
+        manager = ProjectManager.instance()
+        parent = self.parent()
+        if manager.gravity_results and hasattr(parent, "broadcast_results"):
+            parent.broadcast_results(manager.gravity_results)
+        if manager.pushover_results and hasattr(parent, "toggle_animation_toolbar"):
+            parent.toggle_animation_toolbar(True)
 
     def open_new_project(self):
         manager = ProjectManager.instance()
@@ -1,9 +1,9 @@
 import pyqtgraph as pg
 from PyQt6.QtCore import Qt
-import math
 import numpy as np
 from src.utils.units import UnitManager, UnitType
 from src.utils.scale_manager import ScaleManager
+from src.analysis.solvers.results_store import StepDisplacements
 
 class DeformationRenderer:
 
@@ -40,128 +40,131 @@ class DeformationRenderer:
             plot_widget.removeItem(self.node_scatter)
 
     def draw_deformed(self, plot_widget, manager, displacements, scale_factor=None):
+        """
+        Dibuja la deformada. 'displacements' puede ser un dict {tag: [dx, dy, rz]} (gravedad)
+        o una vista StepDisplacements del almacén columnar del Pushover (mismo acceso .get por tag).
+        """
         self.clear(plot_widget)
         if not displacements: return
         um = UnitManager.instance()
         u_len = UnitType.LENGTH 
-        nodes = manager.get_all_nodes()
-        elements = manager.get_all_elements()
-        node_map = {n.tag: n for n in nodes}
+        node_tags, xy, _ = manager.get_node_arrays()
+        ele_tags, node_rows = manager.get_element_arrays()
         if scale_factor is None:
              scale_factor = ScaleManager.instance().get_scale('deformation')
+
+        # Desplazamientos [dx, dy, rz] alineados con las filas de nodos (N×3)
+        disp = self._displacement_array(node_tags, displacements)
         
-        # 1. Dibujar Elementos (Curvas)
-        for el in elements:
-            if el.node_i in node_map and el.node_j in node_map:
-                ni = node_map[el.node_i]
-                nj = node_map[el.node_j]
-                
-                # Obtener desplazamientos [dx, dy, rz]
-                di = displacements.get(ni.tag, [0.0, 0.0, 0.0])
-                dj = displacements.get(nj.tag, [0.0, 0.0, 0.0])
-                
-                # Calcular geometría deformada interpolada
-                xs, ys = self._compute_beam_curve(
-                    ni, nj, di, dj, scale_factor
-                )
-                
-                # Dibujar curva
-                curve = plot_widget.plot(xs, ys, pen=self.pen_deformed)
-                self.deformed_items.append(curve)
+        # 1. Dibujar Elementos: todas las curvas en un único item, separadas por NaN
+        valid = (node_rows >= 0).all(axis=1)
+        rows_i, rows_j = node_rows[valid, 0], node_rows[valid, 1]
+        if rows_i.size:
+            xs, ys = self._compute_beam_curves(
+                xy[rows_i], xy[rows_j], disp[rows_i], disp[rows_j], scale_factor
+            )
+            gap = np.full((xs.shape[0], 1), np.nan)
+            curve = plot_widget.plot(
+                np.hstack([xs, gap]).ravel(), np.hstack([ys, gap]).ravel(),
+                pen=self.pen_deformed, connect='finite'
+            )
+            self.deformed_items.append(curve)
 
         # 2. Dibujar Nodos Deformados (Puntos + Tooltip)
-        spots = []
         unit_str = um.get_current_unit(u_len)
-        for n in nodes:
-             disp = displacements.get(n.tag, [0.0, 0.0, 0.0])
-             # Convertir valores
-             dx_viz = um.from_base(disp[0], u_len)
-             dy_viz = um.from_base(disp[1], u_len)
-             rz_val = disp[2] # Radiales
-             
-             # ... Posición deformada ...
-             x_def = n.x + disp[0] * scale_factor
-             y_def = n.y + disp[1] * scale_factor
-             
-             # Tooltip formateado
-             tip_text = (f"Node {n.tag}\n"
-                         f"Dx: {dx_viz:.4g} {unit_str}\n"
-                         f"Dy: {dy_viz:.4g} {unit_str}\n"
-                         f"Rz: {rz_val:.4g} rad")
-             
-             spots.append({
-                 'pos': (x_def, y_def),
-                 'data': tip_text,
-             })
+        pos_def = xy + disp[:, :2] * scale_factor
+        # Convertir valores
+        dx_viz = np.broadcast_to(um.from_base(disp[:, 0], u_len), len(node_tags))
+        dy_viz = np.broadcast_to(um.from_base(disp[:, 1], u_len), len(node_tags))
+
+        # Tooltip formateado (lo único que sigue siendo por nodo)
+        tips = [f"Node {tag}\n"
+                f"Dx: {dx:.4g} {unit_str}\n"
+                f"Dy: {dy:.4g} {unit_str}\n"
+                f"Rz: {rz:.4g} rad"
+                for tag, dx, dy, rz in zip(node_tags.tolist(), dx_viz.tolist(),
+                                           dy_viz.tolist(), disp[:, 2].tolist())]
         
-        if spots:
-            self.node_scatter.setData(spots=spots)
+        if tips:
+            self.node_scatter.setData(x=pos_def[:, 0], y=pos_def[:, 1], data=tips)
             plot_widget.addItem(self.node_scatter)
             # Añadimos a la lista para que se borre en el próximo clear
             self.deformed_items.append(self.node_scatter)
 
-    def _compute_beam_curve(self, ni, nj, di, dj, scale, num_points=20):
+    def _displacement_array(self, node_tags, displacements):
+        """Matriz N×3 de desplazamientos en el orden de 'node_tags' (ceros para nodos sin resultado)."""
+        out = np.zeros((len(node_tags), 3))
+        if isinstance(displacements, StepDisplacements):
+            # Vista del almacén: una sola indexación con las columnas de cada tag
+            index = displacements.index
+            cols = np.fromiter((index.get(tag, -1) for tag in node_tags.tolist()), dtype=np.int64, count=len(node_tags))
+            found = cols >= 0
+            out[found] = np.asarray(displacements.data)[cols[found], :3]
+        else:
+            for k, tag in enumerate(node_tags.tolist()):
+                d = displacements.get(tag)
+                if d is not None:
+                    out[k] = d[:3]
+        return out
+
+    def _compute_beam_curves(self, pi, pj, di, dj, scale, num_points=20):
+        """
+        Curvas deformadas de E elementos a la vez (E×num_points).
+        pi, pj: coordenadas (E×2) de los extremos; di, dj: desplazamientos (E×3) [dx, dy, theta].
+        """
         # 1. Geometría Original
-        x1, y1 = ni.x, ni.y
-        x2, y2 = nj.x, nj.y
-        L = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-        if L < 1e-9: return [x1, x2], [y1, y2]
+        x1, y1 = pi[:, 0:1], pi[:, 1:2]
+        x2, y2 = pj[:, 0:1], pj[:, 1:2]
+        L = np.hypot(x2 - x1, y2 - y1)
+        # Elementos degenerados (L ~ 0): se dibujan sin deformar, como un punto
+        degenerate = L < 1e-9
+        safe_L = np.where(degenerate, 1.0, L)
         
         # Coseno y Seno directores
-        c = (x2 - x1) / L
-        s = (y2 - y1) / L
+        c = np.where(degenerate, 0.0, (x2 - x1) / safe_L)
+        s = np.where(degenerate, 0.0, (y2 - y1) / safe_L)
         
         # 2. Transformar desplazamientos globales a locales
         # u = axial, v = transversal
-        # di = [dx, dy, theta]
         
         # Nodo I
-        ui_local =  di[0]*c + di[1]*s
-        vi_local = -di[0]*s + di[1]*c
-        ti_local =  di[2] 
+        ui_local =  di[:, 0:1]*c + di[:, 1:2]*s
+        vi_local = -di[:, 0:1]*s + di[:, 1:2]*c
+        ti_local =  np.where(degenerate, 0.0, di[:, 2:3])
         
         # Nodo J
-        uj_local =  dj[0]*c + dj[1]*s
-        vj_local = -dj[0]*s + dj[1]*c
-        tj_local =  dj[2]
+        uj_local =  dj[:, 0:1]*c + dj[:, 1:2]*s
+        vj_local = -dj[:, 0:1]*s + dj[:, 1:2]*c
+        tj_local =  np.where(degenerate, 0.0, dj[:, 2:3])
         
-        # 3. Generar puntos interpolados
-        t_vals = np.linspace(0, 1, num_points)
-        x_out = []
-        y_out = []
-        
-        for t in t_vals:
-            # Interpolación Lineal Axial u(x)
-            u_def = (1-t)*ui_local + t*uj_local
-            
-            # Interpolación Cúbica Transversal v(x) (Hermite)
-            h1 = 1 - 3*t**2 + 2*t**3
-            h2 = L * (t - 2*t**2 + t**3)
-            h3 = 3*t**2 - 2*t**3
-            h4 = L * (-t**2 + t**3)
-            
-            v_def = h1*vi_local + h2*ti_local + h3*vj_local + h4*tj_local
-            
-            # --- TRANSFORMACIÓN INVERSA (Local -> Global) ---
-            # Coordenada 'x' original local a lo largo de la barra
-            x_bar = t * L
-            
-            # Posición original en Global
-            x_orig = x1 + x_bar * c
-            y_orig = y1 + x_bar * s
-            
-            # Desplazamiento local escalado
-            u_comb = u_def * scale
-            v_comb = v_def * scale
-            
-            # Rotar desplazamiento local escalado a Global
-            dx_global = u_comb * c - v_comb * s
-            dy_global = u_comb * s + v_comb * c
-            
-            x_final = x_orig + dx_global
-            y_final = y_orig + dy_global
-            
-            x_out.append(x_final)
-            y_out.append(y_final)
-            
+        # 3. Generar puntos interpolados (fila = elemento, columna = t)
+        t = np.linspace(0, 1, num_points)[None, :]
+
+        # Interpolación Lineal Axial u(x)
+        u_def = (1-t)*ui_local + t*uj_local
+
+        # Interpolación Cúbica Transversal v(x) (Hermite)
+        h1 = 1 - 3*t**2 + 2*t**3
+        h2 = L * (t - 2*t**2 + t**3)
+        h3 = 3*t**2 - 2*t**3
+        h4 = L * (-t**2 + t**3)
+
+        v_def = h1*vi_local + h2*ti_local + h3*vj_local + h4*tj_local
+
+        # --- TRANSFORMACIÓN INVERSA (Local -> Global) ---
+        # Coordenada 'x' original local a lo largo de la barra
+        x_bar = t * L
+
+        # Posición original en Global
+        x_orig = x1 + x_bar * c
+        y_orig = y1 + x_bar * s
+
+        # Desplazamiento local escalado
+        u_comb = u_def * scale
+        v_comb = v_def * scale
+
+        # Rotar desplazamiento local escalado a Global
+        x_out = x_orig + (u_comb * c - v_comb * s)
+        y_out = y_orig + (u_comb * s + v_comb * c)
+
         return x_out, y_out
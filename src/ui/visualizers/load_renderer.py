@@ -7,6 +7,7 @@ import math
 class LoadRenderer:
     def __init__(self):
         self.load_items = []
+        self.items_by_load = {} # map tag de carga -> items dibujados (solo cargas del modelo)
         # Colores estáticos
         self.color_nodal_load = '#FF5722'  # Naranja
         self.color_dist_load = '#9C27B0'   # Morado
@@ -18,6 +19,7 @@ class LoadRenderer:
         for item in self.load_items:
             plot_widget.removeItem(item)
         self.load_items.clear()
+        self.items_by_load.clear()
 
     def draw_loads(self, plot_widget, manager, scale=1.0, show_nodes=True, show_elements=True, draw_pushover=False):
         """Dibuja todas las cargas del manager en el plot_widget."""
@@ -25,42 +27,59 @@ class LoadRenderer:
         plot_widget.setUpdatesEnabled(False)
         try:
             self.clear(plot_widget)
-
-            # Pre-calc scales/constants
-            um = UnitManager.instance()
-            force_unit_str = um.get_current_unit(UnitType.FORCE)
-            dist_unit_str = um.get_current_unit(UnitType.DISTRIBUTED_FORCE)
             
             # Use faster lookups
             if draw_pushover:
                 all_loads = manager.pushover_loads
-                color_override_nodal = self.color_pushover_load
-                color_override_dist = self.color_pushover_load
             else:
                 all_loads = manager.get_all_loads()
-                color_override_nodal = self.color_nodal_load
-                color_override_dist = self.color_dist_load
-                
-            nodes_map = {n.tag: n for n in manager.get_all_nodes()}
-            elements_map = {e.tag: e for e in manager.get_all_elements()} # only needed if ElementLoads exist
 
             for load in all_loads:
-                if isinstance(load, NodalLoad) and show_nodes:
-                    node = nodes_map.get(load.node_tag)
-                    if node:
-                        self._draw_nodal_load(plot_widget, node, load, scale, um, force_unit_str, color_override=color_override_nodal, is_pushover=draw_pushover)
-                
-                elif isinstance(load, ElementLoad) and show_elements:
-                    elem = elements_map.get(load.element_tag)
-                    if elem:
-                        ni = nodes_map.get(elem.node_i)
-                        nj = nodes_map.get(elem.node_j)
-                        if ni and nj:
-                            self._draw_element_load(plot_widget, ni, nj, load, scale, um, dist_unit_str, color_override=color_override_dist)
+                self._draw_load(plot_widget, manager, load, scale, show_nodes, show_elements, draw_pushover)
         finally:
             plot_widget.setUpdatesEnabled(True)
             plot_widget.update()
 
+    def update_loads(self, plot_widget, manager, tags, scale=1.0, show_nodes=True, show_elements=True):
+        """Actualización parcial: solo se rehacen los items de las cargas indicadas (altas, bajas o cambios)."""
+        removed = set()
+        for tag in tags:
+            for item in self.items_by_load.pop(tag, ()):
+                plot_widget.removeItem(item)
+                removed.add(id(item))
+        if removed:
+            self.load_items = [item for item in self.load_items if id(item) not in removed]
+
+        for tag in tags:
+            load = manager.get_load(tag)
+            if load is not None:
+                self._draw_load(plot_widget, manager, load, scale, show_nodes, show_elements, False)
+
+    def _draw_load(self, plot_widget, manager, load, scale, show_nodes, show_elements, is_pushover):
+        um = UnitManager.instance()
+        first = len(self.load_items)
+
+        # Búsquedas directas en el manager (sin reconstruir mapas de nodos/elementos en cada redibujado)
+        if isinstance(load, NodalLoad) and show_nodes:
+            node = manager.get_node(load.node_tag)
+            if node:
+                color = self.color_pushover_load if is_pushover else self.color_nodal_load
+                self._draw_nodal_load(plot_widget, node, load, scale, um, um.get_current_unit(UnitType.FORCE),
+                                      color_override=color, is_pushover=is_pushover)
+        
+        elif isinstance(load, ElementLoad) and show_elements:
+            elem = manager.get_element(load.element_tag)
+            if elem:
+                ni = manager.get_node(elem.node_i)
+                nj = manager.get_node(elem.node_j)
+                if ni and nj:
+                    color = self.color_pushover_load if is_pushover else self.color_dist_load
+                    self._draw_element_load(plot_widget, ni, nj, load, scale, um,
+                                            um.get_current_unit(UnitType.DISTRIBUTED_FORCE), color_override=color)
+
+        if not is_pushover and len(self.load_items) > first:
+            self.items_by_load[load.tag] = self.load_items[first:]
+
     def _draw_nodal_load(self, plot_widget, node, load, scale, um, unit_str, color_override=None, is_pushover=False):
         # Parametros graficos
         HEAD_LEN = 1500 * scale
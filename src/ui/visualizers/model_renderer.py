@@ -1,4 +1,5 @@
 from PyQt6.QtCore import Qt
+import numpy as np
 import pyqtgraph as pg
 from src.utils.scale_manager import ScaleManager
 
@@ -6,7 +7,8 @@ class ModelRenderer:
     def __init__(self):
         self.node_items = {} # map tag -> ScatterPlotItem (spot)
         self.element_items = {} # map tag -> PlotCurveItem
-        self.labels = []
+        self.node_labels = {} # map tag -> TextItem
+        self.element_labels = {} # map tag -> TextItem
         # Estilos
         self.pen_element = pg.mkPen(color='k', width=2)
         self.brush_node = pg.mkBrush(color='#2196F3')
@@ -32,105 +34,126 @@ class ModelRenderer:
             plot_widget.removeItem(item)
         self.element_items.clear()
         
-        for lbl in self.labels:
-            plot_widget.removeItem(lbl)
-        self.labels.clear()
+        for labels in (self.node_labels, self.element_labels):
+            for lbl in labels.values():
+                plot_widget.removeItem(lbl)
+            labels.clear()
         
         self.scatter_nodes.setData([], []) # Limpiar puntos
 
+    # Estilo de nodo según su código de restricción (ux*4 + uy*2 + rz): (símbolo, color, factor de tamaño)
+    _FIXITY_STYLES = {
+        0: ('o', '#2196F3', 1.0),   # [0,0,0] Libre
+        7: ('s', '#D32F2F', 1.5),   # [1,1,1] Empotrado
+        6: ('t1', '#4CAF50', 1.5),  # [1,1,0] Articulado
+        2: ('o', '#FFC107', 1.5),   # [0,1,0] Rodillo
+        4: ('o', '#FFC107', 1.5),   # [1,0,0] Rodillo
+    }
+    _FIXITY_OTHER = ('x', 'k', 1.5)  # Otras combinaciones
+
     def draw_structure(self, plot_widget, manager,
                        show_node_labels=False, show_element_labels=False,
                        on_element_click=None):
         self.clear(plot_widget)
-        
-        nodes = manager.get_all_nodes()
-        elements = manager.get_all_elements()
+
+        # Arrays del almacén: sin recorrer objetos para las coordenadas
+        node_tags, xy, _ = manager.get_node_arrays()
+        ele_tags, node_rows = manager.get_element_arrays()
         
         # 1. Dibujar Elementos (Líneas)
-        # Mapa rápido de nodos
-        node_map = {n.tag: n for n in nodes}
-        
-        for el in elements:
-            if el.node_i in node_map and el.node_j in node_map:
-                ni = node_map[el.node_i]
-                nj = node_map[el.node_j]
-                
-                # Crear línea usando .plot() directamente (más seguro)
-                curve = plot_widget.plot(
-                    [ni.x, nj.x], [ni.y, nj.y], 
-                    pen=self.pen_element,
-                    clickable=True
-                )
-                curve.setCurveClickable(True)
-                # Guardamos referencia 
-
-                curve.ele_tag = el.tag  
-                if on_element_click:
-                    curve.sigClicked.connect(on_element_click)
-                self.element_items[el.tag] = curve
-
-                # plot_widget.addItem(curve) # Ya no hace falta, plot() lo añade
-                self.element_items[el.tag] = curve
-                
-                # Etiqueta de elemento
-                if show_element_labels:
-                    mid_x = (ni.x + nj.x)/2
-                    mid_y = (ni.y + nj.y)/2
-                    text = pg.TextItem(text=str(el.tag), color='k', anchor=(0.5, 0.5))
-                    text.setPos(mid_x, mid_y)
-                    plot_widget.addItem(text)
-                    self.labels.append(text)
+        valid = np.flatnonzero((node_rows >= 0).all(axis=1))
+        ends = xy[node_rows[valid]]     # (E, 2 extremos, 2 coordenadas)
+        for tag, (pi, pj) in zip(ele_tags[valid].tolist(), ends.tolist()):
+            self._draw_element(plot_widget, tag, pi, pj, show_element_labels, on_element_click)
 
         # 2. Dibujar Nodos (Scatter único)
-        x_vals = []
-        y_vals = []
-        data_vals = [] # Guardaremos el tag aquí
-        symbols = []
-        brushes = []
-        sizes = [] 
+        self.redraw_nodes(manager)
+        if show_node_labels:
+            for tag, (x, y) in zip(node_tags.tolist(), xy.tolist()):
+                self._draw_node_label(plot_widget, tag, x, y)
+
+    def update_nodes(self, plot_widget, manager, tags, show_node_labels=False):
+        """Actualización parcial: nodos dados de alta, movidos, con otras restricciones o eliminados."""
+        # El scatter es un único item: se regenera entero (vectorizado)
+        self.redraw_nodes(manager)
+        for tag in tags:
+            label = self.node_labels.pop(tag, None)
+            if label is not None:
+                plot_widget.removeItem(label)
+            node = manager.get_node(tag)
+            if node and show_node_labels:
+                self._draw_node_label(plot_widget, tag, node.x, node.y)
+
+    def update_elements(self, plot_widget, manager, tags,
+                        show_element_labels=False, on_element_click=None):
+        """Actualización parcial: solo se rehacen las curvas de los elementos indicados."""
+        for tag in tags:
+            curve = self.element_items.pop(tag, None)
+            if curve is not None:
+                plot_widget.removeItem(curve)
+            label = self.element_labels.pop(tag, None)
+            if label is not None:
+                plot_widget.removeItem(label)
+
+            el = manager.get_element(tag)
+            if el is None:
+                continue
+            ni = manager.get_node(el.node_i)
+            nj = manager.get_node(el.node_j)
+            if ni and nj:
+                self._draw_element(plot_widget, tag, (ni.x, ni.y), (nj.x, nj.y),
+                                   show_element_labels, on_element_click)
+
+    def _draw_element(self, plot_widget, tag, pi, pj, show_label, on_element_click):
+        # Crear línea usando .plot() directamente (más seguro)
+        curve = plot_widget.plot(
+            [pi[0], pj[0]], [pi[1], pj[1]], 
+            pen=self.pen_element,
+            clickable=True
+        )
+        curve.setCurveClickable(True)
+        # Guardamos referencia 
+        curve.ele_tag = tag  
+        if on_element_click:
+            curve.sigClicked.connect(on_element_click)
+        self.element_items[tag] = curve
+
+        # Etiqueta de elemento (en el punto medio)
+        if show_label:
+            text = pg.TextItem(text=str(tag), color='k', anchor=(0.5, 0.5))
+            text.setPos((pi[0] + pj[0]) / 2, (pi[1] + pj[1]) / 2)
+            plot_widget.addItem(text)
+            self.element_labels[tag] = text
+
+    def _draw_node_label(self, plot_widget, tag, x, y):
+        text = pg.TextItem(text=str(tag), color='#2196F3', anchor=(0, 1))
+        text.setPos(x, y)
+        plot_widget.addItem(text)
+        self.node_labels[tag] = text
 
+    def redraw_nodes(self, manager):
+        node_tags, xy, fixity = manager.get_node_arrays()
         base_size = ScaleManager.instance().get_scale('node_size')
 
-        for n in nodes:
-            x_vals.append(n.x)
-            y_vals.append(n.y)
-            data_vals.append(n.tag)
-            
-            # Lógica de Símbolos
-            fix = n.fixity
-
-            if fix == [0,0,0]: # Libre
-                symbols.append('o')
-                brushes.append(pg.mkBrush('#2196F3'))
-                sizes.append(base_size) # Tamaño normal
-            else:
-                sizes.append(base_size * 1.5)
-                if fix == [1,1,1]: # Empotrado
-                    symbols.append('s')
-                    brushes.append(pg.mkBrush('#D32F2F'))
-                elif fix == [1,1,0]: # Articulado
-                    symbols.append('t1')
-                    brushes.append(pg.mkBrush('#4CAF50'))
-                elif fix == [0, 1, 0] or fix == [1, 0, 0]: # Rodillo
-                    symbols.append('o') 
-                    brushes.append(pg.mkBrush('#FFC107'))
-                else: 
-                    symbols.append('x') 
-                    brushes.append(pg.mkBrush('k')) # Negro
-            # Etiqueta de nodo
-            if show_node_labels:
-                text = pg.TextItem(text=str(n.tag), color='#2196F3', anchor=(0, 1))
-                text.setPos(n.x, n.y)
-                plot_widget.addItem(text)
-                self.labels.append(text)
+        # Lógica de Símbolos: un código por nodo y un estilo (compartido) por código
+        codes = (fixity != 0).astype(np.int64) @ np.array([4, 2, 1])
+        symbols = np.empty(len(codes), dtype=object)
+        brushes = np.empty(len(codes), dtype=object)
+        sizes = np.empty(len(codes), dtype=np.float64)
+        for code in np.unique(codes).tolist():
+            symbol, color, factor = self._FIXITY_STYLES.get(code, self._FIXITY_OTHER)
+            mask = codes == code
+            symbols[mask] = symbol
+            brushes[mask] = pg.mkBrush(color)
+            sizes[mask] = base_size * factor
 
         # Actualizar Scatter
         self.scatter_nodes.setData(
-            x_vals, y_vals, 
-            data=data_vals, 
+            xy[:, 0], xy[:, 1], 
+            data=node_tags.tolist(), 
             size=sizes,
-            symbol=symbols,
-            brush=brushes
+            symbol=symbols.tolist(),
+            brush=brushes.tolist()
         )
 
     def highlight_node(self, node_tag, color='#FFCC00'):
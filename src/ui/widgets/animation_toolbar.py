@@ -39,7 +39,7 @@ class AnimationToolbar(QToolBar):
     def load_pushover_results(self):
         """Carga los resultados cacheados en el manager al slider"""
         if hasattr(self.manager, 'pushover_results') and self.manager.pushover_results:
-            node_disps = self.manager.pushover_results.get("node_displacements", [])
+            node_disps = self.manager.pushover_results.get("node_displacements")
             if node_disps:
                 self.step_slider.setMaximum(len(node_disps) - 1)
                 self.step_slider.setValue(0)
@@ -55,8 +55,9 @@ class AnimationToolbar(QToolBar):
     def _on_slider_changed(self, value):
         self.step_label.setText(f"Paso de Animación: ({value})")
         if hasattr(self.manager, 'pushover_results') and self.manager.pushover_results:
-            node_disps = self.manager.pushover_results.get("node_displacements", [])
-            if 0 <= value < len(node_disps):
+            node_disps = self.manager.pushover_results.get("node_displacements")
+            if node_disps and 0 <= value < len(node_disps):
+                # Vista O(1) sobre la fila del almacén columnar (sin copiar datos)
                 step_data = node_disps[value]
 
                 # Enviar solo a la ventana activa
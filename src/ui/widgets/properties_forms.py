@@ -84,15 +84,13 @@ class NodeForms(QWidget):
     def apply_changes(self):
         #Guarda cambios en el objetivo y emite señal
         if self.current_node:
-            self.current_node.x = self.spin_x.get_value_base()
-            self.current_node.y = self.spin_y.get_value_base()
-
             new_fixity = [
                 1 if self.chk_fix_x.isChecked() else 0,
                 1 if self.chk_fix_y.isChecked() else 0,
                 1 if self.chk_fix_rz.isChecked() else 0
         ]
-            self.current_node.fixity = new_fixity
+            ProjectManager.instance().update_node(self.current_node.tag, x=self.spin_x.get_value_base(),
+                                                  y=self.spin_y.get_value_base(), fixity=new_fixity)
             self.dataChanged.emit()
 
     def _on_value_changed(self):
@@ -172,26 +170,15 @@ class ElementForm(QWidget):
     def apply_changes(self):
         if not self.current_element: return
         
-        # Guardar nueva topología si cambió algún nodo
-        old_i, old_j = self.current_element.node_i, self.current_element.node_j
-        new_i = self.spin_node_i.value()
-        new_j = self.spin_node_j.value()
-        
-        topology_changed = False
-        if old_i != new_i or old_j != new_j:
-            self.current_element.node_i = new_i
-            self.current_element.node_j = new_j
-            topology_changed = True
+        # Nueva conectividad: el manager reubica el elemento en su piso si cambió algún nodo
+        changes = dict(node_i=self.spin_node_i.value(), node_j=self.spin_node_j.value())
 
         #Guardar sección
         idx = self.combo_section.currentIndex()
         if idx >= 0:
-            sec_tag = self.combo_section.itemData(idx)
-            self.current_element.section_tag = sec_tag
+            changes["section_tag"] = self.combo_section.itemData(idx)
 
-        
-        if topology_changed:
-            ProjectManager.instance().mark_topology_dirty()
+        ProjectManager.instance().update_element(self.current_element.tag, **changes)
 
         self.dataChanged.emit()
         self.btn_apply.setEnabled(False)
@@ -42,8 +42,9 @@ class StructureInteractor(QWidget):
         self.current_diagram_type = None
         
         # Conectar Señales
-        self.manager.dataChanged.connect(self._on_data_changed)
-        ScaleManager.instance().scale_changed.connect(lambda t,v: self.refresh_viz())
+        # Avisos tipados: cada capa se actualiza solo si le afecta (y solo en los items cambiados)
+        self.manager.modelChanged.connect(self._on_model_changed)
+        ScaleManager.instance().scale_changed.connect(self._on_scale_changed)
         
         # 4. Estado de Interacción
         self.last_clicked_point = None
@@ -75,9 +76,58 @@ class StructureInteractor(QWidget):
         self.renderer_model.scatter_nodes.sigClicked.connect(self._on_node_clicked_wrapper)
         self.plot_widget.scene().sigMouseClicked.connect(self._on_background_clicked)
 
-    def _on_data_changed(self):
-        ScaleManager.instance().autocalculate_scales()
-        self.refresh_viz()
+    def _on_model_changed(self, change):
+        if change.full:
+            if change.results:
+                self.current_results = None
+            ScaleManager.instance().autocalculate_scales()
+            self.refresh_viz()
+            return
+
+        # Un nodo movido arrastra a sus elementos, y ambos a las cargas que tienen aplicadas
+        nodes = change.nodes
+        elements = set(change.elements)
+        loads = set(change.loads)
+        for tag in nodes:
+            elements.update(e.tag for e in self.manager.get_elements_of_node(tag))
+            loads.update(l.tag for l in self.manager.get_loads_of_node(tag))
+        for tag in elements:
+            loads.update(l.tag for l in self.manager.get_loads_of_element(tag))
+
+        if nodes:
+            # Solo cambia la extensión del modelo si se movieron nodos (y solo entonces las escalas)
+            ScaleManager.instance().autocalculate_scales()
+            self.last_clicked_point = None
+            self.renderer_model.update_nodes(self.plot_widget, self.manager, nodes,
+                                             show_node_labels=self.show_node_labels)
+        if elements:
+            self.renderer_model.update_elements(self.plot_widget, self.manager, elements,
+                                                show_element_labels=self.show_element_labels,
+                                                on_element_click=self._on_element_clicked_wrapper)
+        if loads:
+            if self.show_pushover_loads:
+                # Con el patrón del Pushover visible la capa no muestra las cargas del modelo
+                self._refresh_loads()
+            else:
+                self.renderer_load.update_loads(self.plot_widget, self.manager, loads,
+                                                scale=ScaleManager.instance().get_scale('load'),
+                                                show_nodes=self.show_loads_nodes,
+                                                show_elements=self.show_loads_elements)
+        if change.results:
+            # La deformada y los diagramas mostrados ya no corresponden al modelo
+            self.clear_results()
+
+    def _on_scale_changed(self, scale_type, value):
+        # Cada escala afecta a una sola capa
+        if scale_type == 'load':
+            self._refresh_loads()
+        elif scale_type in ('deformation', 'moment', 'shear', 'axial'):
+            self._refresh_results()
+        elif scale_type == 'node_size':
+            self.last_clicked_point = None
+            self.renderer_model.redraw_nodes(self.manager)
+        else:
+            self.refresh_viz()
 
     def set_overlay_widget(self, widget):
         self.overlay_widget = widget
@@ -95,6 +145,11 @@ class StructureInteractor(QWidget):
 
     def refresh_viz(self):
         """Redibuja todo usando los renderizadores."""
+        self._refresh_model()
+        self._refresh_loads()
+        self._refresh_results()
+
+    def _refresh_model(self):
         self.last_clicked_point = None
         self.current_label = None 
         
@@ -106,7 +161,8 @@ class StructureInteractor(QWidget):
             show_element_labels=self.show_element_labels,
             on_element_click=self._on_element_clicked_wrapper
         )
-        
+
+    def _refresh_loads(self):
         # Render Cargas
         s_load = ScaleManager.instance().get_scale('load')
         
@@ -130,6 +186,8 @@ class StructureInteractor(QWidget):
                                       show_nodes=True, 
                                       show_elements=False,
                                       draw_pushover=True)
+
+    def _refresh_results(self):
         # Render Deformada
         if self.current_results and self.show_deformed:
             s_def = ScaleManager.instance().get_scale('deformation')
@@ -161,16 +219,18 @@ class StructureInteractor(QWidget):
              self.show_loads_nodes = visible
              self.show_loads_elements = visible
              self.show_pushover_loads = visible
-        self.refresh_viz()
+             self._refresh_loads()
+             return
+        self._refresh_results()
 
     def set_load_visibility(self, load_type, visible):
         if load_type == 'nodes': self.show_loads_nodes = visible
         elif load_type == 'elements': self.show_loads_elements = visible
-        self.refresh_viz()
+        self._refresh_loads()
 
     def show_deformation(self, results, scale_factor=None):
         self.current_results = results
-        self.refresh_viz() # Se encarga de llamar al renderer si show_deformed es True
+        self._refresh_results() # Se encarga de llamar al renderer si show_deformed es True
 
     def draw_kinematic_step(self, step_data):
         """
@@ -180,9 +240,7 @@ class StructureInteractor(QWidget):
         if not self.show_deformed:
             return
             
-        # Formatear el diccionario para DeformationRenderer (espera un dict de tags -> (dx, dy, rz))
-        disp_dict = {tag: tuple(disp) for tag, disp in step_data.items()}
-        
+        # step_data es una vista del almacén columnar (tag -> fila [dx, dy, rz]); se pasa sin copiar
         # Obtener la escala actual sin forzar un recalculo completo del bounding box de la escena
         s_def = ScaleManager.instance().get_scale('deformation')
         
@@ -190,7 +248,7 @@ class StructureInteractor(QWidget):
         self.renderer_deform.draw_deformed(
             self.plot_widget,
             self.manager,
-            disp_dict,
+            step_data,
             scale_factor=s_def
         )
     def clear_results(self):
@@ -201,7 +259,7 @@ class StructureInteractor(QWidget):
     def set_pushover_loads_visible(self, visible):
         """Muestra u oculta exclusivamente las fuerzas del patrón teórico utilizadas en el último Pushover"""
         self.show_pushover_loads = visible
-        self.refresh_viz()
+        self._refresh_loads()
 
     # ... (Resto de métodos de escala e interacción sin cambios) ...
     def increase_load_scale(self):
@@ -226,11 +284,11 @@ class StructureInteractor(QWidget):
 
     def toggle_node_labels(self, visible):
         self.show_node_labels = visible
-        self.refresh_viz()
+        self._refresh_model()
 
     def toggle_element_labels(self, visible):
         self.show_element_labels = visible
-        self.refresh_viz()
+        self._refresh_model()
 
     def _on_node_clicked_wrapper(self, plot_item, points):
         self._deselect_all()
@@ -283,4 +341,4 @@ class StructureInteractor(QWidget):
 
     def show_force_diagrams(self,diagram_type):
         self.current_diagram_type = diagram_type
-        self.refresh_viz()
\ No newline at end of file
+        self._refresh_results()
\ No newline at end of file
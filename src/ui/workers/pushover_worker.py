@@ -0,0 +1,73 @@
+import traceback
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class PushoverWorker(QObject):
+    """
+    Ejecuta el Pushover (monotónico o adaptativo) fuera del hilo de la interfaz.
+    Se mueve a un QThread; emite resultados parciales cada N pasos y admite cancelación
+    cooperativa entre pasos (el solver comprueba la bandera antes de cada paso).
+    """
+    progress = pyqtSignal(object, object)   # (resultados parciales, {"round", "step", "n_steps"})
+    finished = pyqtSignal(object)           # Resultados finales (o parciales si se canceló)
+    failed = pyqtSignal(str)                # Traza del error
+
+    def __init__(self, translator, params: dict, adaptive: bool = False, progress_every: int = 50, resume_path=None):
+        super().__init__()
+        self.translator = translator
+        self.params = params
+        self.adaptive = adaptive
+        self.resume_path = resume_path  # Checkpoint desde el que continuar (params = cambios a aplicar)
+
+        solver = self.translator.pushover_solver
+        solver.progress_every = max(1, progress_every)
+        solver.progress_callback = self._on_progress
+
+    def _on_progress(self, partial_results, info):
+        # Se llama desde el hilo de trabajo: la señal cruza al hilo de la UI por cola
+        self.progress.emit(partial_results, info)
+
+    def run(self):
+        try:
+            if self.resume_path is not None:
+                results = self.translator.resume_pushover(self.resume_path, **self.params)
+            elif not self.translator.prepare_domain():
+                raise RuntimeError("El análisis de gravedad falló al preparar el dominio para el Pushover.")
+            elif self.adaptive:
+                results = self.translator.run_adaptive_pushover(**self.params)
+            else:
+                results = self.translator.run_pushover_analysis(**self.params)
+            self.finished.emit(results)
+        except Exception:
+            self.failed.emit(traceback.format_exc())
+        finally:
+            self.translator.pushover_solver.progress_callback = None
+
+    def cancel(self):
+        """Solicita detener el análisis al terminar el paso en curso."""
+        self.translator.request_cancel()
+
+
+class PushoverSweepWorker(QObject):
+    """
+    Lanza un barrido (PushoverSweep) desde un QThread para no bloquear la interfaz.
+    Los casos terminados se notifican uno a uno; el barrido reparte el trabajo entre procesos.
+    """
+    caseFinished = pyqtSignal(int, object)  # (índice del caso, SweepResult)
+    finished = pyqtSignal(object)           # Lista completa de SweepResult
+    failed = pyqtSignal(str)
+
+    def __init__(self, sweep, cases):
+        super().__init__()
+        self.sweep = sweep
+        self.cases = cases
+
+    def run(self):
+        try:
+            results = self.sweep.run(self.cases, on_case_done=self.caseFinished.emit)
+            self.finished.emit(results)
+        except Exception:
+            self.failed.emit(traceback.format_exc())
+
+    def cancel(self):
+        self.sweep.cancel()
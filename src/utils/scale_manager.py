@@ -52,7 +52,8 @@ class ScaleManager(QObject):
 
     def set_base_scale(self, scale_type, value):
         """El motor de AutoCAD/Auto-escalado llama a esto. Mantiene multiplicador intocable"""
-        if scale_type in self._base_scales:
+        # Solo se avisa si la base cambia de verdad (evita redibujados al recalcular con el mismo modelo)
+        if scale_type in self._base_scales and self._base_scales[scale_type] != value:
             self._base_scales[scale_type] = value
             # Al cambiar la base, la escala total cambia automáticamente
             total_scale = self.get_scale(scale_type)
@@ -69,14 +70,12 @@ class ScaleManager(QObject):
         Calcula escalas sugeridas basándose en el tamaño del modelo.
         """
         manager = ProjectManager.instance()
-        nodes = manager.get_all_nodes()
+        _, xy, _ = manager.get_node_arrays()
         
-        if not nodes: return
+        if not len(xy): return
 
-        xs = [n.x for n in nodes]
-        ys = [n.y for n in nodes]
-        width = max(xs) - min(xs) if xs else 0
-        height = max(ys) - min(ys) if ys else 0
+        # Extensión del modelo directamente sobre el array de coordenadas (N×2)
+        width, height = (xy.max(axis=0) - xy.min(axis=0)).tolist()
         
         L_char = max(width, height)
         if L_char < 1.0: L_char = 1.0 